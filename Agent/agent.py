@@ -1,16 +1,19 @@
+import json
 import os
 import sys
+import time
 from pathlib import Path
 from dotenv import load_dotenv
 from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import uvicorn
 
 from langchain_openai import ChatOpenAI
 from langchain.agents import create_agent
-from langchain_mcp_adapters.client import MultiServerMCPClient
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_mcp_adapters.tools import load_mcp_tools
 
 # Load .env from the project root
 env_path = Path(__file__).parent.parent / ".env"
@@ -22,31 +25,70 @@ sys.path.append(str(Path(__file__).parent.parent))
 # FastAPI lifespanイベントでエージェント初期化
 from contextlib import asynccontextmanager
 
+from Agent.answer_cache import AnswerCache
+from Agent.mcp_pool import MCPSessionPool
+from MCPServer.metrics import AGENT_STEP_SECONDS, init_tracing, latest_metrics, span
+from MCPServer.singleflight import SingleFlight
+
+init_tracing("flightaware-agent")
+
 agent = None
+mcp_pool = None
+# 同じ質問への回答をキャッシュし、同時に来た同じ質問は1回の実行で共有する
+answer_cache = AnswerCache()
+agent_runs = SingleFlight()
+
+
+class StepTimer(AsyncCallbackHandler):
+    # LLM呼び出しとツール実行の所要時間を agent_step_duration_seconds に記録する
+
+    def __init__(self):
+        self.started = {}
+
+    async def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self.started[run_id] = time.perf_counter()
+
+    async def on_llm_end(self, response, *, run_id, **kwargs):
+        self._observe("llm", run_id)
+
+    async def on_llm_error(self, error, *, run_id, **kwargs):
+        self._observe("llm", run_id)
+
+    async def on_tool_start(self, serialized, input_str, *, run_id, **kwargs):
+        self.started[run_id] = time.perf_counter()
+
+    async def on_tool_end(self, output, *, run_id, **kwargs):
+        self._observe("tool", run_id)
+
+    async def on_tool_error(self, error, *, run_id, **kwargs):
+        self._observe("tool", run_id)
+
+    def _observe(self, step, run_id):
+        started = self.started.pop(run_id, None)
+        if started is not None:
+            AGENT_STEP_SECONDS.labels(step=step).observe(time.perf_counter() - started)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global agent
+    global agent, mcp_pool
     llm = ChatOpenAI(model="gpt-4o", temperature=0)
-    server_path = str(Path(__file__).parent.parent / "MCPServer" / "server.py")
-    client = MultiServerMCPClient(
-        {
-            "flightaware": {
-                "transport": "stdio",
-                "command": "python",
-                "args": [server_path],
-                "env": dict(os.environ),  # 環境変数をサブプロセスに渡す
-            }
-        }
-    )
-    mcp_tools = await client.get_tools()
+    # MCPサーバーのワーカープール (MCP_POOL_SIZE個のstdioプロセス、またはMCP_SERVER_URL)
+    mcp_pool = MCPSessionPool()
+    await mcp_pool.start()
+    mcp_tools = await load_mcp_tools(mcp_pool)
     system_message = """あなたは航空情報の専門家です。
 提供されたツールを使って正確なフライト情報を答えてください。
 日本語で、聞かれた場合、ツールに渡すパラメータの時刻は標準時 (UTC) に変換して渡してください。
 年月日の指定がない場合、今日の日付を使用してください。
 未来の時刻であれば、スケジュールを取得するツール。
 過去の時刻が含まれていれば、実績を取得するツールを使用してください。
+件数が多くなりそうな場合は stream=True で最初のページを取得して回答を始め、
+必要なときだけ next_cursor を cursor に渡して続きのページを取得してください。
+回答に必要な項目だけを fields で指定し、件数が多い場合は output_format="compact" を使ってください。
+複数の空港の出発便・到着便を比較する場合は、空港ごとに呼び出さず get_multi_airport_board を1回だけ呼び出してください。
+件数・遅延・定時率・混雑する時間帯・路線などの集計を聞かれた場合は、便の一覧を取得せず get_board_stats を使ってください。
+特定の地点・範囲・経路の付近を通過した便を聞かれた場合は、対象の空港の airport_code を指定して find_flights_in_area を使ってください。
 
 ただし、回答の際は以下の点に注意してください：
 - 時刻は日本時間 (JST) で答えてください。
@@ -54,6 +96,7 @@ async def lifespan(app: FastAPI):
 """
     agent = create_agent(llm, mcp_tools, system_prompt=system_message)
     yield
+    await mcp_pool.close()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -76,6 +119,24 @@ async def read_root():
     """
 
 
+@app.get("/health/mcp")
+async def mcp_health():
+    if mcp_pool is None:
+        return JSONResponse({"error": "agent not initialized"}, status_code=500)
+    workers = mcp_pool.stats()
+    healthy = sum(w["healthy"] for w in workers)
+    return JSONResponse(
+        {"healthy": healthy, "workers": workers},
+        status_code=200 if healthy else 503,
+    )
+
+
+@app.get("/metrics")
+async def metrics():
+    body, content_type = latest_metrics()
+    return Response(body, media_type=content_type)
+
+
 # staticファイルの配置先(frontend/public)を/viewで配信
 static_dir = Path(__file__).parent / "public"
 
@@ -89,15 +150,100 @@ async def ask_agent(request: Request):
     global agent
     if agent is None:
         return JSONResponse({"error": "agent not initialized"}, status_code=500)
-    response = await agent.ainvoke(
-        {"messages": [{"role": "user", "content": user_input}]}
+
+    use_cache = not data.get("no_cache", False)
+    if use_cache:
+        cached = answer_cache.get(user_input)
+        if cached is not None:
+            return {"output": cached, "cached": True}
+
+    async def run_agent():
+        with span("agent", AGENT_STEP_SECONDS, step="total"):
+            response = await agent.ainvoke(
+                {"messages": [{"role": "user", "content": user_input}]},
+                config={"callbacks": [StepTimer()]},
+            )
+        messages = response.get("messages", [])
+        output = messages[-1].content if messages else str(response)
+        if messages and isinstance(output, str):
+            answer_cache.set(user_input, output)
+        return output
+
+    if not use_cache:
+        return {"output": await run_agent(), "cached": False}
+    key, _ = answer_cache.resolve(user_input)
+    return {"output": await agent_runs.do(key, run_agent), "cached": False}
+
+
+def sse(event: str, data: dict) -> str:
+    # Server-Sent Events の1フレーム
+    return (
+        f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+    )
+
+
+@app.post("/api/agent/stream")
+async def ask_agent_stream(request: Request):
+    data = await request.json()
+    user_input = data.get("input", "")
+    if not user_input:
+        return JSONResponse({"error": "input is required"}, status_code=400)
+    if agent is None:
+        return JSONResponse({"error": "agent not initialized"}, status_code=500)
+    use_cache = not data.get("no_cache", False)
+
+    async def events():
+        if use_cache:
+            cached = answer_cache.get(user_input)
+            if cached is not None:
+                yield sse("done", {"output": cached, "cached": True})
+                return
+
+        # 最後のツール呼び出し以降のトークンが最終回答
+        answer = []
+        # yieldをまたぐのでspanではなく経過時間だけを記録する
+        started = time.perf_counter()
+        try:
+            async for event in agent.astream_events(
+                {"messages": [{"role": "user", "content": user_input}]},
+                version="v2",
+                config={"callbacks": [StepTimer()]},
+            ):
+                kind = event["event"]
+                if kind == "on_chat_model_stream":
+                    text = event["data"]["chunk"].content
+                    if isinstance(text, str) and text:
+                        answer.append(text)
+                        yield sse("token", {"text": text})
+                elif kind == "on_tool_start":
+                    answer.clear()
+                    yield sse(
+                        "tool_start",
+                        {
+                            "name": event["name"],
+                            "input": event["data"].get("input"),
+                        },
+                    )
+                elif kind == "on_tool_end":
+                    yield sse("tool_end", {"name": event["name"]})
+        except Exception as e:
+            yield sse("error", {"error": str(e)})
+            return
+        finally:
+            AGENT_STEP_SECONDS.labels(step="total").observe(
+                time.perf_counter() - started
+            )
+
+        output = "".join(answer)
+        if output:
+            answer_cache.set(user_input, output)
+        yield sse("done", {"output": output, "cached": False})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
-    messages = response.get("messages", [])
-    if messages:
-        last_message = messages[-1]
-        return {"output": last_message.content}
-    else:
-        return {"output": str(response)}
 
 
 app.mount("/", StaticFiles(directory=static_dir, html=True), name="static")
@@ -0,0 +1,154 @@
+"""Answer cache in front of the agent.
+
+Questions are normalized (Unicode NFKC, case, whitespace and punctuation)
+and relative dates such as 今日/昨日/tomorrow are resolved to the JST date
+they refer to, so the same question asked on different days does not share
+an answer. Answers expire with the freshness of the flight data they were
+built from: live boards for today, schedules for future dates, and a longer
+TTL for past days.
+
+With ANSWER_CACHE_NEAR_DUPLICATES enabled, polite fillers and particles are
+dropped as well, so paraphrases such as "羽田の出発便を教えて" and
+"羽田の出発便を教えてください" share one answer while questions about a
+different airport, flight or direction never do.
+"""
+
+import os
+import re
+import unicodedata
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from MCPServer.cache import BOARD_TTL, SCHEDULE_TTL, TTLCache
+from MCPServer.localize import JST
+
+ANSWER_CACHE_MAX_ENTRIES = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "512"))
+# Freshness of answers about days before today
+ANSWER_CACHE_PAST_TTL = float(os.getenv("ANSWER_CACHE_PAST_TTL", "3600"))
+# Let paraphrased questions share answers (set to 0 for exact matches only)
+ANSWER_CACHE_NEAR_DUPLICATES = os.getenv("ANSWER_CACHE_NEAR_DUPLICATES", "1") == "1"
+
+RELATIVE_DAYS = {
+    "一昨日": -2,
+    "おととい": -2,
+    "昨日": -1,
+    "きのう": -1,
+    "今日": 0,
+    "きょう": 0,
+    "本日": 0,
+    "明後日": 2,
+    "あさって": 2,
+    "明日": 1,
+    "あした": 1,
+    "yesterday": -1,
+    "today": 0,
+    "tomorrow": 1,
+}
+_RELATIVE_RE = re.compile(
+    "|".join(sorted(map(re.escape, RELATIVE_DAYS), key=len, reverse=True))
+)
+_FULL_DATE_RE = re.compile(r"(\d{4})[-/年](\d{1,2})[-/月](\d{1,2})日?")
+_MONTH_DAY_RE = re.compile(r"(\d{1,2})月(\d{1,2})日")
+_PUNCT_RE = re.compile(r"[\s、。,.!?！？「」『』()（）\"'・]+")
+# Spaces next to non-ASCII characters carry no meaning in Japanese text
+_CJK_SPACE_RE = re.compile(r" (?=[^\x00-\x7f])|(?<=[^\x00-\x7f]) ")
+_FILLER_RE = re.compile(
+    r"を?(?:教えて|おしえて|知りたい|調べて|見せて)(?:ください|下さい|ほしい|欲しい)?"
+    r"|について|ですか|ますか|でしょうか|ください"
+    r"|\b(?:please|can you|could you|tell me|show me|what are|what is|the|me)\b"
+)
+# Particles directly after a content character ("羽田の出発便" -> "羽田出発便"),
+# or left at the start once a date is removed
+_PARTICLE_RE = re.compile(
+    r"^[のをはがにでへと]+|(?<=[\u4e00-\u9fff\u30a0-\u30ffa-z0-9])[のをはがにでへと]"
+)
+
+
+def normalize_question(text: str) -> str:
+    """Lowercases, NFKC-normalizes and strips punctuation and whitespace."""
+    text = unicodedata.normalize("NFKC", text).lower()
+    return _CJK_SPACE_RE.sub("", _PUNCT_RE.sub(" ", text)).strip()
+
+
+def resolve_dates(question: str, today: date) -> Tuple[str, List[date]]:
+    """Removes relative and explicit dates from a question and resolves them.
+
+    Returns:
+        The question without dates and the dates it refers to (today if none).
+    """
+    dates: List[date] = []
+
+    def relative(match: re.Match) -> str:
+        day = today + timedelta(days=RELATIVE_DAYS[match.group(0)])
+        dates.append(day)
+        return ""
+
+    def absolute(year: int, month: int, day: int, original: str) -> str:
+        try:
+            resolved = date(year, month, day)
+        except ValueError:
+            return original
+        dates.append(resolved)
+        return ""
+
+    question = _RELATIVE_RE.sub(relative, question)
+    question = _FULL_DATE_RE.sub(
+        lambda m: absolute(int(m[1]), int(m[2]), int(m[3]), m[0]), question
+    )
+    question = _MONTH_DAY_RE.sub(
+        lambda m: absolute(today.year, int(m[1]), int(m[2]), m[0]), question
+    )
+    return question.strip(), dates or [today]
+
+
+def answer_ttl(dates: List[date], today: date) -> float:
+    """Returns how long an answer about `dates` stays fresh."""
+    if max(dates) > today:
+        return SCHEDULE_TTL
+    if max(dates) < today:
+        return ANSWER_CACHE_PAST_TTL
+    return BOARD_TTL
+
+
+def canonicalize(text: str) -> str:
+    """Drops polite fillers and particles so paraphrases share one form."""
+    text = _FILLER_RE.sub("", text)
+    text = _PARTICLE_RE.sub("", text)
+    return re.sub(r" +", " ", text).strip()
+
+
+class AnswerCache:
+    """TTL cache of agent answers keyed on the resolved question."""
+
+    def __init__(
+        self,
+        max_entries: int = ANSWER_CACHE_MAX_ENTRIES,
+        near_duplicates: bool = ANSWER_CACHE_NEAR_DUPLICATES,
+    ):
+        self.near_duplicates = near_duplicates
+        self._answers = TTLCache(max_entries=max_entries)
+
+    def resolve(
+        self, question: str, now: Optional[datetime] = None
+    ) -> Tuple[str, float]:
+        """Returns (cache key, ttl) for a question."""
+        today = (now or datetime.now(JST)).astimezone(JST).date()
+        text, dates = resolve_dates(normalize_question(question), today)
+        if self.near_duplicates:
+            text = canonicalize(text)
+        window = ",".join(sorted({d.isoformat() for d in dates}))
+        return f"{window}|{text}", answer_ttl(dates, today)
+
+    def get(self, question: str) -> Optional[str]:
+        """Returns a fresh answer for the question, or None."""
+        key, _ = self.resolve(question)
+        body = self._answers.get(key)
+        return body.decode("utf-8") if body is not None else None
+
+    def set(self, question: str, answer: str):
+        """Stores an answer for as long as its underlying data stays fresh."""
+        key, ttl = self.resolve(question)
+        self._answers.set(key, answer.encode("utf-8"), ttl)
+
+    def stats(self) -> Dict[str, Any]:
+        return self._answers.stats()
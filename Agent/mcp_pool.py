@@ -0,0 +1,326 @@
+"""Pool of persistent MCP sessions for the agent.
+
+Each worker keeps one MCP session open, either to its own MCPServer
+subprocess over stdio or to a shared streamable-HTTP server
+(MCP_SERVER_URL). A background health check pings every worker and restarts
+the ones that stop answering or whose transport fails.
+
+Stdio servers each hold their own caches, single-flight calls and board
+snapshots, so calls about one airport (or flight) are routed to a fixed
+worker, chosen by hashing the airport code; each airport is also warmed by
+that worker. Other calls, and every call to a shared HTTP server, go to the
+healthy worker with the fewest calls in flight.
+
+The pool exposes `list_tools` and `call_tool` like a ClientSession, so it can
+be handed to `langchain_mcp_adapters.tools.load_mcp_tools` directly.
+"""
+
+import asyncio
+import itertools
+import logging
+import os
+import sys
+import zlib
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import anyio
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from mcp.client.streamable_http import streamablehttp_client
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED
+
+from MCPServer.metrics import inject_context
+from MCPServer.warmer import WARM_AIRPORTS
+
+MCP_POOL_SIZE = int(os.getenv("MCP_POOL_SIZE", "4"))
+# If set, workers connect to this streamable-HTTP endpoint instead of spawning servers
+MCP_SERVER_URL = os.getenv("MCP_SERVER_URL", "")
+MCP_HEALTH_INTERVAL = float(os.getenv("MCP_HEALTH_INTERVAL", "30"))
+MCP_HEALTH_TIMEOUT = float(os.getenv("MCP_HEALTH_TIMEOUT", "5"))
+MCP_START_TIMEOUT = float(os.getenv("MCP_START_TIMEOUT", "30"))
+
+SERVER_PATH = str(Path(__file__).parent.parent / "MCPServer" / "server.py")
+
+# Tool arguments that pin a call to one worker, in order of preference
+ROUTING_ARGUMENTS = ("airport_code", "origin", "destination", "fa_flight_id")
+
+# Transport failures after which a worker's session is unusable
+TRANSPORT_ERRORS = (
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream,
+    ConnectionError,
+)
+
+
+def route_key(arguments: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Returns the airport code (or flight id) a call is about, if any."""
+    for name in ROUTING_ARGUMENTS:
+        value = (arguments or {}).get(name)
+        if isinstance(value, str) and value.strip():
+            return value.strip().upper()
+    return None
+
+
+def route_index(key: str, size: int) -> int:
+    """Index of the worker that owns `key` in a pool of `size` workers."""
+    return zlib.crc32(key.encode("utf-8")) % size
+
+
+def is_transport_error(error: Exception) -> bool:
+    """True if `error` means the session is broken (not a tool error or timeout)."""
+    if isinstance(error, McpError):
+        return error.error.code == CONNECTION_CLOSED
+    return isinstance(error, TRANSPORT_ERRORS)
+
+
+def worker_env(index: int, size: int) -> Dict[str, str]:
+    """Environment for the index-th stdio server process.
+
+    The AeroAPI rate limit and burst are split between processes so the pool
+    as a whole stays within the account limit (the monthly quota count is
+    already shared through the on-disk store). Each process warms only the
+    airports routed to it, and serves its metrics on its own port,
+    AEROAPI_METRICS_PORT plus its index.
+    """
+    env = dict(os.environ)
+    rate = float(env.get("AEROAPI_RATE_LIMIT", "5"))
+    env["AEROAPI_RATE_LIMIT"] = str(rate / size)
+    burst = int(env.get("AEROAPI_RATE_BURST", "5"))
+    env["AEROAPI_RATE_BURST"] = str(max(1, burst // size))
+    env["AEROAPI_WARM_AIRPORTS"] = ",".join(
+        code for code in WARM_AIRPORTS if route_index(code, size) == index
+    )
+    metrics_port = int(env.get("AEROAPI_METRICS_PORT", "0"))
+    if metrics_port:
+        env["AEROAPI_METRICS_PORT"] = str(metrics_port + index)
+    return env
+
+
+class MCPWorker:
+    """One persistent MCP session, owned by its own task."""
+
+    def __init__(self, name: str, connect: Callable[[], Any]):
+        self.name = name
+        self.connect = connect
+        self.session: Optional[ClientSession] = None
+        self.in_flight = 0
+        self.calls = 0
+        self.failures = 0
+        self.restarts = 0
+        self._ready = asyncio.Event()
+        self._closing = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def healthy(self) -> bool:
+        return (
+            self.session is not None
+            and self._task is not None
+            and not self._task.done()
+        )
+
+    async def _run(self):
+        # The transport's task group must be entered and exited in the same task
+        try:
+            async with self.connect() as streams:
+                async with ClientSession(streams[0], streams[1]) as session:
+                    await session.initialize()
+                    self.session = session
+                    self._ready.set()
+                    await self._closing.wait()
+        except Exception as e:
+            logging.warning(f"MCP worker {self.name} stopped: {e}")
+        finally:
+            self.session = None
+            self._ready.set()
+
+    async def start(self):
+        """Opens the session and waits until it is initialized."""
+        self._ready.clear()
+        self._closing.clear()
+        self._task = asyncio.create_task(self._run())
+        await asyncio.wait_for(self._ready.wait(), MCP_START_TIMEOUT)
+        if self.session is None:
+            raise RuntimeError(f"MCP worker {self.name} failed to start")
+
+    async def stop(self):
+        """Closes the session and its transport."""
+        if self._task is None:
+            return
+        self._closing.set()
+        try:
+            await asyncio.wait_for(self._task, MCP_START_TIMEOUT)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            self._task.cancel()
+        self._task = None
+
+    async def restart(self):
+        self.restarts += 1
+        await self.stop()
+        await self.start()
+
+    async def ping(self) -> bool:
+        """Returns True if the server answers a ping in time."""
+        if not self.healthy:
+            return False
+        try:
+            await asyncio.wait_for(self.session.send_ping(), MCP_HEALTH_TIMEOUT)
+            return True
+        except Exception:
+            return False
+
+
+class MCPSessionPool:
+    """Load-balanced pool of MCP workers with health checks."""
+
+    def __init__(self, size: int = MCP_POOL_SIZE, url: str = MCP_SERVER_URL):
+        self.size = max(1, size)
+        self.url = url
+        self.workers: List[MCPWorker] = []
+        self._order = itertools.count()
+        self._health_task: Optional[asyncio.Task] = None
+        self._restarting: Dict[str, asyncio.Task] = {}
+
+    def _connector(self, index: int) -> Callable[[], Any]:
+        if self.url:
+            return lambda: streamablehttp_client(self.url)
+        params = StdioServerParameters(
+            command=sys.executable,
+            args=[SERVER_PATH],
+            env=worker_env(index, self.size),
+        )
+        return lambda: stdio_client(params)
+
+    async def start(self):
+        """Starts every worker and the health check loop."""
+        self.workers = [
+            MCPWorker(f"mcp-{i}", self._connector(i)) for i in range(self.size)
+        ]
+        await asyncio.gather(*(worker.start() for worker in self.workers))
+        self._health_task = asyncio.create_task(self._health_loop())
+        logging.info(
+            f"MCP pool started: {self.size} workers via {'HTTP' if self.url else 'stdio'}"
+        )
+
+    async def close(self):
+        """Stops the health check and every worker."""
+        if self._health_task is not None:
+            self._health_task.cancel()
+            self._health_task = None
+        for task in self._restarting.values():
+            task.cancel()
+        await asyncio.gather(*(worker.stop() for worker in self.workers))
+
+    def _restart_later(self, worker: MCPWorker):
+        """Restarts a worker in the background, once at a time."""
+        if worker.name in self._restarting:
+            return
+
+        async def restart():
+            try:
+                await worker.restart()
+                logging.info(f"MCP worker {worker.name} restarted")
+            except Exception as e:
+                logging.warning(f"MCP worker {worker.name} restart failed: {e}")
+            finally:
+                self._restarting.pop(worker.name, None)
+
+        self._restarting[worker.name] = asyncio.create_task(restart())
+
+    async def _health_loop(self):
+        while True:
+            await asyncio.sleep(MCP_HEALTH_INTERVAL)
+            results = await asyncio.gather(*(w.ping() for w in self.workers))
+            for worker, ok in zip(self.workers, results):
+                if not ok and worker.name not in self._restarting:
+                    logging.warning(f"MCP worker {worker.name} failed health check")
+                    self._restart_later(worker)
+
+    def _pick(
+        self, key: Optional[str] = None, exclude: Optional[MCPWorker] = None
+    ) -> MCPWorker:
+        """Returns the worker that owns `key`, else the least busy healthy worker.
+
+        If the owner is unavailable, the next healthy worker in pool order
+        takes over, so a key still maps to one worker at a time.
+        """
+        candidates = [w for w in self.workers if w.healthy and w is not exclude]
+        if not candidates:
+            raise RuntimeError("No healthy MCP workers available")
+        if key is not None:
+            start = route_index(key, len(self.workers))
+            for i in range(len(self.workers)):
+                worker = self.workers[(start + i) % len(self.workers)]
+                if worker in candidates:
+                    return worker
+        # Rotate the starting point so ties are spread across workers
+        offset = next(self._order) % len(candidates)
+        rotated = candidates[offset:] + candidates[:offset]
+        return min(rotated, key=lambda w: w.in_flight)
+
+    async def list_tools(self, cursor: Optional[str] = None, **kwargs):
+        return await self._pick().session.list_tools(cursor, **kwargs)
+
+    async def call_tool(
+        self,
+        name: str,
+        arguments: Optional[Dict[str, Any]] = None,
+        read_timeout_seconds: Optional[timedelta] = None,
+        progress_callback=None,
+        **kwargs,
+    ):
+        """Calls a tool on its routed (else least busy) worker.
+
+        If the worker's transport fails, the worker is restarted and the call
+        is retried once on another worker. Tool errors and timeouts are raised
+        as they are; the session stays up for the other calls in flight on it.
+
+        The current trace context is sent in the request `_meta` so the
+        server's tool span joins the agent's trace.
+        """
+        meta = {**inject_context(), **(kwargs.pop("meta", None) or {})}
+        # A shared HTTP server holds one copy of the state, so any worker will do
+        key = None if self.url else route_key(arguments)
+        failed = None
+        for attempt in range(2):
+            worker = self._pick(key, exclude=failed)
+            worker.in_flight += 1
+            worker.calls += 1
+            try:
+                return await worker.session.call_tool(
+                    name,
+                    arguments,
+                    read_timeout_seconds=read_timeout_seconds,
+                    progress_callback=progress_callback,
+                    meta=meta or None,
+                    **kwargs,
+                )
+            except Exception as e:
+                worker.failures += 1
+                logging.warning(f"MCP worker {worker.name} call {name} failed: {e}")
+                if worker.healthy and not is_transport_error(e):
+                    raise
+                self._restart_later(worker)
+                if attempt == 1:
+                    raise
+                failed = worker
+            finally:
+                worker.in_flight -= 1
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Returns per-worker call counters."""
+        return [
+            {
+                "name": w.name,
+                "healthy": w.healthy,
+                "in_flight": w.in_flight,
+                "calls": w.calls,
+                "failures": w.failures,
+                "restarts": w.restarts,
+            }
+            for w in self.workers
+        ]
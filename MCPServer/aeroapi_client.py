@@ -0,0 +1,328 @@
+"""Shared AeroAPI HTTP client.
+
+Every MCP tool and standalone script goes through one pooled session so that
+TCP/TLS connections are kept alive and reused across pages and calls.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from typing import Optional, Dict, Any, Tuple, Union
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+from MCPServer.cache import (
+    PERMANENT_TTL,
+    response_cache,
+    normalize_key,
+    ttl_for,
+    is_immutable,
+)
+from MCPServer.disk_cache import disk_cache
+from MCPServer.metrics import THROTTLED, observe_request
+from MCPServer.singleflight import SingleFlight
+from MCPServer.rate_limit import (
+    MAX_RETRIES,
+    RETRY_STATUS_CODES,
+    QuotaExceededError,
+    backoff_delay,
+    coalescing_key,
+    parse_retry_after,
+    rate_limiter,
+)
+
+load_dotenv()
+
+AEROAPI_BASE_URL = os.getenv("AEROAPI_BASE_URL", "https://aeroapi.flightaware.com")
+AEROAPI_ROOT = f"{AEROAPI_BASE_URL}/aeroapi/"
+
+# Connection pool and timeout settings (overridable from .env)
+POOL_SIZE = int(os.getenv("AEROAPI_POOL_SIZE", "10"))
+CONNECT_TIMEOUT = float(os.getenv("AEROAPI_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(os.getenv("AEROAPI_READ_TIMEOUT", "30"))
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+_async_client: Optional[httpx.AsyncClient] = None
+_async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# De-duplicates identical in-flight page requests
+inflight_requests = SingleFlight()
+
+
+class AeroAPIError(Exception):
+    """Raised when an AeroAPI request fails or returns a non-200 status."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def default_headers() -> Dict[str, str]:
+    """Returns the headers sent with every AeroAPI request."""
+    return {
+        "x-apikey": os.getenv("FLIGHTAWARE_API_KEY") or "",
+        "Accept": "application/json",
+        "Accept-Encoding": "gzip, deflate",
+        "Connection": "keep-alive",
+    }
+
+
+def default_timeout() -> Tuple[float, float]:
+    """Returns the (connect, read) timeout pair used for AeroAPI requests."""
+    return (CONNECT_TIMEOUT, READ_TIMEOUT)
+
+
+def build_url(path: str) -> str:
+    """Resolves an AeroAPI path into an absolute URL.
+
+    Accepts absolute URLs, `links.next` style paths ("/aeroapi/...") and
+    paths relative to the AeroAPI root ("airports/RJTT").
+    """
+    if path.startswith("http://") or path.startswith("https://"):
+        return path
+    if path.startswith("/"):
+        return f"{AEROAPI_BASE_URL}{path}"
+    return AEROAPI_ROOT + path
+
+
+def get_session() -> requests.Session:
+    """Returns the process-wide pooled session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update(default_headers())
+                _session = session
+    return _session
+
+
+def aeroapi_get(
+    path: str,
+    params: Optional[Dict[str, Any]] = None,
+    timeout: Optional[Tuple[float, float]] = None,
+) -> requests.Response:
+    """Sends a GET request to AeroAPI over the shared session.
+
+    Args:
+        path: Absolute URL or path under the AeroAPI root.
+        params: Query parameters for the request.
+        timeout: (connect, read) timeout in seconds. Defaults to the configured values.
+    """
+    return get_session().get(
+        build_url(path), params=params, timeout=timeout or default_timeout()
+    )
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Returns the pooled async client bound to the running event loop."""
+    global _async_client, _async_client_loop
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_client_loop is not loop:
+        _async_client = httpx.AsyncClient(
+            headers=default_headers(),
+            limits=httpx.Limits(
+                max_connections=POOL_SIZE, max_keepalive_connections=POOL_SIZE
+            ),
+            timeout=httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT),
+        )
+        _async_client_loop = loop
+    return _async_client
+
+
+async def aeroapi_get_async(
+    path: str,
+    params: Optional[Dict[str, Any]] = None,
+) -> httpx.Response:
+    """Sends a GET request to AeroAPI over the shared async client.
+
+    Args:
+        path: Absolute URL or path under the AeroAPI root.
+        params: Query parameters for the request.
+    """
+    return await get_async_client().get(build_url(path), params=params)
+
+
+def store_response(key: str, url: str, body: bytes):
+    """Caches a response body in memory and, if immutable, on disk."""
+    response_cache.set(key, body, ttl_for(url))
+    if is_immutable(url):
+        disk_cache.set(key, body)
+
+
+def warm_from_disk(limit: int = 256) -> int:
+    """Loads the most recently used immutable responses from disk into memory.
+
+    Returns:
+        Number of entries loaded.
+    """
+    loaded = 0
+    for key, body in disk_cache.iter_recent(limit):
+        response_cache.set(key, body, PERMANENT_TTL)
+        loaded += 1
+    return loaded
+
+
+def retry_delay(
+    response: Union[requests.Response, httpx.Response, AeroAPIError], attempt: int
+) -> float:
+    """Decides whether a failed attempt is retried and how long to wait first.
+
+    A 429 pauses the shared rate limiter for the Retry-After period (or a
+    jittered backoff), so every in-flight request backs off together.
+
+    Args:
+        response: The failed response, or the error raised while sending it.
+        attempt: 0-based number of the attempt that failed.
+
+    Raises:
+        AeroAPIError: If the failure is not retryable or retries are exhausted.
+    """
+    if isinstance(response, AeroAPIError):
+        error, retry_after = response, None
+    else:
+        error = AeroAPIError(
+            f"API Request Failed: status_code={response.status_code}",
+            response.status_code,
+        )
+        if response.status_code not in RETRY_STATUS_CODES:
+            raise error
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+
+    if attempt >= MAX_RETRIES:
+        raise error
+    delay = backoff_delay(attempt, retry_after)
+    logging.warning(f"{error}; retrying in {delay:.1f}s (attempt {attempt + 1})")
+    if error.status_code == 429:
+        THROTTLED.inc()
+        rate_limiter.pause(delay)
+        return 0.0
+    return delay
+
+
+def request_status(response) -> str:
+    """Metric label for a request attempt: the status code, or "error"."""
+    if isinstance(response, AeroAPIError):
+        return "error"
+    return str(response.status_code)
+
+
+def fetch_json(
+    path: str,
+    params: Optional[Dict[str, Any]] = None,
+    use_cache: bool = True,
+) -> Dict[str, Any]:
+    """Fetches an AeroAPI resource as JSON, serving fresh responses from the cache.
+
+    Args:
+        path: Absolute URL or path under the AeroAPI root.
+        params: Query parameters for the request.
+        use_cache: If False, always goes to the network (the result is still cached).
+
+    Raises:
+        AeroAPIError: If the request fails or returns a non-200 status.
+    """
+    url = build_url(path)
+    key = normalize_key(url, params)
+    if use_cache:
+        body = response_cache.get(key)
+        if body is None and is_immutable(url):
+            body = disk_cache.get(key)
+            if body is not None:
+                response_cache.set(key, body, ttl_for(url))
+        if body is not None:
+            return json.loads(body)
+
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            rate_limiter.acquire_blocking()
+        except QuotaExceededError as e:
+            raise AeroAPIError(str(e))
+        started = time.perf_counter()
+        try:
+            response = aeroapi_get(url, params=params)
+        except requests.RequestException as e:
+            response = AeroAPIError(f"API request error: {e}")
+        observe_request(url, request_status(response), time.perf_counter() - started)
+        if not isinstance(response, AeroAPIError) and response.status_code == 200:
+            store_response(key, url, response.content)
+            return response.json()
+        time.sleep(retry_delay(response, attempt))
+
+
+async def fetch_json_async(
+    path: str,
+    params: Optional[Dict[str, Any]] = None,
+    use_cache: bool = True,
+) -> Dict[str, Any]:
+    """Async counterpart of fetch_json using the shared async client.
+
+    Raises:
+        AeroAPIError: If the request fails or returns a non-200 status.
+    """
+    url = build_url(path)
+    key = normalize_key(url, params)
+    if use_cache:
+        body = response_cache.get(key)
+        if body is None and is_immutable(url):
+            body = await asyncio.to_thread(disk_cache.get, key)
+            if body is not None:
+                response_cache.set(key, body, ttl_for(url))
+        if body is not None:
+            return json.loads(body)
+
+    async def download() -> bytes:
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                await rate_limiter.acquire()
+            except QuotaExceededError as e:
+                raise AeroAPIError(str(e))
+            started = time.perf_counter()
+            try:
+                response = await aeroapi_get_async(url, params=params)
+            except httpx.HTTPError as e:
+                response = AeroAPIError(f"API request error: {e}")
+            observe_request(
+                url, request_status(response), time.perf_counter() - started
+            )
+            if not isinstance(response, AeroAPIError) and response.status_code == 200:
+                response_cache.set(key, response.content, ttl_for(url))
+                if is_immutable(url):
+                    await asyncio.to_thread(disk_cache.set, key, response.content)
+                return response.content
+            await asyncio.sleep(retry_delay(response, attempt))
+
+    # Concurrent identical requests share one download; each caller gets its own parsed copy
+    body = await inflight_requests.do(coalescing_key(key), download)
+    return json.loads(body)
+
+
+def close_session():
+    """Closes the shared session and its pooled connections."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+async def close_async_client():
+    """Closes the shared async client and its pooled connections."""
+    global _async_client, _async_client_loop
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+        _async_client_loop = None
@@ -0,0 +1,304 @@
+"""Vectorized summaries of flight board records.
+
+Board tools return localized records whose times carry a UTC offset
+("2026-01-02T09:30:00+09:00") or "Z". `epoch_seconds` converts a column of
+them to a float array (NaN for missing values) in one NumPy pass, and the
+summaries below are computed on those arrays instead of record by record.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# Flights at most this many minutes late count as on time
+ON_TIME_MINUTES = 15
+
+# Scheduled gate time and the best available actual/estimated gate times
+DELAY_FIELDS = {
+    "departures": ("scheduled_out", ("actual_out", "estimated_out")),
+    "arrivals": ("scheduled_in", ("actual_in", "estimated_in")),
+}
+
+
+def epoch_seconds(values: List[Optional[str]]) -> np.ndarray:
+    """Converts ISO 8601 strings with "Z" or "+HH:MM" offsets to epoch seconds.
+
+    Missing or unparseable values become NaN.
+    """
+    result = np.full(len(values), np.nan)
+    present = [i for i, v in enumerate(values) if isinstance(v, str) and len(v) >= 19]
+    if not present:
+        return result
+    text = [values[i] for i in present]
+    try:
+        local = np.array([v[:19] for v in text], dtype="datetime64[s]")
+    except ValueError:
+        # Some value is malformed: parse one by one so only that row is NaN
+        local = np.array([_datetime64(v[:19]) for v in text], dtype="datetime64[s]")
+    offsets = np.array([_offset_seconds(v[19:]) for v in text], dtype="float64")
+    seconds = local.astype("int64").astype("float64")
+    seconds[np.isnat(local)] = np.nan
+    result[present] = seconds - offsets
+    return result
+
+
+def _datetime64(text: str) -> np.datetime64:
+    """Parses one "YYYY-MM-DDTHH:MM:SS" string (NaT if malformed)."""
+    try:
+        return np.datetime64(text, "s")
+    except ValueError:
+        return np.datetime64("NaT", "s")
+
+
+def _offset_seconds(suffix: str) -> float:
+    """Parses the "Z" / "+09:00" tail of a timestamp (NaN if unrecognized)."""
+    if suffix in ("", "Z"):
+        return 0.0
+    if len(suffix) != 6 or suffix[0] not in "+-" or suffix[3] != ":":
+        return np.nan
+    try:
+        seconds = int(suffix[1:3]) * 3600 + int(suffix[4:6]) * 60
+    except ValueError:
+        return np.nan
+    return -seconds if suffix[0] == "-" else seconds
+
+
+def column_seconds(flights: List[Dict[str, Any]], field: str) -> np.ndarray:
+    """Epoch seconds of one time field across `flights`."""
+    return epoch_seconds([flight.get(field) for flight in flights])
+
+
+def delay_minutes(flights: List[Dict[str, Any]], direction: str) -> np.ndarray:
+    """Gate delay of each flight in minutes (actual, else estimated, minus scheduled).
+
+    Early flights have negative delays; flights without times are NaN.
+    """
+    scheduled_field, actual_fields = DELAY_FIELDS[direction]
+    scheduled = column_seconds(flights, scheduled_field)
+    actual = column_seconds(flights, actual_fields[0])
+    for field in actual_fields[1:]:
+        actual = np.where(np.isnan(actual), column_seconds(flights, field), actual)
+    return (actual - scheduled) / 60
+
+
+def cancelled_mask(flights: List[Dict[str, Any]]) -> np.ndarray:
+    """True for cancelled flights."""
+    return np.array([bool(flight.get("cancelled")) for flight in flights], dtype=bool)
+
+
+def summarize_board(flights: List[Dict[str, Any]], direction: str) -> Dict[str, Any]:
+    """Counts, delay and cancellation summary of one board.
+
+    Returns:
+        {"flights", "cancelled", "with_times", "delayed", "on_time_pct",
+        "avg_delay_minutes", "max_delay_minutes"}. Delay figures cover
+        flights that have both a scheduled and an actual/estimated time.
+    """
+    delays = delay_minutes(flights, direction)
+    cancelled = cancelled_mask(flights)
+    known = delays[~np.isnan(delays) & ~cancelled]
+    summary = {
+        "flights": len(flights),
+        "cancelled": int(cancelled.sum()),
+        "with_times": int(known.size),
+        "delayed": int((known > ON_TIME_MINUTES).sum()),
+        "on_time_pct": None,
+        "avg_delay_minutes": None,
+        "max_delay_minutes": None,
+    }
+    if known.size:
+        summary["on_time_pct"] = round(
+            float((known <= ON_TIME_MINUTES).mean() * 100), 1
+        )
+        summary["avg_delay_minutes"] = round(float(known.mean()), 1)
+        summary["max_delay_minutes"] = round(float(known.max()), 1)
+    return summary
+
+
+# Delay buckets in minutes; the first catches early flights, the last is open-ended
+DELAY_BUCKETS = (0, 15, 30, 60, 120)
+STATS = ("summary", "delays", "airlines", "hourly", "routes")
+
+
+def wall_clock_hours(values: List[Optional[str]]) -> np.ndarray:
+    """Local hour of day (0-23) of each timestamp as written, -1 if missing."""
+    hours = np.full(len(values), -1, dtype="int64")
+    present = [i for i, v in enumerate(values) if isinstance(v, str) and len(v) >= 19]
+    if not present:
+        return hours
+    text = [values[i][:19] for i in present]
+    try:
+        local = np.array(text, dtype="datetime64[s]")
+    except ValueError:
+        local = np.array([_datetime64(v) for v in text], dtype="datetime64[s]")
+    valid = ~np.isnat(local)
+    hours[np.array(present)[valid]] = local[valid].astype("int64") // 3600 % 24
+    return hours
+
+
+def code_column(flights: List[Dict[str, Any]], key: str) -> np.ndarray:
+    """ICAO (else IATA/other) code of a nested airport object, "" if missing."""
+    codes = []
+    for flight in flights:
+        ref = flight.get(key) or {}
+        codes.append(ref.get("code_icao") or ref.get("code") or "")
+    return np.array(codes, dtype=object)
+
+
+def airline_column(flights: List[Dict[str, Any]]) -> np.ndarray:
+    """Operator ICAO code of each flight, "" if missing."""
+    return np.array(
+        [f.get("operator_icao") or f.get("operator") or "" for f in flights],
+        dtype=object,
+    )
+
+
+def delay_distribution(flights: List[Dict[str, Any]], direction: str) -> Dict[str, Any]:
+    """Percentiles and bucket counts of gate delays (cancelled flights excluded).
+
+    Returns:
+        {"count", "mean", "median", "p90", "p95", "max", "buckets": {label: count}}.
+    """
+    delays = delay_minutes(flights, direction)
+    known = delays[~np.isnan(delays) & ~cancelled_mask(flights)]
+    edges = np.array(DELAY_BUCKETS, dtype="float64")
+    labels = (
+        [f"<{DELAY_BUCKETS[0]}"]
+        + [f"{lo}-{hi}" for lo, hi in zip(DELAY_BUCKETS, DELAY_BUCKETS[1:])]
+        + [f"{DELAY_BUCKETS[-1]}+"]
+    )
+    counts = np.bincount(
+        np.searchsorted(edges, known, side="right"), minlength=len(labels)
+    )
+    result = {"count": int(known.size)}
+    if known.size:
+        p50, p90, p95 = np.percentile(known, [50, 90, 95])
+        result.update(
+            mean=round(float(known.mean()), 1),
+            median=round(float(p50), 1),
+            p90=round(float(p90), 1),
+            p95=round(float(p95), 1),
+            max=round(float(known.max()), 1),
+        )
+    result["buckets"] = dict(zip(labels, counts.tolist()))
+    return result
+
+
+def grouped_delays(
+    keys: np.ndarray, delays: np.ndarray, top_n: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Flight counts and delay figures per distinct key, busiest first.
+
+    Args:
+        keys: Group key of each flight ("" rows are skipped).
+        delays: Delay in minutes of each flight, NaN if unknown or cancelled.
+        top_n: Keep only the `top_n` busiest groups.
+    """
+    if not keys.size:
+        return []
+    groups, inverse = np.unique(keys.astype(str), return_inverse=True)
+    inverse = inverse.ravel()
+    flights = np.bincount(inverse, minlength=len(groups))
+    known = ~np.isnan(delays)
+    with_times = np.bincount(inverse, weights=known, minlength=len(groups))
+    on_time = np.bincount(
+        inverse, weights=known & (delays <= ON_TIME_MINUTES), minlength=len(groups)
+    )
+    total_delay = np.bincount(
+        inverse, weights=np.where(known, delays, 0), minlength=len(groups)
+    )
+
+    order = np.lexsort((groups, -flights))
+    rows = []
+    for g in order.tolist():
+        if not groups[g]:
+            continue
+        n = with_times[g]
+        rows.append(
+            {
+                "key": str(groups[g]),
+                "flights": int(flights[g]),
+                "on_time_pct": round(float(on_time[g] / n * 100), 1) if n else None,
+                "avg_delay_minutes": round(float(total_delay[g] / n), 1) if n else None,
+            }
+        )
+        if top_n and len(rows) >= top_n:
+            break
+    return rows
+
+
+def known_delays(flights: List[Dict[str, Any]], direction: str) -> np.ndarray:
+    """Delays with cancelled flights set to NaN."""
+    return np.where(cancelled_mask(flights), np.nan, delay_minutes(flights, direction))
+
+
+def on_time_by_airline(
+    flights: List[Dict[str, Any]], direction: str, top_n: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """On-time % and average delay per operator, busiest first."""
+    rows = grouped_delays(
+        airline_column(flights), known_delays(flights, direction), top_n
+    )
+    return [{"airline": row.pop("key"), **row} for row in rows]
+
+
+def top_routes(
+    flights: List[Dict[str, Any]], direction: str, top_n: Optional[int] = 10
+) -> List[Dict[str, Any]]:
+    """The `top_n` most frequent origin-destination pairs with their delays."""
+    origins = code_column(flights, "origin")
+    destinations = code_column(flights, "destination")
+    keys = np.array(
+        [f"{o}-{d}" if o and d else "" for o, d in zip(origins, destinations)],
+        dtype=object,
+    )
+    routes = []
+    for row in grouped_delays(keys, known_delays(flights, direction), top_n):
+        origin, destination = row.pop("key").split("-", 1)
+        routes.append({"origin": origin, "destination": destination, **row})
+    return routes
+
+
+def hourly_movements(flights: List[Dict[str, Any]], direction: str) -> Dict[str, Any]:
+    """Movements per local hour of day, by actual (else scheduled) gate time.
+
+    Hours are those of the returned timestamps, i.e. in the tool's timezone.
+
+    Returns:
+        {"counts": [24 ints, index = hour], "busiest_hour", "busiest_count"}.
+    """
+    scheduled_field, actual_fields = DELAY_FIELDS[direction]
+    hours = wall_clock_hours([f.get(actual_fields[0]) for f in flights])
+    for field in actual_fields[1:] + (scheduled_field,):
+        hours = np.where(
+            hours < 0, wall_clock_hours([f.get(field) for f in flights]), hours
+        )
+    counts = np.bincount(hours[hours >= 0], minlength=24)
+    busiest = int(counts.argmax())
+    return {
+        "counts": counts.tolist(),
+        "busiest_hour": busiest if counts[busiest] else None,
+        "busiest_count": int(counts[busiest]),
+    }
+
+
+def board_stats(
+    flights: List[Dict[str, Any]],
+    direction: str,
+    stats: Optional[List[str]] = None,
+    top_n: int = 10,
+) -> Dict[str, Any]:
+    """Computes the requested aggregates (all of STATS by default) of one board."""
+    stats = stats or list(STATS)
+    result: Dict[str, Any] = {}
+    if "summary" in stats:
+        result["summary"] = summarize_board(flights, direction)
+    if "delays" in stats:
+        result["delays"] = delay_distribution(flights, direction)
+    if "airlines" in stats:
+        result["airlines"] = on_time_by_airline(flights, direction, top_n)
+    if "hourly" in stats:
+        result["hourly"] = hourly_movements(flights, direction)
+    if "routes" in stats:
+        result["routes"] = top_routes(flights, direction, top_n)
+    return result
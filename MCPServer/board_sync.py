@@ -0,0 +1,164 @@
+"""Incremental tracking of live airport boards.
+
+Board screens poll the rolling window around now. Instead of refetching the
+whole window each time, a Board keeps the last snapshot per airport and
+direction, refetches only the newly opened time slice plus the part of the
+window where flights can still change, and reports the difference to the
+version a client saw last:
+
+    added     flights that entered the window
+    changed   flights whose record changed
+    departed  fa_flight_ids that left the window
+
+Snapshots hold raw AeroAPI records (UTC); callers localize on the way out.
+"""
+
+import hashlib
+import json
+import os
+import random
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from MCPServer.flight_store import board_time
+
+# Number of past versions kept per board for clients that skip polls
+BOARD_HISTORY = int(os.getenv("AEROAPI_BOARD_HISTORY", "10"))
+# Records within this many seconds of the previous window end are refetched,
+# since AeroAPI can report a movement a few minutes after it happened
+BOARD_SETTLE_SECONDS = int(os.getenv("AEROAPI_BOARD_SETTLE_SECONDS", "600"))
+
+# Field that marks a record as final, per board direction
+FINAL_FIELDS = {"departures": "actual_off", "arrivals": "actual_in"}
+
+
+def fingerprint(record: Dict[str, Any]) -> str:
+    """Returns a stable digest of a record for change detection."""
+    text = json.dumps(record, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def is_in_progress(record: Dict[str, Any], direction: str) -> bool:
+    """True if a board record can still change (e.g. landed but not at the gate)."""
+    if record.get("cancelled"):
+        return False
+    return not record.get(FINAL_FIELDS[direction])
+
+
+class Board:
+    """Latest snapshot and version history of one airport board."""
+
+    def __init__(self, airport: str, direction: str):
+        self.airport = airport
+        self.direction = direction
+        self.start: Optional[int] = None
+        self.end: Optional[int] = None
+        self.flights: Dict[str, Dict[str, Any]] = {}
+        # Random starting point, so a version issued by another server process
+        # (or before a restart) is reported as expired instead of matching
+        self.version = random.SystemRandom().getrandbits(48)
+        self._history: Deque[Tuple[int, Dict[str, str]]] = deque(
+            maxlen=max(1, BOARD_HISTORY)
+        )
+
+    def refresh_range(self, start: int, end: int) -> Tuple[int, int]:
+        """Returns the (start, end) slice to fetch to bring the board to [start, end].
+
+        Everything is fetched on the first call or when the new window does
+        not overlap the snapshot. Otherwise the fetch starts at the earliest
+        record still in progress, or BOARD_SETTLE_SECONDS before the previous
+        window end, whichever is earlier.
+        """
+        if self.end is None or start >= self.end:
+            return start, end
+        refetch_from = self.end - BOARD_SETTLE_SECONDS
+        for record in self.flights.values():
+            if is_in_progress(record, self.direction):
+                when = board_time(record, self.direction)
+                if when is not None:
+                    refetch_from = min(refetch_from, when)
+        return max(start, refetch_from), end
+
+    def apply(
+        self, start: int, end: int, fetched: List[Dict[str, Any]], fetched_from: int
+    ) -> int:
+        """Merges a fetched slice into the snapshot and returns the new version.
+
+        Records before `fetched_from` are carried over from the previous
+        snapshot; the fetched slice replaces everything from `fetched_from`
+        on, so flights that disappeared from it are dropped.
+        """
+        flights = {}
+        for fa_flight_id, record in self.flights.items():
+            when = board_time(record, self.direction)
+            if when is not None and start <= when < fetched_from:
+                flights[fa_flight_id] = record
+        for record in fetched:
+            fa_flight_id = record.get("fa_flight_id")
+            if fa_flight_id:
+                flights[fa_flight_id] = record
+
+        self.start, self.end = start, end
+        self.flights = flights
+        self.version += 1
+        self._history.append(
+            (
+                self.version,
+                {key: fingerprint(value) for key, value in flights.items()},
+            )
+        )
+        return self.version
+
+    def diff(self, since: Optional[int]) -> Dict[str, Any]:
+        """Returns changes between version `since` and the current snapshot.
+
+        If `since` is unknown or expired, every flight is reported as added
+        and "reset" is True.
+        """
+        previous = None
+        if since is not None:
+            previous = next((fps for v, fps in self._history if v == since), None)
+        current = self._history[-1][1] if self._history else {}
+
+        if previous is None:
+            return {
+                "version": self.version,
+                "reset": True,
+                "added": list(self.flights.values()),
+                "changed": [],
+                "departed": [],
+                "unchanged": 0,
+            }
+
+        added, changed = [], []
+        unchanged = 0
+        for fa_flight_id, digest in current.items():
+            before = previous.get(fa_flight_id)
+            if before is None:
+                added.append(self.flights[fa_flight_id])
+            elif before != digest:
+                changed.append(self.flights[fa_flight_id])
+            else:
+                unchanged += 1
+        departed = [key for key in previous if key not in current]
+        return {
+            "version": self.version,
+            "reset": False,
+            "added": added,
+            "changed": changed,
+            "departed": departed,
+            "unchanged": unchanged,
+        }
+
+
+# Live boards keyed by (airport code, direction)
+boards: Dict[Tuple[str, str], Board] = {}
+
+
+def get_board(airport: str, direction: str) -> Board:
+    """Returns the tracked board for an airport, creating it on first use."""
+    key = (airport.upper(), direction)
+    board = boards.get(key)
+    if board is None:
+        board = boards[key] = Board(key[0], direction)
+    return board
@@ -0,0 +1,161 @@
+"""In-memory TTL response cache for AeroAPI.
+
+Entries are raw response bodies keyed on the normalized URL and query
+parameters. Freshness is decided per endpoint by `ttl_for`, and the cache is
+bounded by both entry count and total bytes with LRU eviction.
+"""
+
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Freshness policy in seconds (overridable from .env)
+BOARD_TTL = float(os.getenv("AEROAPI_CACHE_BOARD_TTL", "60"))
+SCHEDULE_TTL = float(os.getenv("AEROAPI_CACHE_SCHEDULE_TTL", "3600"))
+ACTIVE_TRACK_TTL = float(os.getenv("AEROAPI_CACHE_ACTIVE_TRACK_TTL", "60"))
+DEFAULT_TTL = float(os.getenv("AEROAPI_CACHE_DEFAULT_TTL", "60"))
+PERMANENT_TTL = 30 * 24 * 3600
+
+CACHE_MAX_ENTRIES = int(os.getenv("AEROAPI_CACHE_MAX_ENTRIES", "1024"))
+CACHE_MAX_BYTES = int(os.getenv("AEROAPI_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# A track is treated as final this long after the timestamp embedded in its fa_flight_id
+TRACK_FINAL_AFTER = 2 * 24 * 3600
+
+_TRACK_RE = re.compile(r"/flights/([^/]+)/track$")
+_AIRPORT_INFO_RE = re.compile(r"/airports/[^/]+$")
+_BOARD_RE = re.compile(r"/airports/[^/]+/flights(/[^/]+)?$")
+_SCHEDULE_RE = re.compile(r"/schedules/")
+
+
+def normalize_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Builds a cache key from a URL and query parameters.
+
+    Query parameters embedded in the URL and those passed separately are merged
+    and sorted, so equivalent requests map to the same key.
+    """
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        query.extend((k, str(v)) for k, v in params.items() if v is not None)
+    return urlunsplit(
+        (
+            parts.scheme,
+            parts.netloc,
+            parts.path.rstrip("/"),
+            urlencode(sorted(query)),
+            "",
+        )
+    )
+
+
+def flight_id_timestamp(fa_flight_id: str) -> Optional[int]:
+    """Extracts the epoch timestamp embedded in an fa_flight_id, if any."""
+    # e.g. "ANA182-1747206976-airline-1811p"
+    for part in fa_flight_id.split("-")[1:]:
+        if part.isdigit() and len(part) >= 9:
+            return int(part)
+    return None
+
+
+def ttl_for(url: str) -> float:
+    """Returns how long a response for `url` stays fresh, in seconds."""
+    path = urlsplit(url).path.rstrip("/")
+
+    match = _TRACK_RE.search(path)
+    if match:
+        timestamp = flight_id_timestamp(match.group(1))
+        if timestamp is not None and time.time() - timestamp > TRACK_FINAL_AFTER:
+            return PERMANENT_TTL
+        return ACTIVE_TRACK_TTL
+    if _BOARD_RE.search(path):
+        return BOARD_TTL
+    if _AIRPORT_INFO_RE.search(path):
+        return PERMANENT_TTL
+    if _SCHEDULE_RE.search(path):
+        return SCHEDULE_TTL
+    return DEFAULT_TTL
+
+
+def is_immutable(url: str) -> bool:
+    """True for responses that never change (airport records, completed tracks)."""
+    return ttl_for(url) >= PERMANENT_TTL
+
+
+class TTLCache:
+    """Thread-safe LRU cache with per-entry expiry and a byte budget."""
+
+    def __init__(
+        self, max_entries: int = CACHE_MAX_ENTRIES, max_bytes: int = CACHE_MAX_BYTES
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Returns the cached body for `key`, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, body = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def set(self, key: str, body: bytes, ttl: float):
+        """Stores `body` under `key` for `ttl` seconds, evicting LRU entries as needed."""
+        if ttl <= 0 or len(body) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, body)
+            self._bytes += len(body)
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def clear(self):
+        """Drops every entry. Counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hit/miss counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    def _remove(self, key: str):
+        _, body = self._entries.pop(key)
+        self._bytes -= len(body)
+
+
+# Process-wide cache shared by the MCP server and scripts
+response_cache = TTLCache()
@@ -0,0 +1,233 @@
+"""Persistent on-disk store for immutable AeroAPI responses.
+
+Completed flight tracks and airport records never change, so they are kept in
+a SQLite database that survives restarts and is shared by every process on
+the host (MCP server workers and standalone scripts). Entries are addressed
+by the SHA-256 of the normalized request key, stored zlib-compressed, and
+evicted least-recently-used once the store exceeds its size budget.
+
+The same database holds the monthly AeroAPI request count, so the quota
+budget survives restarts and is shared by every process.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Optional, Dict, Any, Tuple
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DISK_CACHE_PATH = os.getenv(
+    "AEROAPI_DISK_CACHE_PATH", os.path.join(project_root, ".cache", "aeroapi.sqlite3")
+)
+DISK_CACHE_MAX_BYTES = int(
+    os.getenv("AEROAPI_DISK_CACHE_MAX_BYTES", str(512 * 1024 * 1024))
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    digest TEXT PRIMARY KEY,
+    request_key TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries (last_access);
+CREATE TABLE IF NOT EXISTS quota_usage (
+    month TEXT PRIMARY KEY,
+    used INTEGER NOT NULL
+);
+"""
+
+
+def digest_for(key: str) -> str:
+    """Returns the content address for a normalized request key."""
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+class DiskCache:
+    """SQLite-backed, multi-process safe store of response bodies."""
+
+    def __init__(
+        self, path: str = DISK_CACHE_PATH, max_bytes: int = DISK_CACHE_MAX_BYTES
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            # WAL lets readers in other processes proceed while one process writes
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    @property
+    def enabled(self) -> bool:
+        """False when AEROAPI_DISK_CACHE_PATH is set to an empty string."""
+        return bool(self.path)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Returns the stored body for `key`, or None."""
+        if not self.enabled:
+            return None
+        try:
+            conn = self._connect()
+            digest = digest_for(key)
+            row = conn.execute(
+                "SELECT body FROM entries WHERE digest = ?", (digest,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            with conn:
+                conn.execute(
+                    "UPDATE entries SET last_access = ? WHERE digest = ?",
+                    (time.time(), digest),
+                )
+            self.hits += 1
+            return zlib.decompress(row[0])
+        except (sqlite3.Error, zlib.error) as e:
+            logging.warning(f"Disk cache read failed: {e}")
+            return None
+
+    def set(self, key: str, body: bytes):
+        """Stores `body` under `key` and evicts old entries beyond the size budget."""
+        if not self.enabled:
+            return
+        compressed = zlib.compress(body)
+        if len(compressed) > self.max_bytes:
+            return
+        now = time.time()
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries "
+                    "(digest, request_key, body, size, created_at, last_access) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (digest_for(key), key, compressed, len(compressed), now, now),
+                )
+            self._evict(conn)
+        except sqlite3.Error as e:
+            logging.warning(f"Disk cache write failed: {e}")
+
+    def _evict(self, conn: sqlite3.Connection):
+        with conn:
+            total = conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            rows = conn.execute(
+                "SELECT digest, size FROM entries ORDER BY last_access"
+            ).fetchall()
+            stale = []
+            for digest, size in rows:
+                if total <= self.max_bytes:
+                    break
+                stale.append((digest,))
+                total -= size
+            conn.executemany("DELETE FROM entries WHERE digest = ?", stale)
+
+    def iter_recent(self, limit: int):
+        """Yields (request_key, body) for the most recently used entries."""
+        if not self.enabled:
+            return
+        try:
+            rows = (
+                self._connect()
+                .execute(
+                    "SELECT request_key, body FROM entries "
+                    "ORDER BY last_access DESC LIMIT ?",
+                    (limit,),
+                )
+                .fetchall()
+            )
+        except sqlite3.Error as e:
+            logging.warning(f"Disk cache scan failed: {e}")
+            return
+        for request_key, body in rows:
+            yield request_key, zlib.decompress(body)
+
+    def charge_quota(self, month: str, limit: int) -> Optional[Tuple[bool, int]]:
+        """Counts one request against `month` unless the count has reached `limit`.
+
+        The check and the increment are one statement, so concurrent
+        processes cannot overshoot the limit.
+
+        Args:
+            month: Calendar month ("YYYY-MM").
+            limit: Maximum count for the month; 0 for no limit.
+
+        Returns:
+            (charged, count after the call), or None if the store is disabled
+            or unavailable.
+        """
+        if not self.enabled:
+            return None
+        try:
+            conn = self._connect()
+            with conn:
+                charged = conn.execute(
+                    "INSERT INTO quota_usage (month, used) VALUES (?, 1) "
+                    "ON CONFLICT (month) DO UPDATE SET used = used + 1 "
+                    "WHERE ? = 0 OR used < ?",
+                    (month, limit, limit),
+                ).rowcount
+                used = conn.execute(
+                    "SELECT used FROM quota_usage WHERE month = ?", (month,)
+                ).fetchone()
+            return charged > 0, used[0] if used else 0
+        except sqlite3.Error as e:
+            logging.warning(f"Quota count update failed: {e}")
+            return None
+
+    def quota_used(self, month: str) -> Optional[int]:
+        """Returns the stored request count for `month`, or None if unavailable."""
+        if not self.enabled:
+            return None
+        try:
+            row = (
+                self._connect()
+                .execute("SELECT used FROM quota_usage WHERE month = ?", (month,))
+                .fetchone()
+            )
+        except sqlite3.Error:
+            return None
+        return row[0] if row else 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hit/miss counters and current size."""
+        if not self.enabled:
+            return {"hits": 0, "misses": 0, "entries": 0, "bytes": 0}
+        try:
+            entries, size = (
+                self._connect()
+                .execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries")
+                .fetchone()
+            )
+        except sqlite3.Error:
+            entries, size = 0, 0
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": entries,
+            "bytes": size,
+        }
+
+
+# Process-wide handle; the database itself is shared across processes
+disk_cache = DiskCache()
@@ -0,0 +1,316 @@
+"""Local store of fetched flight records for historical queries.
+
+Every departure/arrival record the tools fetch is upserted into a SQLite
+database indexed by airport, fa_flight_id, ident and time. The store also
+records which (airport, direction, time window) ranges have been fetched
+completely, so repeated historical queries are answered locally and only
+the missing gaps go to AeroAPI.
+
+Records are kept exactly as AeroAPI returned them (UTC); callers localize
+on the way out.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FLIGHT_STORE_PATH = os.getenv(
+    "AEROAPI_FLIGHT_STORE_PATH", os.path.join(project_root, ".cache", "flights.sqlite3")
+)
+# Windows ending at least this long ago are final and answered from the store
+FLIGHT_STORE_FINAL_AFTER = int(
+    os.getenv("AEROAPI_FLIGHT_STORE_FINAL_AFTER", str(6 * 3600))
+)
+FLIGHT_STORE_RETENTION_DAYS = int(
+    os.getenv("AEROAPI_FLIGHT_STORE_RETENTION_DAYS", "90")
+)
+
+DIRECTIONS = ("departures", "arrivals")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS flights (
+    fa_flight_id TEXT PRIMARY KEY,
+    ident TEXT,
+    origin TEXT,
+    origin_iata TEXT,
+    destination TEXT,
+    destination_iata TEXT,
+    scheduled_out INTEGER,
+    scheduled_in INTEGER,
+    departure_time INTEGER,
+    arrival_time INTEGER,
+    record TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_flights_ident ON flights (ident);
+CREATE INDEX IF NOT EXISTS idx_flights_scheduled_out ON flights (scheduled_out);
+CREATE INDEX IF NOT EXISTS idx_flights_origin_departure ON flights (origin, departure_time);
+CREATE INDEX IF NOT EXISTS idx_flights_destination_arrival ON flights (destination, arrival_time);
+CREATE TABLE IF NOT EXISTS coverage (
+    airport TEXT NOT NULL,
+    direction TEXT NOT NULL,
+    start INTEGER NOT NULL,
+    end INTEGER NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_coverage ON coverage (airport, direction, start);
+"""
+
+
+def to_epoch(iso_str: Optional[str]) -> Optional[int]:
+    """Converts a UTC ISO 8601 string ("...Z") to epoch seconds."""
+    if not iso_str:
+        return None
+    try:
+        return int(datetime.fromisoformat(iso_str.replace("Z", "+00:00")).timestamp())
+    except ValueError:
+        return None
+
+
+def to_iso(epoch: int) -> str:
+    """Converts epoch seconds to the UTC ISO 8601 form AeroAPI expects."""
+    return (
+        datetime.fromtimestamp(epoch, timezone.utc)
+        .isoformat(timespec="seconds")
+        .replace("+00:00", "Z")
+    )
+
+
+def board_time(record: Dict[str, Any], direction: str) -> Optional[int]:
+    """Returns the time AeroAPI filters a board on (actual, else estimated, else scheduled)."""
+    if direction == "departures":
+        fields = (
+            "actual_off",
+            "actual_out",
+            "estimated_off",
+            "estimated_out",
+            "scheduled_off",
+            "scheduled_out",
+        )
+    else:
+        fields = (
+            "actual_on",
+            "actual_in",
+            "estimated_on",
+            "estimated_in",
+            "scheduled_on",
+            "scheduled_in",
+        )
+    for field in fields:
+        value = to_epoch(record.get(field))
+        if value is not None:
+            return value
+    return None
+
+
+def missing_ranges(
+    start: int, end: int, covered: List[Tuple[int, int]]
+) -> List[Tuple[int, int]]:
+    """Returns the parts of [start, end] not covered by the given intervals."""
+    gaps = []
+    cursor = start
+    for covered_start, covered_end in sorted(covered):
+        if covered_end <= cursor:
+            continue
+        if covered_start > cursor:
+            gaps.append((cursor, min(covered_start, end)))
+        cursor = max(cursor, covered_end)
+        if cursor >= end:
+            break
+    if cursor < end:
+        gaps.append((cursor, end))
+    return [(s, e) for s, e in gaps if e > s]
+
+
+class FlightStore:
+    """SQLite-backed flight record store with coverage tracking."""
+
+    def __init__(self, path: str = FLIGHT_STORE_PATH):
+        self.path = path
+        self._local = threading.local()
+
+    @property
+    def enabled(self) -> bool:
+        """False when AEROAPI_FLIGHT_STORE_PATH is set to an empty string."""
+        return bool(self.path)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def ingest(self, records: List[Dict[str, Any]]) -> int:
+        """Upserts raw (UTC) flight records. Returns the number stored."""
+        if not self.enabled or not records:
+            return 0
+        now = time.time()
+        rows = []
+        for record in records:
+            fa_flight_id = record.get("fa_flight_id")
+            if not fa_flight_id:
+                continue
+            origin = record.get("origin") or {}
+            destination = record.get("destination") or {}
+            rows.append(
+                (
+                    fa_flight_id,
+                    record.get("ident"),
+                    origin.get("code_icao") or origin.get("code"),
+                    origin.get("code_iata"),
+                    destination.get("code_icao") or destination.get("code"),
+                    destination.get("code_iata"),
+                    to_epoch(record.get("scheduled_out")),
+                    to_epoch(record.get("scheduled_in")),
+                    board_time(record, "departures"),
+                    board_time(record, "arrivals"),
+                    json.dumps(record, ensure_ascii=False, separators=(",", ":")),
+                    now,
+                )
+            )
+        try:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO flights VALUES "
+                    "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+        except sqlite3.Error as e:
+            logging.warning(f"Flight store ingest failed: {e}")
+            return 0
+        return len(rows)
+
+    def missing(
+        self, airport: str, direction: str, start: int, end: int
+    ) -> List[Tuple[int, int]]:
+        """Returns the sub-windows of [start, end] not yet fetched completely."""
+        if not self.enabled:
+            return [(start, end)]
+        try:
+            covered = (
+                self._connect()
+                .execute(
+                    "SELECT start, end FROM coverage "
+                    "WHERE airport = ? AND direction = ? AND start < ? AND end > ?",
+                    (airport.upper(), direction, end, start),
+                )
+                .fetchall()
+            )
+        except sqlite3.Error as e:
+            logging.warning(f"Flight store coverage lookup failed: {e}")
+            return [(start, end)]
+        return missing_ranges(start, end, covered)
+
+    def mark_covered(self, airport: str, direction: str, start: int, end: int):
+        """Records that [start, end] was fetched completely."""
+        if not self.enabled:
+            return
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT INTO coverage VALUES (?, ?, ?, ?, ?)",
+                    (airport.upper(), direction, start, end, time.time()),
+                )
+        except sqlite3.Error as e:
+            logging.warning(f"Flight store coverage update failed: {e}")
+
+    def query_board(
+        self, airport: str, direction: str, start: int, end: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Returns stored records for an airport board window, in time order.
+
+        Returns None if the store is disabled or the lookup fails.
+        """
+        if not self.enabled:
+            return None
+        if direction == "departures":
+            sql = (
+                "SELECT record FROM flights WHERE (origin = ? OR origin_iata = ?) "
+                "AND departure_time BETWEEN ? AND ? ORDER BY departure_time"
+            )
+        else:
+            sql = (
+                "SELECT record FROM flights WHERE (destination = ? OR destination_iata = ?) "
+                "AND arrival_time BETWEEN ? AND ? ORDER BY arrival_time"
+            )
+        code = airport.upper()
+        try:
+            rows = self._connect().execute(sql, (code, code, start, end)).fetchall()
+        except sqlite3.Error as e:
+            logging.warning(f"Flight store board lookup failed: {e}")
+            return None
+        return [json.loads(row[0]) for row in rows]
+
+    def query_ident(
+        self, ident: str, start: Optional[int] = None, end: Optional[int] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Returns stored records for a flight ident, optionally by scheduled_out window.
+
+        Returns None if the store is disabled or the lookup fails.
+        """
+        if not self.enabled:
+            return None
+        sql = "SELECT record FROM flights WHERE ident = ?"
+        args: List[Any] = [ident]
+        if start is not None:
+            sql += " AND scheduled_out >= ?"
+            args.append(start)
+        if end is not None:
+            sql += " AND scheduled_out <= ?"
+            args.append(end)
+        try:
+            rows = (
+                self._connect()
+                .execute(sql + " ORDER BY scheduled_out", args)
+                .fetchall()
+            )
+        except sqlite3.Error as e:
+            logging.warning(f"Flight store ident lookup failed: {e}")
+            return None
+        return [json.loads(row[0]) for row in rows]
+
+    def prune(self, retention_days: int = FLIGHT_STORE_RETENTION_DAYS) -> int:
+        """Deletes records and coverage older than the retention period.
+
+        A flight is kept while either of its board times is inside the
+        retention period, and coverage that straddles the cutoff is trimmed
+        to start at it, so every remaining coverage window stays complete.
+        """
+        if not self.enabled:
+            return 0
+        cutoff = int(time.time()) - retention_days * 86400
+        try:
+            conn = self._connect()
+            with conn:
+                deleted = conn.execute(
+                    "DELETE FROM flights WHERE MAX("
+                    "COALESCE(departure_time, scheduled_out, 0), "
+                    "COALESCE(arrival_time, scheduled_in, 0)) < ?",
+                    (cutoff,),
+                ).rowcount
+                conn.execute("DELETE FROM coverage WHERE end <= ?", (cutoff,))
+                conn.execute(
+                    "UPDATE coverage SET start = ? WHERE start < ?", (cutoff, cutoff)
+                )
+        except sqlite3.Error as e:
+            logging.warning(f"Flight store prune failed: {e}")
+            return 0
+        return deleted
+
+
+# Process-wide handle; the database itself is shared across processes
+flight_store = FlightStore()
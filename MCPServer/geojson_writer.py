@@ -0,0 +1,63 @@
+"""Incremental GeoJSON writers.
+
+Features are written as soon as they are produced, so memory stays flat no
+matter how many tracks go into one file. Output is compact JSON, either as a
+single FeatureCollection or as newline-delimited GeoJSON (GeoJSONSeq), one
+Feature per line.
+"""
+
+import json
+from typing import Any, Dict, Optional
+
+OUTPUT_FORMATS = ("geojson", "geojsonseq")
+
+
+class FeatureCollectionWriter:
+    """Streams features to a FeatureCollection or GeoJSONSeq file.
+
+    Usage:
+        with FeatureCollectionWriter("out.geojson") as writer:
+            writer.write(feature)
+    """
+
+    def __init__(self, path: str, output_format: str = "geojson"):
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(
+                f"output_format must be one of {', '.join(OUTPUT_FORMATS)}."
+            )
+        self.path = path
+        self.output_format = output_format
+        self.count = 0
+        self._file = None
+
+    def open(self):
+        """Opens the file and writes the collection header."""
+        self._file = open(self.path, "w", encoding="utf-8")
+        if self.output_format == "geojson":
+            self._file.write('{"type":"FeatureCollection","features":[')
+        return self
+
+    def write(self, feature: Dict[str, Any]):
+        """Appends one feature."""
+        text = json.dumps(feature, ensure_ascii=False, separators=(",", ":"))
+        if self.output_format == "geojsonseq":
+            self._file.write(text + "\n")
+        else:
+            self._file.write(("," if self.count else "") + text)
+        self.count += 1
+
+    def close(self):
+        """Writes the collection footer and closes the file."""
+        if self._file is None:
+            return
+        if self.output_format == "geojson":
+            self._file.write("]}\n")
+        self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb) -> Optional[bool]:
+        self.close()
+        return None
@@ -0,0 +1,167 @@
+"""Timezone localization of flight time fields.
+
+AeroAPI returns every timestamp as a UTC ISO 8601 string ("...Z"). Converting
+them one at a time with `fromisoformat` dominates tool latency on large
+`fetch_all` results, so `localize_flight_data` gathers every time field of a
+batch and converts the distinct values in one NumPy datetime64 pass.
+"""
+
+import re
+from datetime import datetime, timedelta, timezone, tzinfo
+from functools import lru_cache
+from typing import List, Dict, Any, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import numpy as np
+
+from MCPServer.metrics import LOCALIZE_SECONDS, span
+
+JST = timezone(timedelta(hours=9), "JST")
+
+TIME_FIELDS = [
+    "scheduled_out",
+    "estimated_out",
+    "actual_out",
+    "scheduled_in",
+    "estimated_in",
+    "actual_in",
+    "scheduled_off",
+    "estimated_off",
+    "actual_off",
+    "scheduled_on",
+    "estimated_on",
+    "actual_on",
+]
+
+_OFFSET_RE = re.compile(r"^(?:UTC)?([+-])(\d{1,2}):?(\d{2})?$")
+# Whole-second UTC timestamps, the shape AeroAPI normally returns
+_PLAIN_UTC_RE = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z$")
+
+
+@lru_cache(maxsize=64)
+def resolve_timezone(name: Optional[str]) -> tzinfo:
+    """Resolves a timezone name ("Asia/Tokyo", "JST", "UTC", "+09:00").
+
+    Raises:
+        ValueError: If the name is not a known timezone.
+    """
+    if not name or name.upper() == "JST":
+        return JST
+    if name.upper() in ("UTC", "Z"):
+        return timezone.utc
+    match = _OFFSET_RE.match(name)
+    if match:
+        sign, hours, minutes = match.groups()
+        offset = timedelta(hours=int(hours), minutes=int(minutes or 0))
+        return timezone(-offset if sign == "-" else offset)
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown timezone: {name}")
+
+
+@lru_cache(maxsize=65536)
+def convert_timestamp(iso_str: str, tz: tzinfo = JST) -> str:
+    """Converts one ISO format datetime string to `tz`. Memoized for repeated values."""
+    try:
+        # Replace Z with +00:00 and parse
+        dt = datetime.fromisoformat(iso_str.replace("Z", "+00:00"))
+        return dt.astimezone(tz).isoformat()
+    except ValueError:
+        return iso_str
+
+
+def convert_to_jst(iso_str):
+    """Converts ISO format datetime string to Japan Standard Time (JST)."""
+    if not iso_str:
+        return None
+    return convert_timestamp(iso_str, JST)
+
+
+def format_offset(offset: timedelta) -> str:
+    """Formats a UTC offset the way datetime.isoformat does ("+09:00")."""
+    total = int(offset.total_seconds())
+    sign = "-" if total < 0 else "+"
+    hours, minutes = divmod(abs(total) // 60, 60)
+    return f"{sign}{hours:02d}:{minutes:02d}"
+
+
+def convert_batch(values: List[str], tz: tzinfo) -> List[str]:
+    """Converts a batch of UTC "Z" timestamps to `tz` in one vectorized pass.
+
+    Distinct values are converted once. Only whole-second "YYYY-MM-DDTHH:MM:SSZ"
+    values take the vectorized path; anything else (fractional seconds,
+    explicit offsets) goes through the memoized per-value parser.
+    """
+    index: Dict[str, int] = {}
+    codes = [index.setdefault(v, len(index)) for v in values]
+    unique = list(index)
+    converted: List[Optional[str]] = [None] * len(unique)
+    plain = []
+    for i, v in enumerate(unique):
+        if _PLAIN_UTC_RE.match(v):
+            plain.append(i)
+        else:
+            converted[i] = convert_timestamp(v, tz)
+    if plain:
+        texts = _convert_plain_utc([unique[i] for i in plain], tz)
+        for i, text in zip(plain, texts):
+            converted[i] = text
+    return [converted[c] for c in codes]
+
+
+def _convert_plain_utc(values: List[str], tz: tzinfo) -> List[str]:
+    """Vectorized conversion of "YYYY-MM-DDTHH:MM:SSZ" values to `tz`."""
+    try:
+        utc = np.array([v[:-1] for v in values], dtype="datetime64[s]")
+    except ValueError:
+        return [convert_timestamp(v, tz) for v in values]
+
+    fixed_offset = tz.utcoffset(None)
+    if fixed_offset is not None:
+        offsets = np.full(len(values), int(fixed_offset.total_seconds()), "int64")
+    else:
+        # DST-aware zones: transitions fall on quarter hours, so resolve the
+        # offset once per distinct 15-minute bucket
+        buckets, inverse = np.unique(utc.astype("int64") // 900, return_inverse=True)
+        bucket_offsets = np.array(
+            [
+                datetime.fromtimestamp(int(b) * 900, timezone.utc)
+                .astimezone(tz)
+                .utcoffset()
+                .total_seconds()
+                for b in buckets
+            ],
+            dtype="int64",
+        )
+        offsets = bucket_offsets[inverse.ravel()]
+    local = utc + offsets.astype("timedelta64[s]")
+    text = np.datetime_as_string(local, unit="s")
+    if fixed_offset is not None:
+        suffix = format_offset(fixed_offset)
+        return [t + suffix for t in text.tolist()]
+    offset_list = offsets.tolist()
+    labels = {o: format_offset(timedelta(seconds=o)) for o in set(offset_list)}
+    return [t + labels[o] for t, o in zip(text.tolist(), offset_list)]
+
+
+def localize_flight_data(
+    flights: List[Dict[str, Any]], tz: Optional[tzinfo] = None
+) -> List[Dict[str, Any]]:
+    """Converts time fields in flight data to `tz` (JST by default), in place."""
+    tz = tz or JST
+    locations = []
+    values = []
+    for flight in flights:
+        for field in TIME_FIELDS:
+            value = flight.get(field)
+            if value:
+                locations.append((flight, field))
+                values.append(value)
+    if not values:
+        return flights
+
+    with span("localize", LOCALIZE_SECONDS):
+        for (flight, field), converted in zip(locations, convert_batch(values, tz)):
+            flight[field] = converted
+    return flights
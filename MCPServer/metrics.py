@@ -0,0 +1,230 @@
+"""Timing spans, Prometheus metrics and optional OpenTelemetry tracing.
+
+Hot paths (tool calls, AeroAPI requests, localization, agent steps) are timed
+into Prometheus histograms. Cache, disk cache and rate limiter counters are
+exported as gauges at scrape time. Without prometheus_client installed the
+metrics are no-ops.
+
+Tracing is enabled by `init_tracing` when OpenTelemetry is installed and
+OTEL_EXPORTER_OTLP_ENDPOINT is set. The agent injects its trace context into
+the MCP request `_meta`, and tools continue the trace from it, so agent and
+server spans join across the stdio boundary.
+"""
+
+import functools
+import logging
+import os
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST,
+        REGISTRY,
+        Counter,
+        Histogram,
+        generate_latest,
+        start_http_server,
+    )
+    from prometheus_client.core import GaugeMetricFamily
+except ImportError:
+    REGISTRY = None
+
+# Serve /metrics from the MCP server process on this port (0 disables)
+METRICS_PORT = int(os.getenv("AEROAPI_METRICS_PORT", "0"))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+class _NoopMetric:
+    """Stands in for a metric when prometheus_client is not installed."""
+
+    def labels(self, **labels):
+        return self
+
+    def observe(self, value: float):
+        pass
+
+    def inc(self, amount: float = 1):
+        pass
+
+
+def _histogram(name: str, documentation: str, labels=(), buckets=LATENCY_BUCKETS):
+    if REGISTRY is None:
+        return _NoopMetric()
+    return Histogram(name, documentation, labels, buckets=buckets)
+
+
+TOOL_SECONDS = _histogram(
+    "mcp_tool_duration_seconds", "MCP tool call duration", ["tool"]
+)
+AEROAPI_REQUEST_SECONDS = _histogram(
+    "aeroapi_request_duration_seconds",
+    "AeroAPI HTTP request duration (network only, per attempt)",
+    ["endpoint", "status"],
+)
+LOCALIZE_SECONDS = _histogram(
+    "localize_duration_seconds", "Time spent converting flight times"
+)
+PAGES_PER_CALL = _histogram(
+    "aeroapi_pages_per_call",
+    "AeroAPI pages read per paginated fetch",
+    ["data_key"],
+    buckets=(1, 2, 3, 5, 10, 20, 50, 100),
+)
+AGENT_STEP_SECONDS = _histogram(
+    "agent_step_duration_seconds",
+    "Agent request and step duration (llm, tool, total)",
+    ["step"],
+)
+THROTTLED = (
+    Counter("aeroapi_throttled_total", "AeroAPI 429 responses")
+    if REGISTRY is not None
+    else _NoopMetric()
+)
+
+tracer = None
+
+
+def init_tracing(service_name: str):
+    """Enables OpenTelemetry tracing if it is installed and an endpoint is configured."""
+    global tracer
+    if tracer is not None or not os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT"):
+        return
+    try:
+        from opentelemetry import trace
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+            OTLPSpanExporter,
+        )
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    except ImportError:
+        logging.warning(
+            "OTEL_EXPORTER_OTLP_ENDPOINT is set but OpenTelemetry is not installed"
+        )
+        return
+    service_name = os.getenv("OTEL_SERVICE_NAME", service_name)
+    provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+    provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    trace.set_tracer_provider(provider)
+    tracer = trace.get_tracer("flightaware-api-tools")
+
+
+def inject_context() -> Dict[str, str]:
+    """Returns the current trace context as W3C headers (empty without tracing)."""
+    carrier: Dict[str, str] = {}
+    if tracer is not None:
+        from opentelemetry import propagate
+
+        propagate.inject(carrier)
+    return carrier
+
+
+def extract_context(carrier: Optional[Dict[str, Any]]):
+    """Returns the trace context carried by `carrier`, or None."""
+    if tracer is None or not carrier:
+        return None
+    from opentelemetry import propagate
+
+    return propagate.extract(carrier)
+
+
+@contextmanager
+def span(name: str, histogram=None, context=None, **labels):
+    """Times a block into `histogram` (with `labels`) and traces it as a span."""
+    started = time.perf_counter()
+    traced = (
+        tracer.start_as_current_span(name, context=context, attributes=labels)
+        if tracer is not None
+        else nullcontext()
+    )
+    try:
+        with traced:
+            yield
+    finally:
+        if histogram is not None:
+            metric = histogram.labels(**labels) if labels else histogram
+            metric.observe(time.perf_counter() - started)
+
+
+def endpoint_label(url: str) -> str:
+    """Maps an AeroAPI URL to a low-cardinality endpoint template."""
+    parts = urlsplit(url).path.split("/aeroapi/", 1)[-1].strip("/").split("/")
+    if parts[0] == "airports" and len(parts) >= 2:
+        return "/".join(["airports", "{id}"] + parts[2:])
+    if parts[0] == "flights" and len(parts) >= 2:
+        return "/".join(["flights", "{id}"] + parts[2:])
+    if parts[0] == "schedules":
+        return "schedules"
+    return parts[0] or "other"
+
+
+def observe_request(url: str, status: str, seconds: float):
+    """Records one AeroAPI request attempt."""
+    AEROAPI_REQUEST_SECONDS.labels(endpoint=endpoint_label(url), status=status).observe(
+        seconds
+    )
+
+
+def instrument_tool(fn):
+    """Times an async MCP tool and continues the caller's trace from the request meta."""
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        ctx = kwargs.get("ctx")
+        carrier = None
+        if ctx is not None:
+            meta = ctx.request_context.meta
+            carrier = meta.model_dump() if meta is not None else None
+        with span(
+            f"tool {fn.__name__}",
+            TOOL_SECONDS,
+            context=extract_context(carrier),
+            tool=fn.__name__,
+        ):
+            return await fn(*args, **kwargs)
+
+    return wrapper
+
+
+class StatsCollector:
+    """Exports cache and rate limiter counters at scrape time."""
+
+    def collect(self):
+        from MCPServer.cache import response_cache
+        from MCPServer.disk_cache import disk_cache
+        from MCPServer.rate_limit import rate_limiter
+
+        for prefix, stats in (
+            ("aeroapi_cache", response_cache.stats()),
+            ("aeroapi_disk_cache", disk_cache.stats()),
+            ("aeroapi_rate_limiter", rate_limiter.stats()),
+        ):
+            for key, value in stats.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    yield GaugeMetricFamily(f"{prefix}_{key}", f"{prefix} {key}", value)
+
+
+def register_stats_collector():
+    """Adds cache and rate limiter gauges to the default registry (once)."""
+    if REGISTRY is not None and not getattr(register_stats_collector, "done", False):
+        REGISTRY.register(StatsCollector())
+        register_stats_collector.done = True
+
+
+def start_metrics_server(port: int = METRICS_PORT):
+    """Serves /metrics on `port` in a background thread, if enabled."""
+    if REGISTRY is None or not port:
+        return
+    start_http_server(port)
+    logging.info(f"Metrics server listening on :{port}")
+
+
+def latest_metrics():
+    """Returns (body, content type) for a /metrics response."""
+    if REGISTRY is None:
+        return b"", "text/plain"
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,103 @@
+"""Field projection and compact output for flight records.
+
+Raw AeroAPI flight records carry dozens of fields. Tools can return only the
+requested fields (dotted paths such as "origin.code" reach into nested
+objects) and/or a columnar "compact" form where field names are sent once and
+low-cardinality columns are dictionary-encoded.
+"""
+
+from typing import Any, Dict, List, Optional, Union
+
+OUTPUT_FORMATS = ("records", "compact")
+
+# Columns are dictionary-encoded when distinct values are at most this share of rows
+DICTIONARY_MAX_RATIO = 0.5
+
+
+def get_path(record: Dict[str, Any], path: str) -> Any:
+    """Returns the value at a dotted path ("origin.code"), or None."""
+    value: Any = record
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def project(flights: List[Dict[str, Any]], fields: List[str]) -> List[Dict[str, Any]]:
+    """Returns new records holding only `fields`, keyed by the requested path."""
+    return [{field: get_path(flight, field) for field in fields} for flight in flights]
+
+
+def to_columnar(
+    flights: List[Dict[str, Any]], fields: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """Converts records to {"fields": [...], "rows": [[...]], "dictionaries": {...}}.
+
+    Columns with few distinct strings (airport codes, airlines, status) are
+    stored as indexes into `dictionaries[field]`.
+    """
+    if not fields:
+        fields = []
+        seen = set()
+        for flight in flights:
+            for key in flight:
+                if key not in seen:
+                    seen.add(key)
+                    fields.append(key)
+
+    columns = [[get_path(flight, field) for flight in flights] for field in fields]
+    dictionaries = {}
+    for i, (field, column) in enumerate(zip(fields, columns)):
+        if not column or not all(v is None or isinstance(v, str) for v in column):
+            continue
+        distinct = {v for v in column if v is not None}
+        if len(distinct) > len(column) * DICTIONARY_MAX_RATIO:
+            continue
+        table = sorted(distinct)
+        index = {v: n for n, v in enumerate(table)}
+        columns[i] = [None if v is None else index[v] for v in column]
+        dictionaries[field] = table
+
+    return {
+        "fields": fields,
+        "rows": [list(row) for row in zip(*columns)] if columns else [],
+        "dictionaries": dictionaries,
+    }
+
+
+def shape_flights(
+    flights: List[Dict[str, Any]],
+    fields: Optional[List[str]] = None,
+    output_format: str = "records",
+) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+    """Applies the requested projection and output format to a flight list."""
+    if output_format == "compact":
+        return to_columnar(flights, fields)
+    if fields:
+        return project(flights, fields)
+    return flights
+
+
+def shape_result(
+    result: Any,
+    data_key: str,
+    fields: Optional[List[str]] = None,
+    output_format: str = "records",
+) -> Any:
+    """Shapes a tool result, which may be a flight list, a page dict or an error string."""
+    if isinstance(result, str) or (not fields and output_format == "records"):
+        return result
+    if isinstance(result, dict):
+        shaped = dict(result)
+        shaped[data_key] = shape_flights(
+            result.get(data_key, []), fields, output_format
+        )
+        return shaped
+    return shape_flights(result, fields, output_format)
+
+
+def validate_output_format(output_format: str):
+    """Raises ValueError for unknown output formats."""
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"output_format must be one of {', '.join(OUTPUT_FORMATS)}.")
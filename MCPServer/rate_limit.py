@@ -0,0 +1,237 @@
+"""Client-side rate limiting and quota tracking for AeroAPI.
+
+A token bucket shared by every request in the process keeps us under the
+per-second limit. Waiting requests are served by priority class, so an
+interactive tool call is sent before queued background fetches. A 429
+response pauses the whole bucket for the server-provided Retry-After, and a
+monthly request count guards the quota budget. The count is kept in the
+on-disk store, so it survives restarts and is shared by every process; when
+the store is disabled it falls back to a per-process count.
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any
+
+from MCPServer.disk_cache import DiskCache, disk_cache
+
+INTERACTIVE = 0
+BACKGROUND = 1
+
+RATE_LIMIT_PER_SECOND = float(os.getenv("AEROAPI_RATE_LIMIT", "5"))
+RATE_LIMIT_BURST = int(os.getenv("AEROAPI_RATE_BURST", "5"))
+# Requests allowed per calendar month; 0 means unlimited
+MONTHLY_QUOTA = int(os.getenv("AEROAPI_MONTHLY_QUOTA", "0"))
+# Share of the monthly quota background fetches may use
+BACKGROUND_QUOTA_SHARE = float(os.getenv("AEROAPI_BACKGROUND_QUOTA_SHARE", "0.8"))
+
+MAX_RETRIES = int(os.getenv("AEROAPI_MAX_RETRIES", "4"))
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Priority of requests issued from the current task; background jobs set BACKGROUND
+request_priority: contextvars.ContextVar = contextvars.ContextVar(
+    "request_priority", default=INTERACTIVE
+)
+
+
+class QuotaExceededError(Exception):
+    """Raised when a request would exceed the monthly quota budget."""
+
+
+def coalescing_key(key: str) -> str:
+    """Single-flight key for `key` at the current request priority.
+
+    Background work only shares in-flight calls with other background work,
+    so interactive callers never wait behind its lower priority or fail on
+    its smaller share of the quota.
+    """
+    if request_priority.get() == INTERACTIVE:
+        return key
+    return f"background:{key}"
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parses a Retry-After header given in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        from email.utils import parsedate_to_datetime
+
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """Returns how long to wait before retry number `attempt` (0-based).
+
+    Uses Retry-After when the server provided it, otherwise exponential
+    backoff with equal jitter.
+    """
+    if retry_after is not None:
+        return min(retry_after, BACKOFF_MAX)
+    delay = min(BACKOFF_MAX, BACKOFF_BASE * (2**attempt))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class RateLimiter:
+    """Token bucket with priority-ordered waiters and a monthly quota."""
+
+    def __init__(
+        self,
+        rate: float = RATE_LIMIT_PER_SECOND,
+        burst: int = RATE_LIMIT_BURST,
+        monthly_quota: int = MONTHLY_QUOTA,
+        store: Optional[DiskCache] = None,
+    ):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.monthly_quota = monthly_quota
+        self.store = store if store is not None else disk_cache
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self._waiters: list = []
+        self._seq = itertools.count()
+        self._quota_month = self._current_month()
+        self.quota_used = 0
+        self.throttled = 0
+
+    @staticmethod
+    def _current_month() -> str:
+        return datetime.now(timezone.utc).strftime("%Y-%m")
+
+    def _refill(self, now: float):
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def _try_take(self) -> float:
+        """Takes a token if one is available; otherwise returns seconds to wait."""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return self._paused_until - now
+            self._refill(now)
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def _charge_quota(self, priority: int):
+        """Counts one request against this month's budget.
+
+        Raises:
+            QuotaExceededError: If the budget for `priority` is spent.
+        """
+        month = self._current_month()
+        limit = self.monthly_quota
+        if limit and priority != INTERACTIVE:
+            limit = int(self.monthly_quota * BACKGROUND_QUOTA_SHARE)
+        # Only a quota needs the shared count; without one, count in memory
+        charged = self.store.charge_quota(month, limit) if limit else None
+        with self._lock:
+            if month != self._quota_month:
+                self._quota_month = month
+                self.quota_used = 0
+            if charged is not None:
+                allowed, self.quota_used = charged
+            else:
+                allowed = not limit or self.quota_used < limit
+                if allowed:
+                    self.quota_used += 1
+        if not allowed:
+            raise QuotaExceededError(
+                f"AeroAPI quota budget reached ({self.quota_used}/{self.monthly_quota} this month)"
+            )
+
+    def _refund_token(self):
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + 1)
+
+    def _take_and_charge(self, priority: int) -> float:
+        """Takes a token and charges the quota; returns seconds to wait if no token is free.
+
+        The quota is charged only once a token is held, so waiters that are
+        cancelled do not consume budget.
+        """
+        wait = self._try_take()
+        if wait == 0:
+            try:
+                self._charge_quota(priority)
+            except QuotaExceededError:
+                self._refund_token()
+                raise
+        return wait
+
+    async def acquire(self, priority: Optional[int] = None):
+        """Waits for a token. Lower priority values are served first.
+
+        Raises:
+            QuotaExceededError: If the monthly budget for this priority is spent.
+        """
+        if priority is None:
+            priority = request_priority.get()
+        ticket = (priority, next(self._seq))
+        heapq.heappush(self._waiters, ticket)
+        try:
+            while True:
+                if self._waiters[0] == ticket:
+                    wait = self._take_and_charge(priority)
+                    if wait == 0:
+                        return
+                else:
+                    # Not at the head of the queue; re-check after roughly one token interval
+                    wait = 1 / self.rate
+                await asyncio.sleep(wait)
+        finally:
+            self._waiters.remove(ticket)
+            heapq.heapify(self._waiters)
+
+    def acquire_blocking(self, priority: Optional[int] = None):
+        """Blocking variant of acquire for synchronous callers (scripts, threads)."""
+        if priority is None:
+            priority = request_priority.get()
+        while True:
+            wait = self._take_and_charge(priority)
+            if wait == 0:
+                return
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Stops handing out tokens for `seconds` (e.g. after a 429)."""
+        with self._lock:
+            self.throttled += 1
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns quota usage and throttling counters."""
+        used = None
+        if self.monthly_quota:
+            used = self.store.quota_used(self._current_month())
+        return {
+            "quota_used": self.quota_used if used is None else used,
+            "monthly_quota": self.monthly_quota,
+            "throttled": self.throttled,
+            "waiting": len(self._waiters),
+        }
+
+
+# Process-wide limiter shared by every tool
+rate_limiter = RateLimiter()
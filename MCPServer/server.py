@@ -1,11 +1,75 @@
 import sys
+import asyncio
 import logging
-from mcp.server.fastmcp import FastMCP
-import requests
+from contextlib import asynccontextmanager
+from mcp.server.fastmcp import FastMCP, Context
 import os
 from dotenv import load_dotenv
-from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, Any, List, Union
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import (
+    Optional,
+    Dict,
+    Any,
+    List,
+    Union,
+    AsyncIterator,
+    Tuple,
+    Set,
+    Callable,
+    Awaitable,
+)
+from urllib.parse import urlsplit
+
+# Add project root to sys.path so the MCPServer package resolves when run as a script
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from MCPServer.aeroapi_client import (
+    AEROAPI_ROOT,
+    AeroAPIError,
+    build_url,
+    fetch_json_async,
+    warm_from_disk,
+)
+from MCPServer.aggregate import (
+    DELAY_FIELDS,
+    STATS,
+    board_stats,
+    delay_minutes,
+    summarize_board,
+)
+from MCPServer.board_sync import get_board
+from MCPServer.cache import ACTIVE_TRACK_TTL, is_immutable, normalize_key
+from MCPServer.flight_store import (
+    DIRECTIONS,
+    FLIGHT_STORE_FINAL_AFTER,
+    flight_store,
+    to_epoch,
+    to_iso,
+)
+from MCPServer.localize import (
+    convert_timestamp,
+    convert_to_jst,
+    localize_flight_data,
+    resolve_timezone,
+)
+from MCPServer.metrics import (
+    PAGES_PER_CALL,
+    init_tracing,
+    instrument_tool,
+    register_stats_collector,
+    start_metrics_server,
+)
+from MCPServer.singleflight import SingleFlight
+from MCPServer.rate_limit import coalescing_key
+from MCPServer.track_index import TRACK_FILES, track_index
+from MCPServer.warmer import WARM_AIRPORTS, WarmJob, WarmScheduler
+from MCPServer.projection import (
+    shape_flights,
+    shape_result,
+    validate_output_format,
+)
 
 # Log configuration (output to file)
 log_file_path = os.path.join(os.path.dirname(__file__), "server.log")
@@ -19,11 +83,29 @@ logging.info("MCP Server is starting...")
 
 # Get API key from .env
 load_dotenv()
-API_KEY = os.getenv("FLIGHTAWARE_API_KEY")
-headers = {"x-apikey": API_KEY}
 
 MAX_PAST_DAYS = 10
 MAX_FUTURE_HOURS = 24
+# Number of pages prefetched ahead of the consumer during pagination
+PREFETCH_PAGES = int(os.getenv("AEROAPI_PREFETCH_PAGES", "2"))
+# Global cap on concurrently fetched time-window shards across all tool calls
+MAX_CONCURRENT_SHARDS = int(os.getenv("AEROAPI_MAX_CONCURRENT_SHARDS", "4"))
+MAX_SHARDS = 24
+# Most airports one get_multi_airport_board call may fan out to
+MAX_BULK_AIRPORTS = int(os.getenv("AEROAPI_MAX_BULK_AIRPORTS", "8"))
+BOARD_SORT_KEYS = ("time", "delay", "airport")
+# Most tracks one find_flights_in_area call fetches to fill the track index
+TRACK_INDEX_FETCH_LIMIT = int(os.getenv("AEROAPI_TRACK_INDEX_FETCH_LIMIT", "50"))
+MAX_CONCURRENT_TRACKS = int(os.getenv("AEROAPI_MAX_CONCURRENT_TRACKS", "8"))
+track_semaphore = asyncio.Semaphore(MAX_CONCURRENT_TRACKS)
+shard_semaphore = asyncio.Semaphore(MAX_CONCURRENT_SHARDS)
+# Coalesces identical concurrent tool fetches
+tool_calls = SingleFlight()
+# Keeps references to fire-and-forget prefetch tasks
+background_tasks = set()
+
+# Called with (pages received, items so far) after each page
+ProgressCallback = Callable[[int, int], Awaitable[None]]
 
 
 def construct_time_range(
@@ -32,16 +114,19 @@ def construct_time_range(
     day: Optional[int],
     start_time: Optional[str],
     end_time: Optional[str],
+    enforce_past_limit: bool = True,
 ):
     now = datetime.now(timezone.utc)
 
-    # If no parameters are provided, use default 1 hour window around now
+    # If no parameters are provided, use default 1 hour window around now.
+    # Truncated to the minute so repeated calls share cache entries.
     if all(p is None for p in [year, month, day, start_time, end_time]):
-        start = now - timedelta(hours=1)
-        end = now + timedelta(hours=1)
+        base = now.replace(second=0, microsecond=0)
+        start = base - timedelta(hours=1)
+        end = base + timedelta(hours=1)
         return (
-            start.isoformat().replace("+00:00", "Z"),
-            end.isoformat().replace("+00:00", "Z"),
+            start.isoformat(timespec="seconds").replace("+00:00", "Z"),
+            end.isoformat(timespec="seconds").replace("+00:00", "Z"),
         )
 
     # Use current date parts if not provided
@@ -74,7 +159,7 @@ def construct_time_range(
     min_start = now - timedelta(days=MAX_PAST_DAYS)
     max_end = now + timedelta(hours=MAX_FUTURE_HOURS)
 
-    if start < min_start:
+    if enforce_past_limit and start < min_start:
         raise ValueError(f"start must be within the last {MAX_PAST_DAYS} days.")
     if end > max_end:
         raise ValueError(f"end must be within the next {MAX_FUTURE_HOURS} hours.")
@@ -87,95 +172,640 @@ def construct_time_range(
     )
 
 
-def convert_to_jst(iso_str):
-    """Converts ISO format datetime string to Japan Standard Time (JST)."""
-    if not iso_str:
-        return None
+async def iter_pages(
+    url: str,
+    params: Optional[Dict[str, Any]],
+    fetch_all: bool = False,
+    max_in_flight: int = PREFETCH_PAGES,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Yields AeroAPI response pages as they arrive.
+
+    The next page is requested as soon as its `links.next` cursor is known, so
+    it downloads while the caller is still processing the current page. At most
+    `max_in_flight` pages are buffered ahead of the caller.
+
+    Args:
+        url: The API endpoint URL.
+        params: Query parameters for the first request.
+        fetch_all: If True, follows `links.next` until the last page.
+        max_in_flight: Maximum number of prefetched pages waiting to be consumed.
+
+    Raises:
+        AeroAPIError: If a page request fails.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, max_in_flight))
+    done = object()
+
+    async def producer():
+        next_url, next_params = url, params
+        try:
+            while next_url:
+                logging.info(f"API Request: {urlsplit(next_url).path}")
+                page = await fetch_json_async(next_url, params=next_params)
+                await queue.put(page)
+
+                if not fetch_all:
+                    break
+                next_url = (page.get("links") or {}).get("next")
+                next_params = None  # Cursor already encodes the query
+            await queue.put(done)
+        except Exception as e:
+            await queue.put(e)
+
+    task = asyncio.create_task(producer())
     try:
-        # Replace Z with +00:00 and parse
-        dt = datetime.fromisoformat(iso_str.replace("Z", "+00:00"))
-        jst = timezone(timedelta(hours=9), "JST")
-        return dt.astimezone(jst).isoformat()
-    except ValueError:
-        return iso_str
-
-
-def localize_flight_data(flights):
-    """Converts time fields in flight data to JST."""
-    time_fields = [
-        "scheduled_out",
-        "estimated_out",
-        "actual_out",
-        "scheduled_in",
-        "estimated_in",
-        "actual_in",
-        "scheduled_off",
-        "estimated_off",
-        "actual_off",
-        "scheduled_on",
-        "estimated_on",
-        "actual_on",
-    ]
-    for flight in flights:
-        for field in time_fields:
-            if field in flight and flight[field]:
-                flight[field] = convert_to_jst(flight[field])
-    return flights
+        while True:
+            item = await queue.get()
+            if item is done:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        task.cancel()
+
+
+async def store_flights(data_key: str, flights: List[Dict[str, Any]]):
+    """Saves raw board records to the flight store before they are localized."""
+    if data_key in DIRECTIONS and flight_store.enabled and flights:
+        await asyncio.to_thread(flight_store.ingest, flights)
+
+
+async def collect_pages(
+    url: str,
+    params: Optional[Dict[str, Any]],
+    data_key: str,
+    fetch_all: bool,
+    tz: Optional[tzinfo] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> Union[List[Dict[str, Any]], str]:
+    """Collects and localizes `data_key` items from every page of a request."""
+    all_data = []
+    pages = 0
+
+    try:
+        async for page in iter_pages(url, params, fetch_all):
+            await store_flights(data_key, page.get(data_key, []))
+            all_data.extend(localize_flight_data(page.get(data_key, []), tz))
+            pages += 1
+            if progress is not None:
+                await progress(pages, len(all_data))
+    except AeroAPIError as e:
+        logging.warning(str(e))
+        if not all_data:
+            return "Failed to retrieve data."
+    finally:
+        PAGES_PER_CALL.labels(data_key=data_key).observe(pages)
 
+    return all_data
 
-def fetch_paginated_data(
+
+async def fetch_paginated_data(
     url: str,
     params: Optional[Dict[str, Any]],
     data_key: str,
     fetch_all: bool = False,
+    tz: Optional[tzinfo] = None,
+    progress: Optional[ProgressCallback] = None,
 ) -> Union[List[Dict[str, Any]], str]:
     """Fetches paginated data from the FlightAware API.
 
+    Concurrent calls for the same endpoint and params share one fetch
+    (background warm-ups only with each other). The returned list is shared
+    between those callers and must not be mutated.
+    Calls that report progress run their own page loop (pages are still
+    shared at the request level).
+
     Args:
         url: The API endpoint URL.
         params: Query parameters for the request.
         data_key: The key to extract data from the response (e.g., "departures", "arrivals", "scheduled").
         fetch_all: If True, retrieves all data using pagination.
+        tz: Timezone for returned times. Defaults to JST.
+        progress: Optional callback invoked after each page.
 
     Returns:
-        List of flight data with times converted to JST, or error message string.
+        List of flight data with times converted to `tz`, or error message string.
     """
-    all_data = []
+    if progress is not None:
+        return await collect_pages(url, params, data_key, fetch_all, tz, progress)
+    key = f"{data_key}:{fetch_all}:{tz}:{normalize_key(build_url(url), params)}"
+    return await tool_calls.do(
+        coalescing_key(key), lambda: collect_pages(url, params, data_key, fetch_all, tz)
+    )
+
 
-    while True:
-        logging.info(f"API Request: {url} params={params}")
-        response = requests.get(url, headers=headers, params=params)
+def resolve_cursor(endpoint: str, cursor: str) -> str:
+    """Validates a continuation token against the tool's endpoint.
 
-        if response.status_code != 200:
-            logging.warning(f"API Request Failed: status_code={response.status_code}")
-            if not all_data:
-                return "Failed to retrieve data."
-            break
+    Tokens are the `links.next` paths returned by AeroAPI. Only the endpoint
+    prefix is checked (e.g. "schedules/" or "airports/RJTT/flights/departures"),
+    not the exact path of the current call, whose time window may have moved
+    since the token was issued.
 
-        logging.info(f"API Response: status_code={response.status_code}")
-        data = response.json()
-        items = data.get(data_key, [])
-        all_data.extend(items)
+    Args:
+        endpoint: AeroAPI path, relative to the root, the cursor must start with.
+            A trailing "/" accepts any path below it.
+
+    Raises:
+        ValueError: If the cursor belongs to a different endpoint.
+    """
+    page_url = build_url(cursor)
+    prefix = AEROAPI_ROOT + endpoint
+    rest = page_url[len(prefix) :]
+    if (
+        not page_url.startswith(prefix)
+        or ".." in urlsplit(page_url).path
+        or not (endpoint.endswith("/") or rest[:1] in ("", "?", "/"))
+    ):
+        raise ValueError("cursor does not belong to this query.")
+    return page_url
+
+
+async def prefetch_page(url: str):
+    """Warms the cache with the page a client is likely to request next."""
+    try:
+        await fetch_json_async(url)
+    except AeroAPIError as e:
+        logging.info(f"Prefetch skipped: {e}")
+
+
+async def fetch_page(
+    url: str,
+    params: Optional[Dict[str, Any]],
+    data_key: str,
+    tz: Optional[tzinfo] = None,
+) -> Union[Dict[str, Any], str]:
+    """Fetches a single page and returns it with a continuation token.
 
-        if not fetch_all:
-            break
+    The following page is prefetched into the cache in the background, so the
+    continuation call is usually served locally.
 
-        next_link = data.get("links", {}).get("next")
-        if not next_link:
-            break
+    Returns:
+        {data_key: [...], "next_cursor": token or None}, or error message string.
+    """
+    try:
+        page = await fetch_json_async(url, params=params)
+    except AeroAPIError as e:
+        logging.warning(str(e))
+        return "Failed to retrieve data."
+
+    next_cursor = (page.get("links") or {}).get("next")
+    if next_cursor:
+        task = asyncio.create_task(prefetch_page(build_url(next_cursor)))
+        background_tasks.add(task)
+        task.add_done_callback(background_tasks.discard)
+    await store_flights(data_key, page.get(data_key, []))
+    return {
+        data_key: localize_flight_data(page.get(data_key, []), tz),
+        "next_cursor": next_cursor,
+    }
+
+
+def progress_reporter(ctx: Optional[Context], label: str) -> Optional[ProgressCallback]:
+    """Builds a callback that sends MCP progress notifications, if the client asked for them."""
+    if ctx is None:
+        return None
+    meta = ctx.request_context.meta
+    if meta is None or meta.progressToken is None:
+        return None
+
+    async def report(pages: int, items: int):
+        await ctx.report_progress(
+            pages, None, f"{label}: page {pages} received ({items} flights so far)"
+        )
+
+    return report
+
+
+def parse_iso(iso_str: str) -> datetime:
+    """Parses an ISO 8601 string that may use the "Z" suffix."""
+    return datetime.fromisoformat(iso_str.replace("Z", "+00:00"))
+
+
+def split_time_range(start: str, end: str, shards: int) -> List[Tuple[str, str]]:
+    """Splits a start/end window into `shards` contiguous sub-windows.
+
+    Args:
+        start: Window start as returned by construct_time_range.
+        end: Window end as returned by construct_time_range.
+        shards: Number of sub-windows to produce.
+
+    Returns:
+        List of (start, end) ISO strings in time order.
+    """
+    start_dt = parse_iso(start)
+    end_dt = parse_iso(end)
+    step = (end_dt - start_dt) / shards
+    windows = []
+    for i in range(shards):
+        window_start = start_dt + step * i
+        window_end = end_dt if i == shards - 1 else start_dt + step * (i + 1)
+        windows.append(
+            (
+                window_start.isoformat(timespec="seconds").replace("+00:00", "Z"),
+                window_end.isoformat(timespec="seconds").replace("+00:00", "Z"),
+            )
+        )
+    return windows
+
+
+def merge_flights(
+    results: List[List[Dict[str, Any]]], time_field: str
+) -> List[Dict[str, Any]]:
+    """Merges flight lists, de-duplicating by fa_flight_id and sorting by time."""
+    merged = {}
+    for flights in results:
+        for flight in flights:
+            key = flight.get("fa_flight_id") or id(flight)
+            merged.setdefault(key, flight)
+
+    def sort_key(flight):
+        value = flight.get(time_field)
+        if not value:
+            return (1, datetime.max.replace(tzinfo=timezone.utc))
+        try:
+            return (0, parse_iso(value))
+        except ValueError:
+            return (1, datetime.max.replace(tzinfo=timezone.utc))
+
+    return sorted(merged.values(), key=sort_key)
+
+
+async def fetch_sharded_data(
+    url: str,
+    start: str,
+    end: str,
+    data_key: str,
+    shards: int,
+    time_field: str,
+    tz: Optional[tzinfo] = None,
+) -> Union[List[Dict[str, Any]], str]:
+    """Fetches a board window as concurrent sub-windows and merges the result.
 
-        url = f"https://aeroapi.flightaware.com{next_link}"
-        params = None  # Clear params for subsequent requests
+    Each sub-window is fully paginated. Concurrency is bounded globally by
+    MAX_CONCURRENT_SHARDS.
+
+    Args:
+        url: The API endpoint URL.
+        start: Window start (ISO 8601, UTC).
+        end: Window end (ISO 8601, UTC).
+        data_key: The key to extract data from the response.
+        shards: Number of sub-windows.
+        time_field: Field used to order the merged result (e.g., "scheduled_out").
+        tz: Timezone for returned times. Defaults to JST.
+
+    Returns:
+        Merged list of flight data, or error message string if every shard failed.
+    """
+
+    async def fetch_window(window_start: str, window_end: str):
+        async with shard_semaphore:
+            return await fetch_paginated_data(
+                url, {"start": window_start, "end": window_end}, data_key, True, tz
+            )
+
+    windows = split_time_range(start, end, shards)
+    logging.info(f"Sharded fetch: {url} shards={len(windows)}")
+    results = await asyncio.gather(*(fetch_window(ws, we) for ws, we in windows))
+
+    succeeded = [r for r in results if not isinstance(r, str)]
+    if not succeeded:
+        return "Failed to retrieve data."
+    if len(succeeded) < len(results):
+        logging.warning(
+            f"Sharded fetch: {len(results) - len(succeeded)} of {len(results)} shards failed"
+        )
+    return merge_flights(succeeded, time_field)
+
+
+def is_final_window(end: str) -> bool:
+    """True if a window ended long enough ago that its flights no longer change."""
+    return flight_store.enabled and to_epoch(end) <= (
+        datetime.now(timezone.utc).timestamp() - FLIGHT_STORE_FINAL_AFTER
+    )
+
+
+async def is_stored(airport_code: str, direction: str, start: str, end: str) -> bool:
+    """True if the flight store already covers the whole window."""
+    gaps = await asyncio.to_thread(
+        flight_store.missing, airport_code, direction, to_epoch(start), to_epoch(end)
+    )
+    return not gaps
+
+
+async def check_past_limit(airport_code: str, direction: str, start: str, end: str):
+    """Enforces MAX_PAST_DAYS unless the flight store already covers the window.
+
+    Raises:
+        ValueError: If the window starts too far back and is not stored locally.
+    """
+    min_start = datetime.now(timezone.utc) - timedelta(days=MAX_PAST_DAYS)
+    if parse_iso(start) >= min_start:
+        return
+    if flight_store.enabled and await is_stored(airport_code, direction, start, end):
+        return
+    raise ValueError(f"start must be within the last {MAX_PAST_DAYS} days.")
+
+
+async def fetch_stored_board(
+    url: str,
+    airport_code: str,
+    direction: str,
+    start: str,
+    end: str,
+    tz: Optional[tzinfo] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> Union[List[Dict[str, Any]], str]:
+    """Answers a historical board window from the flight store.
+
+    Only the parts of the window that were never fetched completely go to
+    AeroAPI; each is fully paginated, saved and marked as covered. The
+    complete window is then read back from the store, or fetched live if the
+    store cannot be read.
+
+    Args:
+        url: The board endpoint URL.
+        airport_code: The airport code as passed to the tool.
+        direction: "departures" or "arrivals".
+        start: Window start (ISO 8601, UTC).
+        end: Window end (ISO 8601, UTC).
+        tz: Timezone for returned times. Defaults to JST.
+        progress: Optional callback invoked after each fetched page.
+
+    Returns:
+        List of flight data with times converted to `tz`, or error message string.
+    """
+    start_epoch, end_epoch = to_epoch(start), to_epoch(end)
+    gaps = await asyncio.to_thread(
+        flight_store.missing, airport_code, direction, start_epoch, end_epoch
+    )
+    logging.info(
+        f"Flight store: {airport_code} {direction} {start}..{end} gaps={len(gaps)}"
+    )
+
+    failed = False
+    pages = items = 0
+    for gap_start, gap_end in gaps:
+        params = {"start": to_iso(gap_start), "end": to_iso(gap_end)}
+        try:
+            async for page in iter_pages(url, params, fetch_all=True):
+                flights = page.get(direction, [])
+                await store_flights(direction, flights)
+                pages += 1
+                items += len(flights)
+                if progress is not None:
+                    await progress(pages, items)
+        except AeroAPIError as e:
+            logging.warning(str(e))
+            failed = True
+            continue
+        await asyncio.to_thread(
+            flight_store.mark_covered, airport_code, direction, gap_start, gap_end
+        )
+
+    if gaps:
+        PAGES_PER_CALL.labels(data_key=direction).observe(pages)
+    flights = await asyncio.to_thread(
+        flight_store.query_board, airport_code, direction, start_epoch, end_epoch
+    )
+    if flights is None:
+        logging.warning("Flight store unavailable; fetching the board live")
+        return await fetch_paginated_data(
+            url, {"start": start, "end": end}, direction, True, tz, progress
+        )
+    if failed and not flights:
+        return "Failed to retrieve data."
+    return localize_flight_data(flights, tz)
+
+
+async def fetch_board(
+    airport_code: str,
+    direction: str,
+    start: str,
+    end: str,
+    tz: Optional[tzinfo] = None,
+) -> Union[List[Dict[str, Any]], str]:
+    """Fetches a complete board window, from the flight store when it is final.
+
+    Returns:
+        List of flight data with times converted to `tz`, or error message string.
+    """
+    try:
+        await check_past_limit(airport_code, direction, start, end)
+    except ValueError as e:
+        return f"Input Error: {e}"
+    url = AEROAPI_ROOT + f"airports/{airport_code}/flights/{direction}"
+    if is_final_window(end):
+        return await fetch_stored_board(url, airport_code, direction, start, end, tz)
+    return await fetch_paginated_data(
+        url, {"start": start, "end": end}, direction, True, tz
+    )
+
+
+def merge_boards(
+    boards: Dict[str, List[Dict[str, Any]]],
+    direction: str,
+    sort_by: str,
+    min_delay_minutes: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """Merges per-airport boards into one list tagged with "airport" and "delay_minutes".
+
+    Records are copied, since board lists may be shared with other callers.
+    Flights without a known delay are dropped when `min_delay_minutes` is set.
+    """
+    merged = []
+    for airport, flights in boards.items():
+        delays = delay_minutes(flights, direction)
+        for flight, delay in zip(flights, delays.tolist()):
+            delay = None if delay != delay else round(delay, 1)
+            if min_delay_minutes is not None and (
+                delay is None or delay < min_delay_minutes
+            ):
+                continue
+            merged.append({**flight, "airport": airport, "delay_minutes": delay})
+
+    time_field = DELAY_FIELDS[direction][0]
+    if sort_by == "delay":
+        merged.sort(
+            key=lambda f: (f["delay_minutes"] is None, -(f["delay_minutes"] or 0))
+        )
+    elif sort_by == "airport":
+        merged.sort(key=lambda f: (f["airport"], f.get(time_field) or ""))
+    else:
+        merged = merge_flights([merged], time_field)
+    return merged
+
+
+def valid_lon_lat(lon: Any, lat: Any) -> bool:
+    """True if lon/lat are numbers within -180..180 and -90..90."""
+    try:
+        return -180 <= float(lon) <= 180 and -90 <= float(lat) <= 90
+    except (TypeError, ValueError):
+        return False
+
+
+async def index_track(fa_flight_id: str, properties: Dict[str, Any]) -> bool:
+    """Fetches a track (usually from cache) into the track index.
+
+    Returns:
+        False if the fetch failed.
+    """
+    url = AEROAPI_ROOT + f"flights/{fa_flight_id}/track"
+    async with track_semaphore:
+        try:
+            data = await fetch_json_async(url)
+        except AeroAPIError as e:
+            logging.warning(str(e))
+            return False
+    await asyncio.to_thread(
+        track_index.add_response, data, fa_flight_id, properties, is_immutable(url)
+    )
+    return True
+
+
+async def index_board_tracks(
+    airport_code: str, direction: str, start: str, end: str
+) -> Union[Tuple[Dict[str, int], Set[str]], str]:
+    """Adds the tracks of a board window's flights to the track index.
+
+    Tracks already indexed are reused unless they may still change. At most
+    TRACK_INDEX_FETCH_LIMIT tracks are fetched per call.
+
+    Returns:
+        ({"flights", "fetched", "failed", "skipped"}, fa_flight_ids of the
+        board), or error message string.
+    """
+    board = await fetch_board(airport_code, direction, start, end)
+    if isinstance(board, str):
+        return board
+    flight_ids = {f["fa_flight_id"] for f in board if f.get("fa_flight_id")}
+    pending = [
+        flight
+        for flight in board
+        if flight.get("fa_flight_id")
+        and track_index.needs_refresh(flight["fa_flight_id"], ACTIVE_TRACK_TTL)
+    ]
+    skipped = max(0, len(pending) - TRACK_INDEX_FETCH_LIMIT)
+    pending = pending[:TRACK_INDEX_FETCH_LIMIT]
+    results = await asyncio.gather(
+        *(
+            index_track(
+                flight["fa_flight_id"],
+                {
+                    "ident": flight.get("ident"),
+                    "origin": (flight.get("origin") or {}).get("code"),
+                    "destination": (flight.get("destination") or {}).get("code"),
+                    "aircraft_type": flight.get("aircraft_type"),
+                },
+            )
+            for flight in pending
+        )
+    )
+    logging.info(
+        f"Track index: {airport_code} {direction} fetched={len(pending)} skipped={skipped} size={len(track_index)}"
+    )
+    stats = {
+        "flights": len(board),
+        "fetched": sum(results),
+        "failed": len(results) - sum(results),
+        "skipped": skipped,
+    }
+    return stats, flight_ids
+
+
+async def fetch_board_slice(
+    url: str, direction: str, start: int, end: int
+) -> List[Dict[str, Any]]:
+    """Fetches every raw (UTC) board record in [start, end].
+
+    Raises:
+        AeroAPIError: If a page request fails.
+    """
+    flights = []
+    params = {"start": to_iso(start), "end": to_iso(end)}
+    async for page in iter_pages(url, params, fetch_all=True):
+        records = page.get(direction, [])
+        await store_flights(direction, records)
+        flights.extend(records)
+    return flights
 
-    return localize_flight_data(all_data)
+
+async def refresh_board(airport_code: str, direction: str) -> int:
+    """Brings a tracked board up to the current rolling window.
+
+    Returns:
+        The board's new version.
+
+    Raises:
+        AeroAPIError: If the refresh fetch fails; the snapshot is left unchanged.
+    """
+    board = get_board(airport_code, direction)
+    start_param, end_param = construct_time_range(None, None, None, None, None)
+    start, end = to_epoch(start_param), to_epoch(end_param)
+    fetch_start, fetch_end = board.refresh_range(start, end)
+    url = AEROAPI_ROOT + f"airports/{airport_code}/flights/{direction}"
+    logging.info(
+        f"Board refresh: {airport_code} {direction} {to_iso(fetch_start)}..{to_iso(fetch_end)} "
+        f"(window {start_param}..{end_param})"
+    )
+    fetched = await fetch_board_slice(url, direction, fetch_start, fetch_end)
+    return board.apply(start, end, fetched, fetch_start)
+
+
+def warm_jobs() -> List[WarmJob]:
+    """Builds warm-up jobs for the default board and schedule queries of hot airports.
+
+    Jobs use the same URLs and params as a tool call without date arguments,
+    so those calls hit the response cache.
+    """
+    start_param, end_param = construct_time_range(None, None, None, None, None)
+    params = {"start": start_param, "end": end_param}
+    schedules_url = AEROAPI_ROOT + f"schedules/{start_param}/{end_param}"
+    jobs = []
+    for airport in WARM_AIRPORTS:
+        for direction in DIRECTIONS:
+            url = AEROAPI_ROOT + f"airports/{airport}/flights/{direction}"
+            jobs.append(
+                (
+                    f"{airport} {direction}",
+                    lambda url=url, direction=direction: fetch_paginated_data(
+                        url, params, direction
+                    ),
+                )
+            )
+        jobs.append(
+            (
+                f"{airport} schedules",
+                lambda airport=airport: fetch_paginated_data(
+                    schedules_url, {"origin": airport}, "scheduled"
+                ),
+            )
+        )
+    return jobs
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    """Runs the warm-up scheduler while the server is up."""
+    scheduler = WarmScheduler(warm_jobs) if WARM_AIRPORTS else None
+    if scheduler is not None:
+        logging.info(f"Warming airports: {', '.join(WARM_AIRPORTS)}")
+        scheduler.start()
+    try:
+        yield {}
+    finally:
+        if scheduler is not None:
+            await scheduler.stop()
 
 
 # Initialize MCP Server
-mcp = FastMCP("FlightAware-Tracker")
+mcp = FastMCP("FlightAware-Tracker", lifespan=lifespan)
 
 
 @mcp.tool()
-def get_past_departures(
+@instrument_tool
+async def get_past_departures(
     airport_code: str,
     year: Optional[int] = None,
     month: Optional[int] = None,
@@ -183,9 +813,21 @@ def get_past_departures(
     start_time: Optional[str] = None,
     end_time: Optional[str] = None,
     fetch_all: bool = False,
+    shards: Optional[int] = None,
+    timezone_name: Optional[str] = None,
+    stream: bool = False,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    output_format: str = "records",
+    ctx: Context = None,
 ):
     """Retrieves the list of departures for a specified airport.
 
+    With fetch_all, windows that ended more than a few hours ago are returned
+    in full from the local flight store; only periods never fetched before are
+    requested from the API. Windows already stored are served from the store
+    either way, and may be older than the usual 10-day limit.
+
     Args:
         airport_code: The ICAO code of the airport.
         year: Year (e.g., 2026). Defaults to current year.
@@ -194,27 +836,83 @@ def get_past_departures(
         start_time: Start time in HH:MM format (e.g., "09:00"). Defaults to 00:00 if date is specified, or 1 hour ago if no date/time provided.
         end_time: End time in HH:MM format (e.g., "18:00"). Defaults to 23:59 if date is specified, or 1 hour from now if no date/time provided.
         fetch_all: If True, retrieves all data using pagination.
+        shards: If greater than 1, splits the time window into this many sub-windows that are fetched concurrently and merged (implies fetch_all). Useful for full-day boards at busy airports.
+        timezone_name: Timezone for returned times (e.g., "Asia/Tokyo", "UTC", "+09:00"). Defaults to JST.
+        stream: If True, returns only the first page as {"<key>": [...], "next_cursor": ...} so results can be used before later pages load.
+        cursor: The next_cursor from a previous stream call; returns the following page in the same format.
+        fields: Only return these fields per flight. Dotted paths reach nested objects (e.g., ["ident", "origin.code", "scheduled_out", "status"]).
+        output_format: "records" (list of objects, default) or "compact" ({"fields": [...], "rows": [[...]], "dictionaries": {...}}; columns listed in dictionaries hold indexes into that list).
     """
     logging.info(
-        f"get_departures called with airport_code={airport_code}, year={year}, month={month}, day={day}, start_time={start_time}, end_time={end_time}, fetch_all={fetch_all}"
+        f"get_departures called with airport_code={airport_code}, year={year}, month={month}, day={day}, start_time={start_time}, end_time={end_time}, fetch_all={fetch_all}, shards={shards}"
     )
 
     try:
         start_param, end_param = construct_time_range(
-            year, month, day, start_time, end_time
+            year, month, day, start_time, end_time, enforce_past_limit=False
         )
+        tz = resolve_timezone(timezone_name)
+        validate_output_format(output_format)
+        await check_past_limit(airport_code, "departures", start_param, end_param)
     except ValueError as e:
         logging.error(f"Validation Error: {e}")
         return f"Input Error: {e}"
 
-    url = f"https://aeroapi.flightaware.com/aeroapi/airports/{airport_code}/flights/departures"
+    endpoint = f"airports/{airport_code}/flights/departures"
+    url = AEROAPI_ROOT + endpoint
+    try:
+        page_url = resolve_cursor(endpoint, cursor) if cursor else None
+    except ValueError as e:
+        return f"Input Error: {e}"
+
     params = {"start": start_param, "end": end_param}
 
-    return fetch_paginated_data(url, params, "departures", fetch_all)
+    if cursor:
+        result = await fetch_page(page_url, None, "departures", tz)
+    elif stream:
+        result = await fetch_page(url, params, "departures", tz)
+    elif is_final_window(end_param) and (
+        fetch_all
+        or (shards and shards > 1)
+        or await is_stored(airport_code, "departures", start_param, end_param)
+    ):
+        # Gaps are fully paginated, so without fetch_all only a window that
+        # is already stored is answered from the store
+        result = await fetch_stored_board(
+            url,
+            airport_code,
+            "departures",
+            start_param,
+            end_param,
+            tz,
+            progress_reporter(ctx, f"{airport_code} departures"),
+        )
+    elif shards and shards > 1:
+        result = await fetch_sharded_data(
+            url,
+            start_param,
+            end_param,
+            "departures",
+            min(shards, MAX_SHARDS),
+            "scheduled_out",
+            tz,
+        )
+    else:
+        result = await fetch_paginated_data(
+            url,
+            params,
+            "departures",
+            fetch_all,
+            tz,
+            progress_reporter(ctx, f"{airport_code} departures") if fetch_all else None,
+        )
+
+    return shape_result(result, "departures", fields, output_format)
 
 
 @mcp.tool()
-def get_past_arrivals(
+@instrument_tool
+async def get_past_arrivals(
     airport_code: str,
     year: Optional[int] = None,
     month: Optional[int] = None,
@@ -222,9 +920,21 @@ def get_past_arrivals(
     start_time: Optional[str] = None,
     end_time: Optional[str] = None,
     fetch_all: bool = False,
+    shards: Optional[int] = None,
+    timezone_name: Optional[str] = None,
+    stream: bool = False,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    output_format: str = "records",
+    ctx: Context = None,
 ):
     """Retrieves the list of arrivals for a specified airport.
 
+    With fetch_all, windows that ended more than a few hours ago are returned
+    in full from the local flight store; only periods never fetched before are
+    requested from the API. Windows already stored are served from the store
+    either way, and may be older than the usual 10-day limit.
+
     Args:
         airport_code: The ICAO code of the airport.
         year: Year (e.g., 2026). Defaults to current year.
@@ -233,27 +943,445 @@ def get_past_arrivals(
         start_time: Start time in HH:MM format (e.g., "09:00"). Defaults to 00:00 if date is specified, or 1 hour ago if no date/time provided.
         end_time: End time in HH:MM format (e.g., "18:00"). Defaults to 23:59 if date is specified, or 1 hour from now if no date/time provided.
         fetch_all: If True, retrieves all data using pagination.
+        shards: If greater than 1, splits the time window into this many sub-windows that are fetched concurrently and merged (implies fetch_all). Useful for full-day boards at busy airports.
+        timezone_name: Timezone for returned times (e.g., "Asia/Tokyo", "UTC", "+09:00"). Defaults to JST.
+        stream: If True, returns only the first page as {"<key>": [...], "next_cursor": ...} so results can be used before later pages load.
+        cursor: The next_cursor from a previous stream call; returns the following page in the same format.
+        fields: Only return these fields per flight. Dotted paths reach nested objects (e.g., ["ident", "origin.code", "scheduled_out", "status"]).
+        output_format: "records" (list of objects, default) or "compact" ({"fields": [...], "rows": [[...]], "dictionaries": {...}}; columns listed in dictionaries hold indexes into that list).
     """
     logging.info(
-        f"get_arrivals called with airport_code={airport_code}, year={year}, month={month}, day={day}, start_time={start_time}, end_time={end_time}, fetch_all={fetch_all}"
+        f"get_arrivals called with airport_code={airport_code}, year={year}, month={month}, day={day}, start_time={start_time}, end_time={end_time}, fetch_all={fetch_all}, shards={shards}"
     )
 
     try:
         start_param, end_param = construct_time_range(
-            year, month, day, start_time, end_time
+            year, month, day, start_time, end_time, enforce_past_limit=False
         )
+        tz = resolve_timezone(timezone_name)
+        validate_output_format(output_format)
+        await check_past_limit(airport_code, "arrivals", start_param, end_param)
     except ValueError as e:
         logging.error(f"Validation Error: {e}")
         return f"Input Error: {e}"
 
-    url = f"https://aeroapi.flightaware.com/aeroapi/airports/{airport_code}/flights/arrivals"
+    endpoint = f"airports/{airport_code}/flights/arrivals"
+    url = AEROAPI_ROOT + endpoint
+    try:
+        page_url = resolve_cursor(endpoint, cursor) if cursor else None
+    except ValueError as e:
+        return f"Input Error: {e}"
+
     params = {"start": start_param, "end": end_param}
 
-    return fetch_paginated_data(url, params, "arrivals", fetch_all)
+    if cursor:
+        result = await fetch_page(page_url, None, "arrivals", tz)
+    elif stream:
+        result = await fetch_page(url, params, "arrivals", tz)
+    elif is_final_window(end_param) and (
+        fetch_all
+        or (shards and shards > 1)
+        or await is_stored(airport_code, "arrivals", start_param, end_param)
+    ):
+        # Gaps are fully paginated, so without fetch_all only a window that
+        # is already stored is answered from the store
+        result = await fetch_stored_board(
+            url,
+            airport_code,
+            "arrivals",
+            start_param,
+            end_param,
+            tz,
+            progress_reporter(ctx, f"{airport_code} arrivals"),
+        )
+    elif shards and shards > 1:
+        result = await fetch_sharded_data(
+            url,
+            start_param,
+            end_param,
+            "arrivals",
+            min(shards, MAX_SHARDS),
+            "scheduled_in",
+            tz,
+        )
+    else:
+        result = await fetch_paginated_data(
+            url,
+            params,
+            "arrivals",
+            fetch_all,
+            tz,
+            progress_reporter(ctx, f"{airport_code} arrivals") if fetch_all else None,
+        )
+
+    return shape_result(result, "arrivals", fields, output_format)
+
+
+@mcp.tool()
+@instrument_tool
+async def get_multi_airport_board(
+    airport_codes: List[str],
+    direction: str = "departures",
+    year: Optional[int] = None,
+    month: Optional[int] = None,
+    day: Optional[int] = None,
+    start_time: Optional[str] = None,
+    end_time: Optional[str] = None,
+    min_delay_minutes: Optional[float] = None,
+    sort_by: str = "time",
+    limit: Optional[int] = None,
+    timezone_name: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    output_format: str = "records",
+):
+    """Retrieves the departures or arrivals of several airports at once, merged into one list.
+
+    All boards are fetched concurrently and completely (as with fetch_all).
+    Use this instead of one get_past_departures/get_past_arrivals call per
+    airport, e.g. to compare delays across RJTT, RJAA and other nearby airports.
+
+    Args:
+        airport_codes: ICAO codes of the airports (e.g., ["RJTT", "RJAA"]).
+        direction: "departures" or "arrivals".
+        year: Year (e.g., 2026). Defaults to current year.
+        month: Month (1-12). Defaults to current month.
+        day: Day (1-31). Defaults to current day.
+        start_time: Start time in HH:MM format (e.g., "09:00"). Defaults to 00:00 if date is specified, or 1 hour ago if no date/time provided.
+        end_time: End time in HH:MM format (e.g., "18:00"). Defaults to 23:59 if date is specified, or 1 hour from now if no date/time provided.
+        min_delay_minutes: Only return flights delayed at least this many minutes (e.g., 15).
+        sort_by: "time" (scheduled gate time, default), "delay" (most delayed first) or "airport".
+        limit: Return at most this many flights after sorting (0 returns only the summaries).
+        timezone_name: Timezone for returned times (e.g., "Asia/Tokyo", "UTC", "+09:00"). Defaults to JST.
+        fields: Only return these fields per flight. Dotted paths reach nested objects (e.g., ["airport", "ident", "scheduled_out", "delay_minutes"]).
+        output_format: "records" (list of objects, default) or "compact" ({"fields": [...], "rows": [[...]], "dictionaries": {...}}; columns listed in dictionaries hold indexes into that list).
+
+    Returns:
+        {"window", "summaries" (per airport: flights, cancelled, delayed, on_time_pct, avg/max delay, or error), "total", "<direction>"}.
+        Each flight carries "airport" and "delay_minutes". Summaries cover every flight in the window, regardless of min_delay_minutes and limit.
+    """
+    logging.info(
+        f"get_multi_airport_board called with airport_codes={airport_codes}, direction={direction}, year={year}, month={month}, day={day}, start_time={start_time}, end_time={end_time}, min_delay_minutes={min_delay_minutes}, sort_by={sort_by}, limit={limit}"
+    )
+
+    try:
+        if isinstance(airport_codes, str):
+            airport_codes = airport_codes.split(",")
+        if any(not isinstance(code, str) for code in airport_codes or []):
+            raise ValueError("airport_codes must be a list of airport codes.")
+        # Blank entries are dropped; at least one real code must remain
+        codes = [code.strip().upper() for code in airport_codes or []]
+        airports = list(dict.fromkeys(code for code in codes if code))
+        if not airports:
+            raise ValueError("airport_codes must list at least one airport.")
+        if len(airports) > MAX_BULK_AIRPORTS:
+            raise ValueError(f"at most {MAX_BULK_AIRPORTS} airports per call.")
+        if direction not in DIRECTIONS:
+            raise ValueError(f"direction must be one of {', '.join(DIRECTIONS)}.")
+        if sort_by not in BOARD_SORT_KEYS:
+            raise ValueError(f"sort_by must be one of {', '.join(BOARD_SORT_KEYS)}.")
+        if limit is not None and limit < 0:
+            raise ValueError("limit must be 0 or greater.")
+        start_param, end_param = construct_time_range(
+            year, month, day, start_time, end_time, enforce_past_limit=False
+        )
+        tz = resolve_timezone(timezone_name)
+        validate_output_format(output_format)
+    except ValueError as e:
+        logging.error(f"Validation Error: {e}")
+        return f"Input Error: {e}"
+
+    results = await asyncio.gather(
+        *(
+            fetch_board(airport, direction, start_param, end_param, tz)
+            for airport in airports
+        )
+    )
+
+    boards = {}
+    summaries = []
+    for airport, result in zip(airports, results):
+        if isinstance(result, str):
+            summaries.append({"airport": airport, "error": result})
+            continue
+        boards[airport] = result
+        summaries.append({"airport": airport, **summarize_board(result, direction)})
+    if not boards:
+        # Every airport failed; the same input error applies to all of them
+        return results[0] if results[0].startswith("Input Error") else results[-1]
+
+    flights = merge_boards(boards, direction, sort_by, min_delay_minutes)
+    return {
+        "window": {"start": start_param, "end": end_param},
+        "summaries": summaries,
+        "total": len(flights),
+        direction: shape_flights(
+            flights if limit is None else flights[:limit], fields, output_format
+        ),
+    }
+
+
+@mcp.tool()
+@instrument_tool
+async def get_board_stats(
+    airport_code: str,
+    direction: str = "departures",
+    year: Optional[int] = None,
+    month: Optional[int] = None,
+    day: Optional[int] = None,
+    start_time: Optional[str] = None,
+    end_time: Optional[str] = None,
+    stats: Optional[List[str]] = None,
+    top_n: int = 10,
+    timezone_name: Optional[str] = None,
+):
+    """Computes delay statistics, per-airline on-time rates, hourly movements and top routes of an airport board.
+
+    The whole board is fetched and aggregated on the server, so only the
+    summary is returned. Prefer this over fetching flight lists when the
+    question asks for counts, delays, on-time rates, busiest hours or routes.
+    Delays are gate times (actual, else estimated, minus scheduled) in
+    minutes; flights at most 15 minutes late are on time.
+
+    Args:
+        airport_code: The ICAO code of the airport.
+        direction: "departures" or "arrivals".
+        year: Year (e.g., 2026). Defaults to current year.
+        month: Month (1-12). Defaults to current month.
+        day: Day (1-31). Defaults to current day.
+        start_time: Start time in HH:MM format (e.g., "09:00"). Defaults to 00:00 if date is specified, or 1 hour ago if no date/time provided.
+        end_time: End time in HH:MM format (e.g., "18:00"). Defaults to 23:59 if date is specified, or 1 hour from now if no date/time provided.
+        stats: Any of "summary", "delays", "airlines", "hourly", "routes". Defaults to all.
+        top_n: Number of airlines and routes to return (busiest first).
+        timezone_name: Timezone for the hourly histogram (e.g., "Asia/Tokyo", "UTC", "+09:00"). Defaults to JST.
+
+    Returns:
+        {"airport", "direction", "window", "summary" (counts, on-time %, average/max delay),
+        "delays" (count, mean, median, p90, p95, max, buckets), "airlines" ([{airline, flights, on_time_pct, avg_delay_minutes}]),
+        "hourly" (counts per local hour, busiest_hour), "routes" ([{origin, destination, flights, on_time_pct, avg_delay_minutes}])},
+        or error message string.
+    """
+    logging.info(
+        f"get_board_stats called with airport_code={airport_code}, direction={direction}, year={year}, month={month}, day={day}, start_time={start_time}, end_time={end_time}, stats={stats}, top_n={top_n}"
+    )
+
+    try:
+        if direction not in DIRECTIONS:
+            raise ValueError(f"direction must be one of {', '.join(DIRECTIONS)}.")
+        unknown = [name for name in stats or [] if name not in STATS]
+        if unknown:
+            raise ValueError(f"stats must be among {', '.join(STATS)}.")
+        if top_n < 1:
+            raise ValueError("top_n must be at least 1.")
+        start_param, end_param = construct_time_range(
+            year, month, day, start_time, end_time, enforce_past_limit=False
+        )
+        tz = resolve_timezone(timezone_name)
+    except ValueError as e:
+        logging.error(f"Validation Error: {e}")
+        return f"Input Error: {e}"
+
+    result = await fetch_board(airport_code, direction, start_param, end_param, tz)
+    if isinstance(result, str):
+        return result
+    return {
+        "airport": airport_code,
+        "direction": direction,
+        "window": {"start": start_param, "end": end_param},
+        **board_stats(result, direction, stats, top_n),
+    }
 
 
 @mcp.tool()
-def get_flight_schedules(
+@instrument_tool
+async def find_flights_in_area(
+    airport_code: str,
+    bbox: Optional[List[float]] = None,
+    latitude: Optional[float] = None,
+    longitude: Optional[float] = None,
+    radius_km: Optional[float] = None,
+    corridor: Optional[List[List[float]]] = None,
+    corridor_width_km: float = 10.0,
+    direction: str = "departures",
+    year: Optional[int] = None,
+    month: Optional[int] = None,
+    day: Optional[int] = None,
+    start_time: Optional[str] = None,
+    end_time: Optional[str] = None,
+    timezone_name: Optional[str] = None,
+    limit: Optional[int] = None,
+):
+    """Finds flights of an airport's board that passed through an area during a time window.
+
+    Give exactly one area: bbox, a point with radius_km, or a corridor.
+    The tracks of airport_code's departures/arrivals in the window are indexed
+    first (up to a per-call limit of new tracks), then only those flights are
+    searched. Only positions inside the time window count.
+
+    The track index lives in the server process's memory, so results are
+    scoped to one board; the agent's worker pool routes every call for an
+    airport to the same process.
+
+    Args:
+        airport_code: The ICAO code of the airport whose board flights are searched.
+        bbox: [min_lon, min_lat, max_lon, max_lat] in degrees.
+        latitude: Centre latitude for a radius search.
+        longitude: Centre longitude for a radius search.
+        radius_km: Radius in kilometres around latitude/longitude.
+        corridor: Polyline [[lon, lat], ...] (at least two points), e.g. a route or airway.
+        corridor_width_km: Maximum distance from the corridor line in kilometres.
+        direction: "departures" or "arrivals" board of airport_code.
+        year: Year (e.g., 2026). Defaults to current year.
+        month: Month (1-12). Defaults to current month.
+        day: Day (1-31). Defaults to current day.
+        start_time: Start time in HH:MM format (e.g., "09:00"). Defaults to 00:00 if date is specified, or 1 hour ago if no date/time provided.
+        end_time: End time in HH:MM format (e.g., "18:00"). Defaults to 23:59 if date is specified, or 1 hour from now if no date/time provided.
+        timezone_name: Timezone for returned times (e.g., "Asia/Tokyo", "UTC", "+09:00"). Defaults to JST.
+        limit: Return at most this many flights (0 returns only the counts).
+
+    Returns:
+        {"window", "indexed" (tracks in the index and board flights fetched/failed/skipped), "total",
+        "flights": [{fa_flight_id, ident, ..., first_seen, last_seen, segments, min_distance_km (radius/corridor)}]} ordered by first_seen,
+        or error message string.
+    """
+    logging.info(
+        f"find_flights_in_area called with bbox={bbox}, latitude={latitude}, longitude={longitude}, radius_km={radius_km}, corridor={corridor}, corridor_width_km={corridor_width_km}, airport_code={airport_code}, direction={direction}, year={year}, month={month}, day={day}, start_time={start_time}, end_time={end_time}"
+    )
+
+    try:
+        if not airport_code or not airport_code.strip():
+            raise ValueError("airport_code is required.")
+        radius = None not in (latitude, longitude, radius_km)
+        if (bbox is not None) + radius + (corridor is not None) != 1:
+            raise ValueError(
+                "give exactly one of bbox, latitude/longitude/radius_km or corridor."
+            )
+        if bbox is not None and (
+            len(bbox) != 4
+            or not valid_lon_lat(bbox[0], bbox[1])
+            or not valid_lon_lat(bbox[2], bbox[3])
+            or bbox[0] > bbox[2]
+            or bbox[1] > bbox[3]
+        ):
+            raise ValueError(
+                "bbox must be [min_lon, min_lat, max_lon, max_lat] with "
+                "longitudes in -180..180 and latitudes in -90..90."
+            )
+        if radius and not valid_lon_lat(longitude, latitude):
+            raise ValueError("latitude must be in -90..90 and longitude in -180..180.")
+        if radius and radius_km <= 0:
+            raise ValueError("radius_km must be positive.")
+        if corridor is not None and (
+            len(corridor) < 2
+            or any(len(point) != 2 or not valid_lon_lat(*point) for point in corridor)
+        ):
+            raise ValueError(
+                "corridor must be at least two [lon, lat] points within -180..180 / -90..90."
+            )
+        if corridor is not None and corridor_width_km <= 0:
+            raise ValueError("corridor_width_km must be positive.")
+        if direction not in DIRECTIONS:
+            raise ValueError(f"direction must be one of {', '.join(DIRECTIONS)}.")
+        if limit is not None and limit < 0:
+            raise ValueError("limit must be 0 or greater.")
+        start_param, end_param = construct_time_range(
+            year, month, day, start_time, end_time, enforce_past_limit=False
+        )
+        tz = resolve_timezone(timezone_name)
+    except ValueError as e:
+        logging.error(f"Validation Error: {e}")
+        return f"Input Error: {e}"
+
+    board = await index_board_tracks(airport_code, direction, start_param, end_param)
+    if isinstance(board, str):
+        return board
+    indexed, flight_ids = {"board": board[0]}, board[1]
+
+    start, end = to_epoch(start_param), to_epoch(end_param)
+    if bbox is not None:
+        hits = await asyncio.to_thread(track_index.query_bbox, tuple(bbox), start, end)
+    elif radius:
+        hits = await asyncio.to_thread(
+            track_index.query_radius, latitude, longitude, radius_km, start, end
+        )
+    else:
+        hits = await asyncio.to_thread(
+            track_index.query_corridor, corridor, corridor_width_km, start, end
+        )
+    indexed["tracks"] = len(track_index)
+    # Other boards' tracks in this process's index are not part of the answer
+    hits = [hit for hit in hits if hit["fa_flight_id"] in flight_ids]
+
+    for hit in hits:
+        hit["first_seen"] = convert_timestamp(to_iso(hit["first_seen"]), tz)
+        hit["last_seen"] = convert_timestamp(to_iso(hit["last_seen"]), tz)
+    return {
+        "window": {"start": start_param, "end": end_param},
+        "indexed": indexed,
+        "total": len(hits),
+        "flights": hits if limit is None else hits[:limit],
+    }
+
+
+@mcp.tool()
+@instrument_tool
+async def track_board(
+    airport_code: str,
+    direction: str = "departures",
+    since_version: Optional[int] = None,
+    timezone_name: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    output_format: str = "records",
+):
+    """Tracks a live airport board (1 hour before to 1 hour after now) and returns only what changed.
+
+    Poll with the "version" from the previous response as since_version. The
+    first call (or an expired version) returns the whole board as "added" with
+    "reset": true.
+
+    Args:
+        airport_code: The ICAO code of the airport.
+        direction: "departures" or "arrivals".
+        since_version: The version returned by the previous call.
+        timezone_name: Timezone for returned times (e.g., "Asia/Tokyo", "UTC", "+09:00"). Defaults to JST.
+        fields: Only return these fields per flight. Dotted paths reach nested objects (e.g., ["ident", "origin.code", "scheduled_out", "status"]).
+        output_format: "records" (list of objects, default) or "compact" ({"fields": [...], "rows": [[...]], "dictionaries": {...}}; columns listed in dictionaries hold indexes into that list).
+
+    Returns:
+        {"version", "reset", "window", "added", "changed", "departed" (fa_flight_ids), "unchanged" (count)}, or error message string.
+    """
+    logging.info(
+        f"track_board called with airport_code={airport_code}, direction={direction}, since_version={since_version}"
+    )
+
+    try:
+        if direction not in DIRECTIONS:
+            raise ValueError(f"direction must be one of {', '.join(DIRECTIONS)}.")
+        tz = resolve_timezone(timezone_name)
+        validate_output_format(output_format)
+    except ValueError as e:
+        logging.error(f"Validation Error: {e}")
+        return f"Input Error: {e}"
+
+    key = f"board:{airport_code.upper()}:{direction}"
+    try:
+        await tool_calls.do(key, lambda: refresh_board(airport_code, direction))
+    except AeroAPIError as e:
+        logging.warning(str(e))
+        return "Failed to retrieve data."
+
+    board = get_board(airport_code, direction)
+    result = board.diff(since_version)
+    result["window"] = {"start": to_iso(board.start), "end": to_iso(board.end)}
+    for name in ("added", "changed"):
+        # Snapshots keep UTC records, so localize copies
+        flights = localize_flight_data([dict(f) for f in result[name]], tz)
+        result[name] = shape_flights(flights, fields, output_format)
+    return result
+
+
+@mcp.tool()
+@instrument_tool
+async def get_flight_schedules(
     year: Optional[int] = None,
     month: Optional[int] = None,
     day: Optional[int] = None,
@@ -264,6 +1392,12 @@ def get_flight_schedules(
     airline: Optional[str] = None,
     flight_number: Optional[str] = None,
     fetch_all: bool = False,
+    timezone_name: Optional[str] = None,
+    stream: bool = False,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    output_format: str = "records",
+    ctx: Context = None,
 ):
     """Retrieves flight future schedules for a specified time range.
 
@@ -278,6 +1412,11 @@ def get_flight_schedules(
         airline: Airline code (ICAO).
         flight_number: Flight number.
         fetch_all: If True, retrieves all data using pagination.
+        timezone_name: Timezone for returned times (e.g., "Asia/Tokyo", "UTC", "+09:00"). Defaults to JST.
+        stream: If True, returns only the first page as {"<key>": [...], "next_cursor": ...} so results can be used before later pages load.
+        cursor: The next_cursor from a previous stream call; returns the following page in the same format.
+        fields: Only return these fields per flight. Dotted paths reach nested objects (e.g., ["ident", "origin.code", "scheduled_out", "status"]).
+        output_format: "records" (list of objects, default) or "compact" ({"fields": [...], "rows": [[...]], "dictionaries": {...}}; columns listed in dictionaries hold indexes into that list).
     """
     logging.info(
         f"get_schedules called with year={year}, month={month}, day={day}, start_time={start_time}, end_time={end_time}, origin={origin}, destination={destination}, airline={airline}, flight_number={flight_number}, fetch_all={fetch_all}"
@@ -287,11 +1426,13 @@ def get_flight_schedules(
         start_date, end_date = construct_time_range(
             year, month, day, start_time, end_time
         )
+        tz = resolve_timezone(timezone_name)
+        validate_output_format(output_format)
     except ValueError as e:
         logging.error(f"Validation Error: {e}")
         return f"Input Error: {e}"
 
-    url = f"https://aeroapi.flightaware.com/aeroapi/schedules/{start_date}/{end_date}"
+    url = AEROAPI_ROOT + f"schedules/{start_date}/{end_date}"
 
     params = {}
     if origin:
@@ -303,8 +1444,35 @@ def get_flight_schedules(
     if flight_number:
         params["flight_number"] = flight_number
 
-    return fetch_paginated_data(url, params if params else None, "scheduled", fetch_all)
+    if cursor:
+        try:
+            page_url = resolve_cursor("schedules/", cursor)
+        except ValueError as e:
+            return f"Input Error: {e}"
+        result = await fetch_page(page_url, None, "scheduled", tz)
+    elif stream:
+        result = await fetch_page(url, params if params else None, "scheduled", tz)
+    else:
+        result = await fetch_paginated_data(
+            url,
+            params if params else None,
+            "scheduled",
+            fetch_all,
+            tz,
+            progress_reporter(ctx, "schedules") if fetch_all else None,
+        )
+
+    return shape_result(result, "scheduled", fields, output_format)
 
 
 if __name__ == "__main__":
-    mcp.run()
+    init_tracing("flightaware-mcp")
+    register_stats_collector()
+    start_metrics_server()
+    logging.info(f"Warm-started {warm_from_disk()} cached responses from disk")
+    logging.info(f"Pruned {flight_store.prune()} expired flights from the flight store")
+    logging.info(f"Indexed {track_index.load_from_disk()} cached tracks from disk")
+    for path in TRACK_FILES:
+        logging.info(f"Indexed {track_index.load_track_file(path)} tracks from {path}")
+    # "streamable-http" serves many agent connections from one process
+    mcp.run(transport=os.getenv("MCP_TRANSPORT", "stdio"))
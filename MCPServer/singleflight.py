@@ -0,0 +1,44 @@
+"""Single-flight de-duplication of concurrent identical calls.
+
+While a call for a given key is in flight, later callers with the same key
+wait for and share its result instead of starting their own.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """Coalesces concurrent async calls that share a key."""
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Future] = {}
+        self.leaders = 0
+        self.shared = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Runs `fn` once per key among concurrent callers and returns its result.
+
+        The shared call keeps running if an individual waiter is cancelled, so
+        the remaining waiters still receive the result.
+        """
+        future = self._calls.get(key)
+        if future is None:
+            self.leaders += 1
+            future = asyncio.ensure_future(fn())
+            self._calls[key] = future
+            future.add_done_callback(lambda _: self._forget(key, future))
+        else:
+            self.shared += 1
+        return await asyncio.shield(future)
+
+    def _forget(self, key: str, future: asyncio.Future):
+        if self._calls.get(key) is future:
+            del self._calls[key]
+        if not future.cancelled():
+            # Mark the exception as retrieved when every waiter has gone away
+            future.exception()
+
+    def in_flight(self) -> int:
+        """Returns the number of keys currently being fetched."""
+        return len(self._calls)
@@ -0,0 +1,163 @@
+"""Array-backed flight track representation.
+
+A Track keeps latitude, longitude, altitude and time as parallel NumPy arrays
+instead of one dict per position. It also provides vectorized
+Douglas-Peucker simplification and coordinate quantization for building
+compact GeoJSON.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+EARTH_RADIUS_M = 6371008.8
+
+
+class Track:
+    """A flight track as parallel arrays of lat/lon/alt/time."""
+
+    __slots__ = ("fa_flight_id", "lat", "lon", "alt", "time")
+
+    def __init__(
+        self,
+        lat: np.ndarray,
+        lon: np.ndarray,
+        alt: Optional[np.ndarray] = None,
+        time: Optional[np.ndarray] = None,
+        fa_flight_id: Optional[str] = None,
+    ):
+        self.lat = np.asarray(lat, dtype="float64")
+        self.lon = np.asarray(lon, dtype="float64")
+        n = len(self.lat)
+        # Altitude in hundreds of feet as reported by AeroAPI; time as epoch seconds
+        self.alt = np.asarray(alt, dtype="float64") if alt is not None else np.zeros(n)
+        self.time = (
+            np.asarray(time, dtype="int64")
+            if time is not None
+            else np.zeros(n, dtype="int64")
+        )
+        self.fa_flight_id = fa_flight_id
+
+    @classmethod
+    def from_aeroapi(
+        cls, data: Dict[str, Any], fa_flight_id: Optional[str] = None
+    ) -> "Track":
+        """Builds a Track from a `flights/{id}/track` response."""
+        positions = data.get("positions") or []
+        lat = np.fromiter((p["latitude"] for p in positions), "float64", len(positions))
+        lon = np.fromiter(
+            (p["longitude"] for p in positions), "float64", len(positions)
+        )
+        alt = np.fromiter(
+            (p.get("altitude") or 0 for p in positions), "float64", len(positions)
+        )
+        timestamps = [(p.get("timestamp") or "").rstrip("Z") for p in positions]
+        try:
+            time = (
+                np.array(timestamps, dtype="datetime64[s]").astype("int64")
+                if all(timestamps)
+                else None
+            )
+        except ValueError:
+            time = None
+        return cls(lat, lon, alt, time, fa_flight_id)
+
+    def __len__(self) -> int:
+        return len(self.lat)
+
+    def take(self, index: np.ndarray) -> "Track":
+        """Returns a new Track with only the positions at `index`."""
+        return Track(
+            self.lat[index],
+            self.lon[index],
+            self.alt[index],
+            self.time[index],
+            self.fa_flight_id,
+        )
+
+    def bbox(self) -> List[float]:
+        """Returns [min_lon, min_lat, max_lon, max_lat]."""
+        if not len(self):
+            return []
+        return [
+            float(self.lon.min()),
+            float(self.lat.min()),
+            float(self.lon.max()),
+            float(self.lat.max()),
+        ]
+
+    def projected(self) -> np.ndarray:
+        """Returns positions as local planar (x, y) metres for distance checks.
+
+        Longitudes are unwrapped so tracks crossing the antimeridian stay
+        continuous.
+        """
+        lon = np.unwrap(np.radians(self.lon))
+        lat = np.radians(self.lat)
+        x = lon * np.cos(lat.mean() if len(lat) else 0.0) * EARTH_RADIUS_M
+        y = lat * EARTH_RADIUS_M
+        return np.column_stack((x, y))
+
+    def simplify(self, tolerance: float) -> "Track":
+        """Douglas-Peucker simplification.
+
+        Args:
+            tolerance: Maximum allowed deviation from the original path, in metres.
+        """
+        n = len(self)
+        if n < 3 or tolerance <= 0:
+            return self
+        points = self.projected()
+        keep = np.zeros(n, dtype=bool)
+        keep[0] = keep[-1] = True
+        stack = [(0, n - 1)]
+        while stack:
+            start, end = stack.pop()
+            if end - start < 2:
+                continue
+            segment = points[end] - points[start]
+            offsets = points[start + 1 : end] - points[start]
+            length = np.hypot(segment[0], segment[1])
+            if length == 0:
+                distances = np.hypot(offsets[:, 0], offsets[:, 1])
+            else:
+                distances = (
+                    np.abs(segment[0] * offsets[:, 1] - segment[1] * offsets[:, 0])
+                    / length
+                )
+            farthest = int(np.argmax(distances))
+            if distances[farthest] > tolerance:
+                split = start + 1 + farthest
+                keep[split] = True
+                stack.append((start, split))
+                stack.append((split, end))
+        return self.take(np.flatnonzero(keep))
+
+    def coordinates(self, precision: Optional[int] = None) -> List[List[float]]:
+        """Returns GeoJSON [lon, lat] pairs.
+
+        Args:
+            precision: If given, rounds to this many decimals (5 is about 1 m)
+                and drops consecutive duplicates created by the rounding.
+        """
+        coords = np.column_stack((self.lon, self.lat))
+        if precision is not None and len(coords):
+            coords = np.round(coords, precision)
+            changed = np.any(coords[1:] != coords[:-1], axis=1)
+            coords = coords[np.concatenate(([True], changed))]
+        return coords.tolist()
+
+    def to_geojson(
+        self,
+        properties: Optional[Dict[str, Any]] = None,
+        precision: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Returns the track as a GeoJSON LineString Feature."""
+        return {
+            "type": "Feature",
+            "geometry": {
+                "type": "LineString",
+                "coordinates": self.coordinates(precision),
+            },
+            "properties": properties or {},
+        }
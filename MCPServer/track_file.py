@@ -0,0 +1,633 @@
+"""FlatGeobuf export and queries for bulk flight tracks.
+
+GeoJSON text is slow to parse and large to ship once there are thousands of
+tracks. Tracks are written as FlatGeobuf (https://flatgeobuf.org), the
+standard binary vector format read by GDAL/QGIS and by the `flatgeobuf`
+JavaScript package for web maps. Each track is one LineString feature with
+altitude as Z and epoch seconds as M, so nothing is lost against the
+in-memory Track.
+
+The file carries a packed Hilbert R-tree over the feature bboxes. Readers
+memory-map the file, walk the tree and only decode the features a spatial
+query selects. Every feature also stores its first/last position time in
+the "start" and "end" columns for time-range filtering.
+
+This module encodes the few FlatBuffers tables FlatGeobuf needs directly,
+so the export has no extra dependency. All values are little-endian, as
+the format requires; readers check the magic bytes and major version.
+"""
+
+import json
+import os
+import struct
+import tempfile
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from MCPServer.track import Track
+
+# "fgb", major version 3, "fgb", patch 0
+MAGIC = b"fgb\x03fgb\x00"
+FORMAT_VERSION = 3
+NODE_SIZE = 16
+
+GEOMETRY_LINESTRING = 2
+# FlatGeobuf ColumnType values
+COLUMN_BOOL = 2
+COLUMN_LONG = 7
+COLUMN_DOUBLE = 10
+COLUMN_STRING = 11
+COLUMN_JSON = 12
+# Columns every feature carries
+TIME_COLUMNS = ("start", "end")
+
+NODE_DTYPE = np.dtype(
+    [
+        ("min_x", "<f8"),
+        ("min_y", "<f8"),
+        ("max_x", "<f8"),
+        ("max_y", "<f8"),
+        ("offset", "<u8"),
+    ]
+)
+POINT_DTYPE = np.dtype(
+    [("lon", "<f8"), ("lat", "<f8"), ("alt", "<f8"), ("time", "<i8")]
+)
+
+BBox = Tuple[float, float, float, float]
+
+# Inline size of each scalar field kind of a FlatBuffers table
+_SCALARS = {"u8": "<B", "u16": "<H", "i32": "<i", "u64": "<Q"}
+
+
+class _FlatBufferWriter:
+    """Writes one FlatBuffers buffer front to back.
+
+    Tables are given as [(slot, kind, value)]; kind is a scalar format from
+    _SCALARS, or "str", "table", "tables", "f64s", "u8s". Children are laid
+    out after their parent, so every offset points forward.
+    """
+
+    def __init__(self):
+        self.buf = bytearray(4)
+
+    def finish(self, fields: List[Tuple[int, str, Any]]) -> bytes:
+        struct.pack_into("<I", self.buf, 0, self._table(fields))
+        return bytes(self.buf)
+
+    def _pad(self, align: int, extra: int = 0):
+        self.buf.extend(b"\x00" * (-(len(self.buf) + extra) % align))
+
+    def _table(self, fields: List[Tuple[int, str, Any]]) -> int:
+        fields = [f for f in fields if f[2] is not None]
+        # Inline layout after the 4-byte vtable offset, widest fields first
+        layout, size = [], 4
+        for slot, kind, value in sorted(
+            fields, key=lambda f: -struct.calcsize(_SCALARS.get(f[1], "<I"))
+        ):
+            width = struct.calcsize(_SCALARS.get(kind, "<I"))
+            size += -size % width
+            layout.append((slot, kind, value, size))
+            size += width
+        slots = max((f[0] for f in fields), default=-1) + 1
+        vtable = [0] * slots
+        for slot, _, _, offset in layout:
+            vtable[slot] = offset
+
+        self._pad(2)
+        vtable_pos = len(self.buf)
+        self.buf += struct.pack(f"<HH{slots}H", 4 + 2 * slots, size, *vtable)
+        self._pad(8)
+        table_pos = len(self.buf)
+        self.buf += bytes(size)
+        struct.pack_into("<i", self.buf, table_pos, table_pos - vtable_pos)
+        references = []
+        for slot, kind, value, offset in layout:
+            if kind in _SCALARS:
+                struct.pack_into(_SCALARS[kind], self.buf, table_pos + offset, value)
+            else:
+                references.append((table_pos + offset, kind, value))
+        for field_pos, kind, value in references:
+            struct.pack_into(
+                "<I", self.buf, field_pos, self._object(kind, value) - field_pos
+            )
+        return table_pos
+
+    def _object(self, kind: str, value: Any) -> int:
+        if kind == "table":
+            return self._table(value)
+        if kind == "tables":
+            self._pad(4)
+            pos = len(self.buf)
+            self.buf += struct.pack("<I", len(value)) + bytes(4 * len(value))
+            for i, fields in enumerate(value):
+                slot = pos + 4 + 4 * i
+                struct.pack_into("<I", self.buf, slot, self._table(fields) - slot)
+            return pos
+        if kind == "str":
+            data = value.encode("utf-8")
+            self._pad(4)
+            pos = len(self.buf)
+            self.buf += struct.pack("<I", len(data)) + data + b"\x00"
+            return pos
+        if kind == "f64s":
+            data = np.ascontiguousarray(value, dtype="<f8").tobytes()
+            self._pad(8, 4)
+        else:
+            data = bytes(value)
+            self._pad(4)
+        pos = len(self.buf)
+        self.buf += struct.pack("<I", len(data) // (8 if kind == "f64s" else 1))
+        self.buf += data
+        return pos
+
+
+class _Table:
+    """Read access to one FlatBuffers table in `buf`."""
+
+    def __init__(self, buf, pos: int):
+        self.buf = buf
+        self.pos = pos
+        self.vtable = pos - struct.unpack_from("<i", buf, pos)[0]
+        self.vtable_size = struct.unpack_from("<H", buf, self.vtable)[0]
+
+    def _field(self, slot: int) -> Optional[int]:
+        entry = 4 + 2 * slot
+        if entry >= self.vtable_size:
+            return None
+        offset = struct.unpack_from("<H", self.buf, self.vtable + entry)[0]
+        return self.pos + offset if offset else None
+
+    def scalar(self, slot: int, kind: str, default: Any = 0) -> Any:
+        pos = self._field(slot)
+        if pos is None:
+            return default
+        return struct.unpack_from(_SCALARS[kind], self.buf, pos)[0]
+
+    def _target(self, slot: int) -> Optional[int]:
+        pos = self._field(slot)
+        if pos is None:
+            return None
+        return pos + struct.unpack_from("<I", self.buf, pos)[0]
+
+    def table(self, slot: int) -> Optional["_Table"]:
+        pos = self._target(slot)
+        return None if pos is None else _Table(self.buf, pos)
+
+    def string(self, slot: int) -> Optional[str]:
+        pos = self._target(slot)
+        if pos is None:
+            return None
+        length = struct.unpack_from("<I", self.buf, pos)[0]
+        return bytes(self.buf[pos + 4 : pos + 4 + length]).decode("utf-8")
+
+    def vector(self, slot: int, dtype: str) -> np.ndarray:
+        pos = self._target(slot)
+        if pos is None:
+            return np.zeros(0, dtype=dtype)
+        length = struct.unpack_from("<I", self.buf, pos)[0]
+        return np.frombuffer(self.buf, dtype=dtype, count=length, offset=pos + 4)
+
+    def tables(self, slot: int) -> List["_Table"]:
+        pos = self._target(slot)
+        if pos is None:
+            return []
+        length = struct.unpack_from("<I", self.buf, pos)[0]
+        result = []
+        for i in range(length):
+            entry = pos + 4 + 4 * i
+            result.append(
+                _Table(self.buf, entry + struct.unpack_from("<I", self.buf, entry)[0])
+            )
+        return result
+
+
+def hilbert(x: np.ndarray, y: np.ndarray, bits: int = 16) -> np.ndarray:
+    """Distance along a Hilbert curve of integer grid coordinates in [0, 2**bits)."""
+    x, y = x.astype("int64"), y.astype("int64")
+    n = 1 << bits
+    d = np.zeros(len(x), dtype="int64")
+    s = n >> 1
+    while s:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        d += s * s * ((3 * rx) ^ ry)
+        # Rotate the quadrant so the curve stays continuous
+        flip = ~ry & rx
+        x = np.where(flip, n - 1 - x, x)
+        y = np.where(flip, n - 1 - y, y)
+        swap = ~ry
+        x, y = np.where(swap, y, x), np.where(swap, x, y)
+        s >>= 1
+    return d
+
+
+def level_bounds(count: int, node_size: int = NODE_SIZE) -> List[Tuple[int, int]]:
+    """(start, end) node ranges of each R-tree level, leaves first.
+
+    Levels are stored root first, so the leaves occupy the end of the index.
+    """
+    sizes = [count]
+    n = count
+    while True:
+        n = -(-n // node_size)
+        sizes.append(n)
+        if n == 1:
+            break
+    bounds, end = [], sum(sizes)
+    for size in sizes:
+        bounds.append((end - size, end))
+        end -= size
+    return bounds
+
+
+def build_tree(leaves: np.ndarray, node_size: int = NODE_SIZE) -> np.ndarray:
+    """Packed R-tree over `leaves` (NODE_DTYPE, offset = feature byte offset)."""
+    bounds = level_bounds(len(leaves), node_size)
+    nodes = np.zeros(bounds[0][1], dtype=NODE_DTYPE)
+    nodes[bounds[0][0] :] = leaves
+    for (child_start, child_end), (start, end) in zip(bounds, bounds[1:]):
+        firsts = np.arange(child_start, child_end, node_size)
+        children = nodes[child_start:child_end]
+        relative = firsts - child_start
+        parents = nodes[start:end]
+        for field in ("min_x", "min_y"):
+            parents[field] = np.minimum.reduceat(children[field], relative)
+        for field in ("max_x", "max_y"):
+            parents[field] = np.maximum.reduceat(children[field], relative)
+        parents["offset"] = firsts
+    return nodes
+
+
+def column_type(values: List[Any]) -> int:
+    """FlatGeobuf column type that holds every non-null value."""
+    present = [v for v in values if v is not None]
+    if present and all(isinstance(v, bool) for v in present):
+        return COLUMN_BOOL
+    if present and all(isinstance(v, int) and not isinstance(v, bool) for v in present):
+        return COLUMN_LONG
+    if present and all(
+        isinstance(v, (int, float)) and not isinstance(v, bool) for v in present
+    ):
+        return COLUMN_DOUBLE
+    if all(isinstance(v, str) for v in present):
+        return COLUMN_STRING
+    return COLUMN_JSON
+
+
+def encode_properties(
+    properties: Dict[str, Any], columns: List[Tuple[str, int]]
+) -> bytes:
+    """FlatGeobuf property bytes: (column index, value) pairs, nulls omitted."""
+    out = bytearray()
+    for i, (name, kind) in enumerate(columns):
+        value = properties.get(name)
+        if value is None:
+            continue
+        out += struct.pack("<H", i)
+        if kind == COLUMN_BOOL:
+            out += struct.pack("<B", bool(value))
+        elif kind == COLUMN_LONG:
+            out += struct.pack("<q", value)
+        elif kind == COLUMN_DOUBLE:
+            out += struct.pack("<d", value)
+        else:
+            text = value if kind == COLUMN_STRING else json.dumps(value)
+            data = text.encode("utf-8")
+            out += struct.pack("<I", len(data)) + data
+    return bytes(out)
+
+
+def decode_properties(data, columns: List[Tuple[str, int]]) -> Dict[str, Any]:
+    """Inverse of encode_properties for the column types written here."""
+    properties: Dict[str, Any] = {}
+    pos = 0
+    while pos < len(data):
+        (index,) = struct.unpack_from("<H", data, pos)
+        pos += 2
+        name, kind = columns[index]
+        if kind == COLUMN_BOOL:
+            properties[name] = bool(data[pos])
+            pos += 1
+        elif kind == COLUMN_LONG:
+            properties[name] = struct.unpack_from("<q", data, pos)[0]
+            pos += 8
+        elif kind == COLUMN_DOUBLE:
+            properties[name] = struct.unpack_from("<d", data, pos)[0]
+            pos += 8
+        else:
+            (length,) = struct.unpack_from("<I", data, pos)
+            text = bytes(data[pos + 4 : pos + 4 + length]).decode("utf-8")
+            properties[name] = text if kind == COLUMN_STRING else json.loads(text)
+            pos += 4 + length
+    return properties
+
+
+class TrackFileWriter:
+    """Streams tracks into a FlatGeobuf file; header, index and features are written on close.
+
+    FlatGeobuf puts the header and index before the features, so positions
+    are spooled to a temporary file until every track has been seen.
+
+    Usage:
+        with TrackFileWriter("tracks.fgb") as writer:
+            writer.write(track, {"name": "ANA182"})
+    """
+
+    def __init__(self, path: str, name: str = "flight_tracks"):
+        self.path = path
+        self.name = name
+        self._spool = None
+        # (spool offset, point count, bbox)
+        self._entries: List[Tuple[int, int, BBox]] = []
+        self._properties: List[Dict[str, Any]] = []
+
+    @property
+    def count(self) -> int:
+        return len(self._entries)
+
+    def open(self):
+        self._spool = tempfile.TemporaryFile(
+            dir=os.path.dirname(os.path.abspath(self.path))
+        )
+        return self
+
+    def write(self, track: Track, properties: Optional[Dict[str, Any]] = None):
+        """Adds one track (tracks with fewer than two positions are skipped)."""
+        if len(track) < 2:
+            return
+        points = np.empty(len(track), dtype=POINT_DTYPE)
+        points["lon"] = track.lon
+        points["lat"] = track.lat
+        points["alt"] = track.alt
+        points["time"] = track.time
+        self._entries.append((self._spool.tell(), len(track), track.bbox()))
+        self._spool.write(points.tobytes())
+        props = {
+            "start": int(track.time.min()),
+            "end": int(track.time.max()),
+            **(properties or {}),
+        }
+        if track.fa_flight_id and "fa_flight_id" not in props:
+            props["fa_flight_id"] = track.fa_flight_id
+        self._properties.append(props)
+
+    def _points(self, i: int) -> np.ndarray:
+        offset, count, _ = self._entries[i]
+        self._spool.seek(offset)
+        return np.frombuffer(
+            self._spool.read(count * POINT_DTYPE.itemsize), dtype=POINT_DTYPE
+        )
+
+    def _header(
+        self, columns: List[Tuple[str, int]], envelope: Optional[BBox]
+    ) -> bytes:
+        column_tables = [[(0, "str", name), (1, "u8", kind)] for name, kind in columns]
+        crs = [(0, "str", "EPSG"), (1, "i32", 4326)]
+        return _FlatBufferWriter().finish(
+            [
+                (0, "str", self.name),
+                (1, "f64s", list(envelope) if envelope else None),
+                (2, "u8", GEOMETRY_LINESTRING),
+                (3, "u8", 1),
+                (4, "u8", 1),
+                (7, "tables", column_tables),
+                (8, "u64", self.count),
+                (9, "u16", NODE_SIZE),
+                (10, "table", crs),
+            ]
+        )
+
+    def _feature(self, i: int, columns: List[Tuple[str, int]]) -> bytes:
+        points = self._points(i)
+        xy = np.empty(2 * len(points), dtype="<f8")
+        xy[0::2] = points["lon"]
+        xy[1::2] = points["lat"]
+        geometry = [
+            (1, "f64s", xy),
+            (2, "f64s", points["alt"]),
+            (3, "f64s", points["time"].astype("<f8")),
+            (6, "u8", GEOMETRY_LINESTRING),
+        ]
+        return _FlatBufferWriter().finish(
+            [
+                (0, "table", geometry),
+                (1, "u8s", encode_properties(self._properties[i], columns)),
+            ]
+        )
+
+    def close(self):
+        """Writes header, index and features in Hilbert order, then closes the file."""
+        if self._spool is None:
+            return
+        try:
+            names = list(TIME_COLUMNS)
+            for props in self._properties:
+                names.extend(k for k in props if k not in names)
+            columns = [
+                (name, column_type([p.get(name) for p in self._properties]))
+                for name in names
+            ]
+            bboxes = np.array([e[2] for e in self._entries], dtype="float64").reshape(
+                -1, 4
+            )
+            envelope = None
+            order = np.arange(self.count)
+            if self.count:
+                envelope = (
+                    float(bboxes[:, 0].min()),
+                    float(bboxes[:, 1].min()),
+                    float(bboxes[:, 2].max()),
+                    float(bboxes[:, 3].max()),
+                )
+                width = max(envelope[2] - envelope[0], 1e-9)
+                height = max(envelope[3] - envelope[1], 1e-9)
+                cx = ((bboxes[:, 0] + bboxes[:, 2]) / 2 - envelope[0]) / width
+                cy = ((bboxes[:, 1] + bboxes[:, 3]) / 2 - envelope[1]) / height
+                order = np.argsort(
+                    hilbert(
+                        np.clip(cx * 0xFFFF, 0, 0xFFFF),
+                        np.clip(cy * 0xFFFF, 0, 0xFFFF),
+                    ),
+                    kind="stable",
+                )
+
+            with open(self.path, "wb") as f:
+                header = self._header(columns, envelope)
+                f.write(MAGIC + struct.pack("<I", len(header)) + header)
+                if not self.count:
+                    return
+                features = [self._feature(int(i), columns) for i in order]
+                leaves = np.zeros(self.count, dtype=NODE_DTYPE)
+                leaves["min_x"], leaves["min_y"] = bboxes[order, 0], bboxes[order, 1]
+                leaves["max_x"], leaves["max_y"] = bboxes[order, 2], bboxes[order, 3]
+                sizes = np.array([4 + len(feature) for feature in features])
+                leaves["offset"] = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+                f.write(build_tree(leaves).tobytes())
+                for feature in features:
+                    f.write(struct.pack("<I", len(feature)) + feature)
+        finally:
+            self._spool.close()
+            self._spool = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class TrackFile:
+    """Read-only, memory-mapped view of a FlatGeobuf track file.
+
+    Raises:
+        ValueError: If the file is not FlatGeobuf, uses another major
+            version, or has no spatial index or LineString Z/M geometry.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._data = np.memmap(path, dtype="u1", mode="r")
+        if len(self._data) < len(MAGIC) + 4 or bytes(self._data[:3]) != MAGIC[:3]:
+            raise ValueError(f"{path} is not a FlatGeobuf file.")
+        if self._data[3] != FORMAT_VERSION:
+            raise ValueError(
+                f"{path} uses FlatGeobuf version {self._data[3]}; "
+                f"this reader supports version {FORMAT_VERSION}."
+            )
+        (header_size,) = struct.unpack_from("<I", self._data, len(MAGIC))
+        header_pos = len(MAGIC) + 4
+        header = _Table(
+            self._data[header_pos : header_pos + header_size],
+            struct.unpack_from("<I", self._data, header_pos)[0],
+        )
+        self.count = header.scalar(8, "u64")
+        self.node_size = header.scalar(9, "u16", NODE_SIZE)
+        if header.scalar(2, "u8") != GEOMETRY_LINESTRING:
+            raise ValueError(f"{path} does not hold LineString tracks.")
+        if self.count and not self.node_size:
+            raise ValueError(f"{path} has no spatial index.")
+        self.has_z = bool(header.scalar(3, "u8"))
+        self.has_m = bool(header.scalar(4, "u8"))
+        self.columns = [
+            (column.string(0), column.scalar(1, "u8")) for column in header.tables(7)
+        ]
+
+        index_pos = header_pos + header_size
+        self._levels: List[Tuple[int, int]] = []
+        self.nodes = np.zeros(0, dtype=NODE_DTYPE)
+        if self.count:
+            self._levels = level_bounds(self.count, self.node_size)
+            self.nodes = np.frombuffer(
+                self._data,
+                dtype=NODE_DTYPE,
+                count=self._levels[0][1],
+                offset=index_pos,
+            )
+        self._features_pos = index_pos + self.nodes.nbytes
+        self._leaf_start = self._levels[0][0] if self._levels else 0
+        self._cache: Dict[int, _Table] = {}
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _feature(self, i: int) -> _Table:
+        feature = self._cache.get(i)
+        if feature is None:
+            pos = self._features_pos + int(self.nodes[self._leaf_start + i]["offset"])
+            (size,) = struct.unpack_from("<I", self._data, pos)
+            buf = self._data[pos + 4 : pos + 4 + size]
+            feature = _Table(buf, struct.unpack_from("<I", buf, 0)[0])
+            self._cache[i] = feature
+        return feature
+
+    def properties(self, i: int) -> Dict[str, Any]:
+        """Returns the properties stored for feature `i` (without "start"/"end")."""
+        props = self._properties(i)
+        return {k: v for k, v in props.items() if k not in TIME_COLUMNS}
+
+    def _properties(self, i: int) -> Dict[str, Any]:
+        return decode_properties(self._feature(i).vector(1, "u1"), self.columns)
+
+    def query(
+        self,
+        bbox: Optional[BBox] = None,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> np.ndarray:
+        """Returns indexes of tracks whose bbox and time range intersect the query.
+
+        The R-tree is walked level by level, so only the index nodes and
+        features under matching nodes are read.
+
+        Args:
+            bbox: (min_lon, min_lat, max_lon, max_lat).
+            start: Epoch seconds; tracks ending before this are skipped.
+            end: Epoch seconds; tracks starting after this are skipped.
+        """
+        if not self.count:
+            return np.zeros(0, dtype="int64")
+        if bbox is None:
+            candidates = np.arange(self.count)
+        else:
+            min_x, min_y, max_x, max_y = bbox
+            current = np.zeros(1, dtype="int64")
+            for level in range(len(self._levels) - 1, -1, -1):
+                nodes = self.nodes[current]
+                current = current[
+                    (nodes["max_x"] >= min_x)
+                    & (nodes["min_x"] <= max_x)
+                    & (nodes["max_y"] >= min_y)
+                    & (nodes["min_y"] <= max_y)
+                ]
+                if level == 0 or not current.size:
+                    break
+                # Expand matching nodes into their children on the next level down
+                first = self.nodes["offset"][current].astype("int64")
+                children = (first[:, None] + np.arange(self.node_size)).ravel()
+                current = children[children < self._levels[level - 1][1]]
+            candidates = current - self._leaf_start if current.size else current
+        if start is None and end is None:
+            return np.sort(candidates)
+        keep = []
+        for i in candidates.tolist():
+            props = self._properties(i)
+            if start is not None and props.get("end", start) < start:
+                continue
+            if end is not None and props.get("start", end) > end:
+                continue
+            keep.append(i)
+        return np.array(sorted(keep), dtype="int64")
+
+    def read(self, i: int) -> Track:
+        """Loads track `i`."""
+        geometry = self._feature(i).table(0)
+        xy = geometry.vector(1, "<f8")
+        z = geometry.vector(2, "<f8") if self.has_z else np.zeros(len(xy) // 2)
+        m = geometry.vector(3, "<f8") if self.has_m else np.zeros(len(xy) // 2)
+        return Track(
+            xy[1::2],
+            xy[0::2],
+            z,
+            m.astype("int64"),
+            self._properties(i).get("fa_flight_id"),
+        )
+
+    def tracks(
+        self,
+        bbox: Optional[BBox] = None,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> Iterator[Tuple[Track, Dict[str, Any]]]:
+        """Yields (track, properties) for every track matching the query."""
+        for i in self.query(bbox, start, end):
+            yield self.read(int(i)), self.properties(int(i))
+
+
+def write_track_file(path: str, tracks: Iterable[Tuple[Track, Dict[str, Any]]]) -> int:
+    """Writes (track, properties) pairs to `path` as FlatGeobuf. Returns the number written."""
+    with TrackFileWriter(path) as writer:
+        for track, properties in tracks:
+            writer.write(track, properties)
+    return writer.count
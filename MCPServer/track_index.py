@@ -0,0 +1,514 @@
+"""In-memory spatial and time index over flight track segments.
+
+Answers "which flights passed through this area" without refetching and
+scanning every track. Each indexed track is simplified and split into
+segments (consecutive position pairs). Segments are bucketed into a uniform
+lat/lon grid of CELL_DEGREES cells, stored as a sorted array of cell ids,
+and carry their start/end epoch seconds for time filtering. A query looks
+up the cells overlapping the area, then runs an exact vectorized geometry
+test on only those segments:
+
+- bbox: segments intersecting a lon/lat rectangle
+- radius: segments within a distance of a point
+- corridor: segments within a distance of a polyline (e.g. an airway)
+
+Usage:
+    index = TrackIndex()
+    index.add(Track.from_aeroapi(route, fa_flight_id), {"ident": "ANA182"})
+    hits = index.query_radius(35.55, 139.78, 20, start=t0, end=t1)
+"""
+
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from MCPServer.cache import is_immutable
+from MCPServer.disk_cache import disk_cache
+from MCPServer.track import EARTH_RADIUS_M, Track
+from MCPServer.track_file import TrackFile
+
+# Tracks kept in the index; the least recently indexed are dropped first
+TRACK_INDEX_MAX_TRACKS = int(os.getenv("AEROAPI_TRACK_INDEX_MAX_TRACKS", "2000"))
+# FlatGeobuf track files (written by getMultiFlightGeoJson.py, "flatgeobuf") indexed at startup
+TRACK_FILES = [
+    p.strip() for p in os.getenv("AEROAPI_TRACK_FILES", "").split(",") if p.strip()
+]
+# Douglas-Peucker tolerance (metres) applied before indexing
+TRACK_INDEX_TOLERANCE = 100
+# Simplified tracks keep a position at least this often, so hit times stay precise
+MAX_SEGMENT_SECONDS = 300
+CELL_DEGREES = 0.5
+GRID_COLUMNS = int(360 / CELL_DEGREES)
+KM_PER_DEGREE = EARTH_RADIUS_M * math.pi / 180 / 1000
+
+_TRACK_KEY_RE = re.compile(r"/flights/([^/?]+)/track")
+
+BBox = Tuple[float, float, float, float]
+
+
+def cell_rows_cols(lon: np.ndarray, lat: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Grid row and column of each position."""
+    rows = np.floor((np.clip(lat, -90, 89.999999) + 90) / CELL_DEGREES)
+    cols = np.floor((np.mod(lon + 180, 360)) / CELL_DEGREES)
+    return rows.astype("int64"), cols.astype("int64")
+
+
+def bbox_cells(bbox: BBox) -> np.ndarray:
+    """Ids of every grid cell overlapping a (min_lon, min_lat, max_lon, max_lat) box."""
+    min_lon, min_lat, max_lon, max_lat = bbox
+    (r0, r1), (c0, c1) = cell_rows_cols(
+        np.array([min_lon, max_lon]), np.array([min_lat, max_lat])
+    )
+    rows = np.arange(r0, r1 + 1)
+    if max_lon - min_lon >= 360:
+        cols = np.arange(GRID_COLUMNS)
+    elif c1 >= c0:
+        cols = np.arange(c0, c1 + 1)
+    else:
+        # Box crosses the antimeridian
+        cols = np.concatenate((np.arange(c0, GRID_COLUMNS), np.arange(0, c1 + 1)))
+    return (rows[:, None] * GRID_COLUMNS + cols[None, :]).ravel()
+
+
+def expand_bbox(bbox: BBox, km: float) -> BBox:
+    """Grows a box by `km` on every side."""
+    min_lon, min_lat, max_lon, max_lat = bbox
+    dlat = km / KM_PER_DEGREE
+    cos_lat = max(math.cos(math.radians(max(abs(min_lat), abs(max_lat)))), 0.01)
+    dlon = km / (KM_PER_DEGREE * cos_lat)
+    return (
+        min_lon - dlon,
+        max(min_lat - dlat, -90),
+        max_lon + dlon,
+        min(max_lat + dlat, 90),
+    )
+
+
+def project_km(
+    lon: np.ndarray, lat: np.ndarray, lon0: float, lat0: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Local planar (x, y) kilometres around (lon0, lat0)."""
+    dlon = np.mod(np.asarray(lon) - lon0 + 180, 360) - 180
+    x = dlon * math.cos(math.radians(lat0)) * KM_PER_DEGREE
+    y = (np.asarray(lat) - lat0) * KM_PER_DEGREE
+    return x, y
+
+
+def point_segment_distance(px, py, ax, ay, bx, by) -> np.ndarray:
+    """Distance from points P to segments AB (broadcasting)."""
+    dx, dy = bx - ax, by - ay
+    length2 = dx * dx + dy * dy
+    t = ((px - ax) * dx + (py - ay) * dy) / np.where(length2 == 0, 1, length2)
+    t = np.clip(t, 0, 1)
+    return np.hypot(ax + t * dx - px, ay + t * dy - py)
+
+
+def segments_intersect(ax, ay, bx, by, cx, cy, dx, dy) -> np.ndarray:
+    """True where segment AB crosses or touches segment CD (broadcasting)."""
+
+    def cross(ox, oy, px, py, qx, qy):
+        return (px - ox) * (qy - oy) - (py - oy) * (qx - ox)
+
+    d1 = cross(cx, cy, dx, dy, ax, ay)
+    d2 = cross(cx, cy, dx, dy, bx, by)
+    d3 = cross(ax, ay, bx, by, cx, cy)
+    d4 = cross(ax, ay, bx, by, dx, dy)
+    # The bounding box check rules out disjoint collinear segments
+    overlap = (
+        (np.minimum(ax, bx) <= np.maximum(cx, dx))
+        & (np.minimum(cx, dx) <= np.maximum(ax, bx))
+        & (np.minimum(ay, by) <= np.maximum(cy, dy))
+        & (np.minimum(cy, dy) <= np.maximum(ay, by))
+    )
+    return (d1 * d2 <= 0) & (d3 * d4 <= 0) & overlap
+
+
+def segment_distance(ax, ay, bx, by, cx, cy, dx, dy) -> np.ndarray:
+    """Distance between segments AB and CD (broadcasting)."""
+    distance = np.minimum.reduce(
+        [
+            point_segment_distance(ax, ay, cx, cy, dx, dy),
+            point_segment_distance(bx, by, cx, cy, dx, dy),
+            point_segment_distance(cx, cy, ax, ay, bx, by),
+            point_segment_distance(dx, dy, ax, ay, bx, by),
+        ]
+    )
+    return np.where(segments_intersect(ax, ay, bx, by, cx, cy, dx, dy), 0, distance)
+
+
+class TrackIndex:
+    """Grid-bucketed segments of many tracks, with per-segment time ranges.
+
+    Tracks are added and replaced by fa_flight_id. The flat segment arrays
+    and the sorted cell index are rebuilt lazily on the first query after a
+    change. Segments that cross the antimeridian are not indexed.
+    """
+
+    def __init__(
+        self,
+        max_tracks: int = TRACK_INDEX_MAX_TRACKS,
+        tolerance: float = TRACK_INDEX_TOLERANCE,
+    ):
+        self.max_tracks = max_tracks
+        self.tolerance = tolerance
+        # fa_flight_id -> (track, properties, indexed_at, final)
+        self._tracks: "OrderedDict[str, Tuple[Track, Dict[str, Any], float, bool]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._properties: List[Dict[str, Any]] = []
+        self._segments: Dict[str, np.ndarray] = {}
+        self._cells = np.zeros(0, dtype="int64")
+        self._cell_segments = np.zeros(0, dtype="int64")
+
+    def __len__(self) -> int:
+        return len(self._tracks)
+
+    def __contains__(self, fa_flight_id: str) -> bool:
+        return fa_flight_id in self._tracks
+
+    def add(
+        self,
+        track: Track,
+        properties: Optional[Dict[str, Any]] = None,
+        final: bool = False,
+    ):
+        """Indexes (or replaces) a track under its fa_flight_id.
+
+        Args:
+            track: The track; it is simplified by `tolerance` metres first.
+            properties: Returned with every hit (e.g. ident, origin, destination).
+            final: True if the track is complete and never needs refreshing.
+        """
+        if not track.fa_flight_id or len(track) < 2:
+            return
+        if self.tolerance:
+            track = self.simplify(track)
+        properties = {"fa_flight_id": track.fa_flight_id, **(properties or {})}
+        with self._lock:
+            self._tracks.pop(track.fa_flight_id, None)
+            self._tracks[track.fa_flight_id] = (track, properties, time.time(), final)
+            while len(self._tracks) > self.max_tracks:
+                self._tracks.popitem(last=False)
+            self._dirty = True
+
+    def simplify(self, track: Track) -> Track:
+        """Douglas-Peucker simplification that still keeps a position every MAX_SEGMENT_SECONDS."""
+        simplified = track.simplify(self.tolerance)
+        if not track.time.any():
+            return simplified
+        keep = np.isin(track.time, simplified.time)
+        buckets = track.time // MAX_SEGMENT_SECONDS
+        keep[1:] |= buckets[1:] != buckets[:-1]
+        return track.take(np.flatnonzero(keep))
+
+    def add_response(
+        self,
+        data: Dict[str, Any],
+        fa_flight_id: str,
+        properties: Optional[Dict[str, Any]] = None,
+        final: bool = False,
+    ):
+        """Indexes a `flights/{id}/track` response."""
+        self.add(Track.from_aeroapi(data, fa_flight_id), properties, final)
+
+    def needs_refresh(self, fa_flight_id: str, max_age: float) -> bool:
+        """True if the track is missing, or not final and indexed over `max_age` seconds ago."""
+        entry = self._tracks.get(fa_flight_id)
+        if entry is None:
+            return True
+        _, _, indexed_at, final = entry
+        return not final and time.time() - indexed_at > max_age
+
+    def _rebuild(self):
+        """Rebuilds the flat segment arrays and the sorted cell index."""
+        lon0, lat0, lon1, lat1, t0, t1, owner = [], [], [], [], [], [], []
+        for i, (track, _, _, _) in enumerate(self._tracks.values()):
+            lon0.append(track.lon[:-1])
+            lat0.append(track.lat[:-1])
+            lon1.append(track.lon[1:])
+            lat1.append(track.lat[1:])
+            t0.append(track.time[:-1])
+            t1.append(track.time[1:])
+            owner.append(np.full(len(track) - 1, i, dtype="int64"))
+
+        def flat(parts, dtype):
+            return np.concatenate(parts) if parts else np.zeros(0, dtype=dtype)
+
+        segments = {
+            "lon0": flat(lon0, "float64"),
+            "lat0": flat(lat0, "float64"),
+            "lon1": flat(lon1, "float64"),
+            "lat1": flat(lat1, "float64"),
+            "t0": flat(t0, "int64"),
+            "t1": flat(t1, "int64"),
+            "track": flat(owner, "int64"),
+        }
+        keep = np.abs(segments["lon1"] - segments["lon0"]) <= 180
+        segments = {name: column[keep] for name, column in segments.items()}
+
+        rows0, cols0 = cell_rows_cols(segments["lon0"], segments["lat0"])
+        rows1, cols1 = cell_rows_cols(segments["lon1"], segments["lat1"])
+        r_lo, r_hi = np.minimum(rows0, rows1), np.maximum(rows0, rows1)
+        c_lo, c_hi = np.minimum(cols0, cols1), np.maximum(cols0, cols1)
+        widths = c_hi - c_lo + 1
+        counts = widths * (r_hi - r_lo + 1)
+        # One (cell, segment) entry per cell in each segment's bounding box
+        segment_ids = np.repeat(np.arange(len(counts)), counts)
+        offsets = np.arange(counts.sum()) - np.repeat(
+            np.cumsum(counts) - counts, counts
+        )
+        width = widths[segment_ids]
+        cells = (r_lo[segment_ids] + offsets // width) * GRID_COLUMNS + (
+            c_lo[segment_ids] + offsets % width
+        )
+        order = np.argsort(cells, kind="stable")
+
+        self._properties = [entry[1] for entry in self._tracks.values()]
+        self._segments = segments
+        self._cells = cells[order]
+        self._cell_segments = segment_ids[order]
+        self._dirty = False
+
+    def _candidates(
+        self, bbox: BBox, start: Optional[int], end: Optional[int]
+    ) -> np.ndarray:
+        """Segments in the cells overlapping `bbox` whose time range meets [start, end]."""
+        if self._dirty:
+            self._rebuild()
+        cells = bbox_cells(bbox)
+        lo = np.searchsorted(self._cells, cells, side="left")
+        hi = np.searchsorted(self._cells, cells, side="right")
+        hits = [self._cell_segments[a:b] for a, b in zip(lo, hi) if b > a]
+        if not hits:
+            return np.zeros(0, dtype="int64")
+        candidates = np.unique(np.concatenate(hits))
+        segments = self._segments
+        if start is not None:
+            candidates = candidates[
+                np.maximum(segments["t0"], segments["t1"])[candidates] >= start
+            ]
+        if end is not None:
+            candidates = candidates[
+                np.minimum(segments["t0"], segments["t1"])[candidates] <= end
+            ]
+        return candidates
+
+    def _hits(
+        self, segment_ids: np.ndarray, distances: Optional[np.ndarray] = None
+    ) -> List[Dict[str, Any]]:
+        """Groups matching segments by track: first/last time and closest distance."""
+        if not segment_ids.size:
+            return []
+        # A segment can match several corridor legs; keep its closest distance
+        if distances is not None:
+            order = np.lexsort((distances, segment_ids))
+            segment_ids, distances = segment_ids[order], distances[order]
+            first_of = np.concatenate(([True], segment_ids[1:] != segment_ids[:-1]))
+            segment_ids, distances = segment_ids[first_of], distances[first_of]
+        else:
+            segment_ids = np.unique(segment_ids)
+        segments = self._segments
+        owners = segments["track"][segment_ids]
+        tracks, inverse = np.unique(owners, return_inverse=True)
+        inverse = inverse.ravel()
+        first = np.full(len(tracks), np.iinfo("int64").max)
+        last = np.full(len(tracks), np.iinfo("int64").min)
+        np.minimum.at(first, inverse, segments["t0"][segment_ids])
+        np.maximum.at(last, inverse, segments["t1"][segment_ids])
+        counts = np.bincount(inverse, minlength=len(tracks))
+        closest = None
+        if distances is not None:
+            closest = np.full(len(tracks), np.inf)
+            np.minimum.at(closest, inverse, distances)
+
+        results = []
+        for n, t in enumerate(tracks.tolist()):
+            hit = {
+                **self._properties[t],
+                "first_seen": int(first[n]),
+                "last_seen": int(last[n]),
+                "segments": int(counts[n]),
+            }
+            if closest is not None:
+                hit["min_distance_km"] = round(float(closest[n]), 2)
+            results.append(hit)
+        results.sort(key=lambda hit: hit["first_seen"])
+        return results
+
+    def query_bbox(
+        self, bbox: BBox, start: Optional[int] = None, end: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Tracks with a segment crossing the (min_lon, min_lat, max_lon, max_lat) box.
+
+        The box must not cross the antimeridian (min_lon <= max_lon).
+
+        Args:
+            bbox: The area in degrees.
+            start: Epoch seconds; segments that ended earlier are ignored.
+            end: Epoch seconds; segments that started later are ignored.
+
+        Returns:
+            One hit per track, ordered by first_seen: its properties plus
+            "first_seen"/"last_seen" (epoch seconds of the matching segments)
+            and "segments".
+        """
+        with self._lock:
+            ids = self._candidates(bbox, start, end)
+            s = self._segments
+            lon0, lat0 = s["lon0"][ids], s["lat0"][ids]
+            lon1, lat1 = s["lon1"][ids], s["lat1"][ids]
+            min_lon, min_lat, max_lon, max_lat = bbox
+
+            def inside(lon, lat):
+                return (
+                    (lon >= min_lon)
+                    & (lon <= max_lon)
+                    & (lat >= min_lat)
+                    & (lat <= max_lat)
+                )
+
+            match = inside(lon0, lat0) | inside(lon1, lat1)
+            corners = [
+                (min_lon, min_lat, max_lon, min_lat),
+                (max_lon, min_lat, max_lon, max_lat),
+                (max_lon, max_lat, min_lon, max_lat),
+                (min_lon, max_lat, min_lon, min_lat),
+            ]
+            for cx, cy, dx, dy in corners:
+                match |= segments_intersect(lon0, lat0, lon1, lat1, cx, cy, dx, dy)
+            return self._hits(ids[match])
+
+    def query_radius(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: float,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Tracks that came within `radius_km` of a point.
+
+        Returns:
+            Hits as for query_bbox, plus "min_distance_km".
+        """
+        with self._lock:
+            ids = self._candidates(
+                expand_bbox((lon, lat, lon, lat), radius_km), start, end
+            )
+            s = self._segments
+            ax, ay = project_km(s["lon0"][ids], s["lat0"][ids], lon, lat)
+            bx, by = project_km(s["lon1"][ids], s["lat1"][ids], lon, lat)
+            distances = point_segment_distance(0.0, 0.0, ax, ay, bx, by)
+            match = distances <= radius_km
+            return self._hits(ids[match], distances[match])
+
+    def query_corridor(
+        self,
+        path: Sequence[Sequence[float]],
+        width_km: float,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Tracks that came within `width_km` of a polyline.
+
+        Args:
+            path: [[lon, lat], ...] with at least two points.
+            width_km: Half-width of the corridor.
+
+        Returns:
+            Hits as for query_bbox, plus "min_distance_km" (to the centre line).
+        """
+        with self._lock:
+            matched, matched_distances = [], []
+            for (lon_a, lat_a), (lon_b, lat_b) in zip(path, path[1:]):
+                leg = (
+                    min(lon_a, lon_b),
+                    min(lat_a, lat_b),
+                    max(lon_a, lon_b),
+                    max(lat_a, lat_b),
+                )
+                ids = self._candidates(expand_bbox(leg, width_km), start, end)
+                s = self._segments
+                lon0, lat0 = (lon_a + lon_b) / 2, (lat_a + lat_b) / 2
+                ax, ay = project_km(s["lon0"][ids], s["lat0"][ids], lon0, lat0)
+                bx, by = project_km(s["lon1"][ids], s["lat1"][ids], lon0, lat0)
+                cx, cy = project_km(lon_a, lat_a, lon0, lat0)
+                dx, dy = project_km(lon_b, lat_b, lon0, lat0)
+                distances = segment_distance(ax, ay, bx, by, cx, cy, dx, dy)
+                match = distances <= width_km
+                matched.append(ids[match])
+                matched_distances.append(distances[match])
+            if not matched:
+                return []
+            return self._hits(
+                np.concatenate(matched), np.concatenate(matched_distances)
+            )
+
+    def load_from_disk(self, limit: int = TRACK_INDEX_MAX_TRACKS) -> int:
+        """Indexes the most recently used tracks in the on-disk response store.
+
+        Returns:
+            Number of tracks indexed.
+        """
+        loaded = 0
+        for key, body in disk_cache.iter_recent(limit):
+            match = _TRACK_KEY_RE.search(key)
+            if not match:
+                continue
+            try:
+                data = json.loads(body)
+            except ValueError as e:
+                logging.warning(f"Track index: skipping {key}: {e}")
+                continue
+            fa_flight_id = match.group(1)
+            self.add_response(
+                data,
+                fa_flight_id,
+                {"ident": fa_flight_id.split("-")[0]},
+                final=is_immutable(key),
+            )
+            loaded += 1
+        return loaded
+
+    def load_track_file(self, path: str, bbox: Optional[BBox] = None) -> int:
+        """Indexes the tracks of a track file, optionally only those inside `bbox`.
+
+        Returns:
+            Number of tracks indexed (0 if the file cannot be read).
+        """
+        try:
+            track_file = TrackFile(path)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Track index: skipping {path}: {e}")
+            return 0
+        loaded = 0
+        for track, properties in track_file.tracks(bbox):
+            if track.fa_flight_id and len(track) >= 2:
+                self.add(track, properties)
+                loaded += 1
+        return loaded
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the number of indexed tracks and segments."""
+        with self._lock:
+            if self._dirty:
+                self._rebuild()
+            return {
+                "tracks": len(self._tracks),
+                "segments": len(self._segments.get("t0", [])),
+                "cells": int(len(np.unique(self._cells))),
+            }
+
+
+# Process-wide index shared by the MCP tools
+track_index = TrackIndex()
@@ -0,0 +1,87 @@
+"""Background cache warming for hot airports.
+
+The scheduler runs a list of warm-up jobs on a fixed interval, aligned to
+the interval boundary so it refreshes data right when the default rolling
+window (truncated to the minute) moves on. Its requests use BACKGROUND
+priority, so interactive calls are served first by the rate limiter and the
+jobs can only spend the background share of the monthly quota. Interactive
+calls never join a warm-up's in-flight fetch, so they do not inherit either.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from MCPServer.rate_limit import BACKGROUND, request_priority
+
+# Comma-separated airport codes kept warm; empty (the default) disables the
+# scheduler, since every cycle spends paid requests whether or not anyone asks
+WARM_AIRPORTS = [
+    code.strip().upper()
+    for code in os.getenv("AEROAPI_WARM_AIRPORTS", "").split(",")
+    if code.strip()
+]
+WARM_INTERVAL = int(os.getenv("AEROAPI_WARM_INTERVAL", "60"))
+# Seconds after each interval boundary at which a cycle starts
+WARM_OFFSET = float(os.getenv("AEROAPI_WARM_OFFSET", "1"))
+
+WarmJob = Tuple[str, Callable[[], Awaitable[object]]]
+
+
+class WarmScheduler:
+    """Runs warm-up jobs every `interval` seconds in a background task."""
+
+    def __init__(
+        self,
+        jobs: Callable[[], List[WarmJob]],
+        interval: int = WARM_INTERVAL,
+        offset: float = WARM_OFFSET,
+    ):
+        self.jobs = jobs
+        self.interval = max(1, interval)
+        self.offset = offset
+        self.cycles = 0
+        self.failures = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self):
+        """Runs every job once, one after another."""
+        started = time.monotonic()
+        for name, job in self.jobs():
+            try:
+                await job()
+            except Exception as e:
+                self.failures += 1
+                logging.warning(f"Warm-up job {name} failed: {e}")
+        self.cycles += 1
+        logging.info(
+            f"Warm-up cycle {self.cycles} finished in {time.monotonic() - started:.2f}s"
+        )
+
+    async def run(self):
+        """Runs cycles forever, starting each just after an interval boundary."""
+        # The task has its own context, so this only affects warm-up requests
+        request_priority.set(BACKGROUND)
+        while True:
+            await self.run_once()
+            now = time.time()
+            next_run = (now // self.interval + 1) * self.interval + self.offset
+            await asyncio.sleep(max(0.0, next_run - now))
+
+    def start(self):
+        """Starts the scheduler task on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        """Cancels the scheduler task and waits for it to finish."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
@@ -0,0 +1,353 @@
+"""Offline stand-in for AeroAPI.
+
+Serves the endpoints the tools use with AeroAPI-shaped responses, either
+replayed from recorded JSONL fixtures or generated deterministically, with
+`links.next` pagination, configurable latency, random 5xx errors and
+periodic 429 bursts. Point the client at it with AEROAPI_BASE_URL.
+
+Usage:
+    python -m benchmarks.mock_aeroapi --port 8900 --latency-ms 80 --error-rate 0.02
+    AEROAPI_BASE_URL=http://127.0.0.1:8900 python MCPServer/server.py
+
+Fixture files hold one recorded response per line:
+    {"path": "/aeroapi/airports/RJTT/flights/departures", "body": {...}}
+Records of every fixture for the same path are merged and re-paginated.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlencode
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from MCPServer.flight_store import board_time
+
+LIST_KEYS = ("departures", "arrivals", "scheduled", "flights")
+
+AIRPORTS = {
+    "RJTT": ("HND", "Asia/Tokyo"),
+    "RJAA": ("NRT", "Asia/Tokyo"),
+    "RJBB": ("KIX", "Asia/Tokyo"),
+    "RJCC": ("CTS", "Asia/Tokyo"),
+    "RJFF": ("FUK", "Asia/Tokyo"),
+    "ROAH": ("OKA", "Asia/Tokyo"),
+    "RKSI": ("ICN", "Asia/Seoul"),
+    "KLAX": ("LAX", "America/Los_Angeles"),
+}
+AIRLINES = ("ANA", "JAL", "SKY", "APJ", "JJP", "KAL")
+# Largest gap between a slot and its flight's board time (runway time plus delay)
+SLOT_MARGIN = timedelta(hours=1)
+
+
+def iso(dt: datetime) -> str:
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def parse_time(value: Optional[str], default: datetime) -> datetime:
+    if not value:
+        return default
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def airport_ref(code: str) -> Dict[str, Any]:
+    iata, tz = AIRPORTS.get(code, (code[-3:], "UTC"))
+    return {
+        "code": code,
+        "code_icao": code,
+        "code_iata": iata,
+        "timezone": tz,
+        "name": f"{code} Airport",
+        "city": code,
+    }
+
+
+def synthetic_flight(airport: str, direction: str, when: datetime) -> Dict[str, Any]:
+    """Builds a deterministic AeroAPI-like flight record for a board slot."""
+    seed = int(hashlib.md5(f"{airport}{iso(when)}".encode()).hexdigest()[:8], 16)
+    others = [code for code in AIRPORTS if code != airport]
+    other = others[seed % len(others)]
+    airline = AIRLINES[seed % len(AIRLINES)]
+    number = str(100 + seed % 900)
+    origin, destination = (
+        (airport, other) if direction == "departures" else (other, airport)
+    )
+    duration = timedelta(minutes=60 + seed % 240)
+    if direction == "departures":
+        out = when
+    else:
+        out = when - duration
+    arrive = out + duration
+    delay = timedelta(minutes=(seed >> 8) % 30)
+    ident = f"{airline}{number}"
+    return {
+        "ident": ident,
+        "ident_icao": ident,
+        "fa_flight_id": f"{ident}-{int(out.timestamp())}-schedule-{seed % 10000:04d}",
+        "operator": airline,
+        "flight_number": number,
+        "registration": f"JA{seed % 900 + 100}A",
+        "aircraft_type": ("B788", "A320", "B738", "A359")[seed % 4],
+        "origin": airport_ref(origin),
+        "destination": airport_ref(destination),
+        "cancelled": False,
+        "diverted": False,
+        "status": "Arrived / Gate Arrival",
+        "progress_percent": 100,
+        "scheduled_out": iso(out),
+        "estimated_out": iso(out + delay),
+        "actual_out": iso(out + delay),
+        "scheduled_off": iso(out + timedelta(minutes=15)),
+        "actual_off": iso(out + delay + timedelta(minutes=15)),
+        "scheduled_on": iso(arrive - timedelta(minutes=10)),
+        "actual_on": iso(arrive + delay - timedelta(minutes=10)),
+        "scheduled_in": iso(arrive),
+        "estimated_in": iso(arrive + delay),
+        "actual_in": iso(arrive + delay),
+        "gate_origin": str(seed % 70 + 1),
+        "gate_destination": str((seed >> 4) % 70 + 1),
+        "route_distance": int(duration.total_seconds() / 60 * 8),
+    }
+
+
+def synthetic_track(fa_flight_id: str, points: int) -> Dict[str, Any]:
+    """Builds a deterministic track between two airports."""
+    seed = int(hashlib.md5(fa_flight_id.encode()).hexdigest()[:8], 16)
+    lat0, lon0 = 35.55, 139.78
+    lat1, lon1 = lat0 + (seed % 200 - 100) / 20, lon0 + ((seed >> 8) % 200 - 100) / 20
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=seed % 10000)
+    positions = []
+    for i in range(points):
+        f = i / max(1, points - 1)
+        positions.append(
+            {
+                "latitude": lat0 + (lat1 - lat0) * f,
+                "longitude": lon0 + (lon1 - lon0) * f,
+                "altitude": int(350 * min(1.0, 4 * f, 4 * (1 - f))),
+                "groundspeed": 450,
+                "heading": 90,
+                "timestamp": iso(start + timedelta(seconds=30 * i)),
+            }
+        )
+    return {"positions": positions, "actual_distance": None}
+
+
+class MockAeroAPI:
+    """Mock server state: configuration, fixtures and counters."""
+
+    def __init__(
+        self,
+        latency_ms: float = 50.0,
+        jitter_ms: float = 20.0,
+        error_rate: float = 0.0,
+        burst_every: float = 0.0,
+        burst_length: float = 0.0,
+        retry_after: int = 1,
+        page_size: int = 15,
+        flights_per_hour: int = 40,
+        track_points: int = 400,
+        fixtures: Optional[List[str]] = None,
+        seed: int = 0,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.burst_every = burst_every
+        self.burst_length = burst_length
+        self.retry_after = retry_after
+        self.page_size = page_size
+        self.flights_per_hour = flights_per_hour
+        self.track_points = track_points
+        self.random = random.Random(seed)
+        self.started = time.monotonic()
+        self.fixtures: Dict[str, Dict[str, Any]] = {}
+        for path in fixtures or []:
+            self.load_fixtures(path)
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.stats = defaultdict(int)
+
+    def load_fixtures(self, path: str):
+        """Loads recorded responses; list records for the same path are merged."""
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                key = entry["path"].split("?", 1)[0]
+                body = entry["body"]
+                existing = self.fixtures.get(key)
+                list_key = next((k for k in LIST_KEYS if k in body), None)
+                if existing is not None and list_key and list_key in existing:
+                    existing[list_key].extend(body[list_key])
+                else:
+                    self.fixtures[key] = dict(body)
+
+    def in_burst(self) -> bool:
+        if self.burst_every <= 0:
+            return False
+        return (time.monotonic() - self.started) % self.burst_every < self.burst_length
+
+    def board(self, airport: str, direction: str, params) -> List[Dict[str, Any]]:
+        """Flights whose board time falls in [start, end], like AeroAPI.
+
+        Boards are filtered on the runway time (actual, else estimated, else
+        scheduled) via flight_store.board_time, so stored and live windows and
+        successive track_board polls see the same flights.
+        """
+        now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+        start = parse_time(params.get("start"), now - timedelta(hours=1))
+        end = parse_time(params.get("end"), now + timedelta(hours=1))
+        step = timedelta(seconds=3600 / max(1, self.flights_per_hour))
+        # Align slots to the step so overlapping windows return the same flights
+        epoch = datetime(2000, 1, 1, tzinfo=timezone.utc)
+        slot = epoch + ((start - SLOT_MARGIN - epoch) // step) * step
+        start_epoch, end_epoch = start.timestamp(), end.timestamp()
+        flights = []
+        while slot <= end + SLOT_MARGIN:
+            flight = synthetic_flight(airport, direction, slot)
+            when = board_time(flight, direction)
+            if when is not None and start_epoch <= when <= end_epoch:
+                flights.append((when, flight))
+            slot += step
+        flights.sort(key=lambda pair: pair[0])
+        return [flight for _, flight in flights]
+
+    def paginate(
+        self, request: Request, list_key: str, records: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        offset = int(request.query_params.get("cursor", "0"))
+        page = records[offset : offset + self.page_size]
+        next_link = None
+        if offset + self.page_size < len(records):
+            query = dict(request.query_params)
+            query["cursor"] = str(offset + self.page_size)
+            next_link = f"{request.url.path}?{urlencode(query)}"
+        self.stats["pages"] += 1
+        self.stats["records"] += len(page)
+        return {
+            list_key: page,
+            "links": {"next": next_link} if next_link else None,
+            "num_pages": 1,
+        }
+
+    def respond(self, request: Request, path: str) -> Dict[str, Any]:
+        """Returns the body for an AeroAPI path (without the /aeroapi prefix)."""
+        fixture = self.fixtures.get(f"/aeroapi/{path}")
+        if fixture is not None:
+            list_key = next((k for k in LIST_KEYS if k in fixture), None)
+            if list_key:
+                return self.paginate(request, list_key, fixture[list_key])
+            return fixture
+
+        parts = path.strip("/").split("/")
+        params = request.query_params
+        if len(parts) == 4 and parts[0] == "airports" and parts[2] == "flights":
+            airport, direction = parts[1].upper(), parts[3]
+            return self.paginate(
+                request, direction, self.board(airport, direction, params)
+            )
+        if parts[0] == "schedules" and len(parts) == 3:
+            airport = (params.get("origin") or "RJTT").upper()
+            flights = self.board(
+                airport, "departures", {"start": parts[1], "end": parts[2]}
+            )
+            return self.paginate(request, "scheduled", flights)
+        if parts[0] == "flights" and len(parts) == 3 and parts[2] == "track":
+            return synthetic_track(parts[1], self.track_points)
+        if parts[0] == "airports" and len(parts) == 2:
+            return {
+                **airport_ref(parts[1].upper()),
+                "latitude": 35.55,
+                "longitude": 139.78,
+            }
+        if parts[0] == "flights" and len(parts) == 2:
+            now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+            flight = synthetic_flight("RJTT", "departures", now)
+            flight["ident"] = parts[1]
+            return self.paginate(request, "flights", [flight])
+        return None
+
+    def app(self) -> FastAPI:
+        app = FastAPI()
+
+        @app.get("/_stats")
+        async def stats():
+            return dict(self.stats)
+
+        @app.post("/_reset")
+        async def reset():
+            self.reset_stats()
+            return {}
+
+        @app.get("/aeroapi/{path:path}")
+        async def aeroapi(path: str, request: Request):
+            self.stats["requests"] += 1
+            delay = max(0.0, self.random.gauss(self.latency_ms, self.jitter_ms))
+            await asyncio.sleep(delay / 1000)
+            if self.in_burst():
+                self.stats["throttled"] += 1
+                return JSONResponse(
+                    {"title": "Too Many Requests"},
+                    status_code=429,
+                    headers={"Retry-After": str(self.retry_after)},
+                )
+            if self.random.random() < self.error_rate:
+                self.stats["errors"] += 1
+                return JSONResponse({"title": "Service Unavailable"}, status_code=503)
+            body = self.respond(request, path)
+            if body is None:
+                return JSONResponse({"title": "Not Found"}, status_code=404)
+            return body
+
+        return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline AeroAPI stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--burst-every", type=float, default=0.0, help="seconds between 429 bursts"
+    )
+    parser.add_argument(
+        "--burst-length", type=float, default=0.0, help="seconds each 429 burst lasts"
+    )
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--page-size", type=int, default=15)
+    parser.add_argument("--flights-per-hour", type=int, default=40)
+    parser.add_argument("--fixtures", nargs="*", default=[])
+    args = parser.parse_args()
+
+    mock = MockAeroAPI(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        burst_every=args.burst_every,
+        burst_length=args.burst_length,
+        retry_after=args.retry_after,
+        page_size=args.page_size,
+        flights_per_hour=args.flights_per_hour,
+        fixtures=args.fixtures,
+    )
+    uvicorn.run(mock.app(), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
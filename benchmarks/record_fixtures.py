@@ -0,0 +1,47 @@
+"""Records live AeroAPI responses as fixtures for the mock server.
+
+Requires FLIGHTAWARE_API_KEY. Every page of each path is appended to the
+output file as {"path": ..., "body": ...}.
+
+Usage:
+    python -m benchmarks.record_fixtures fixtures.jsonl airports/RJTT/flights/departures airports/RJAA
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from urllib.parse import urlsplit
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from MCPServer.aeroapi_client import AeroAPIError, build_url, fetch_json
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record AeroAPI fixtures")
+    parser.add_argument("output")
+    parser.add_argument("paths", nargs="+", help="paths relative to the AeroAPI root")
+    parser.add_argument("--max-pages", type=int, default=10)
+    args = parser.parse_args()
+
+    with open(args.output, "a", encoding="utf-8") as f:
+        for path in args.paths:
+            url = build_url(path)
+            for _ in range(args.max_pages):
+                try:
+                    body = fetch_json(url)
+                except AeroAPIError as e:
+                    print(f"{path}: {e}")
+                    break
+                record = {"path": urlsplit(url).path, "body": body}
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                next_link = (body.get("links") or {}).get("next")
+                if not next_link:
+                    break
+                url = build_url(next_link)
+            print(f"Recorded {path}")
+
+
+if __name__ == "__main__":
+    main()
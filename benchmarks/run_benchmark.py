@@ -0,0 +1,285 @@
+"""Load benchmark for the MCP tools and /api/agent against the mock AeroAPI.
+
+Starts the mock AeroAPI in-process, points the client at it and drives
+either the MCP tools (in-memory MCP session) or the agent API (MCP session
+pool, LLM replaced by a fixed-latency stub) at each concurrency level.
+Reports p50/p95/p99 latency, throughput and AeroAPI pages per second.
+
+Usage:
+    python -m benchmarks.run_benchmark --scenario mcp --concurrency 1,8,32 --requests 200
+    python -m benchmarks.run_benchmark --scenario agent --llm-latency-ms 800 --pool-size 4
+    python -m benchmarks.run_benchmark --latency-ms 120 --error-rate 0.05 --burst-every 20 --burst-length 2
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, Dict, List
+
+import numpy as np
+import uvicorn
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.mock_aeroapi import AIRPORTS, MockAeroAPI
+
+BOARD_TOOLS = ("get_past_departures", "get_past_arrivals")
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_mock(mock: MockAeroAPI, port: int) -> uvicorn.Server:
+    """Runs the mock server in a daemon thread and waits until it accepts requests."""
+    server = uvicorn.Server(
+        uvicorn.Config(mock.app(), host="127.0.0.1", port=port, log_level="warning")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def configure_client(base_url: str, args):
+    """Points the AeroAPI client at the mock; must run before MCPServer is imported."""
+    os.environ["AEROAPI_BASE_URL"] = base_url
+    os.environ.setdefault("FLIGHTAWARE_API_KEY", "benchmark")
+    os.environ["AEROAPI_DISK_CACHE_PATH"] = ""
+    os.environ["AEROAPI_FLIGHT_STORE_PATH"] = ""
+    os.environ["AEROAPI_WARM_AIRPORTS"] = ""
+    os.environ["AEROAPI_RATE_LIMIT"] = str(args.rate_limit)
+    os.environ["AEROAPI_RATE_BURST"] = str(max(1, int(args.rate_limit)))
+    os.environ["MCP_POOL_SIZE"] = str(args.pool_size)
+
+
+def tool_arguments(i: int, keys: int) -> Dict[str, Any]:
+    """Arguments for the i-th call; `keys` distinct windows control the cache hit ratio."""
+    k = i % keys
+    airports = list(AIRPORTS)
+    day = datetime.now(timezone.utc) - timedelta(days=1 + (k // 24) % 7)
+    hour = k % 24
+    return {
+        "airport_code": airports[k % len(airports)],
+        "year": day.year,
+        "month": day.month,
+        "day": day.day,
+        "start_time": f"{hour:02d}:00",
+        "end_time": f"{hour:02d}:59",
+        "fetch_all": True,
+    }
+
+
+def is_error(text: str) -> bool:
+    return text.startswith("Failed") or text.startswith("Input Error")
+
+
+async def run_level(
+    call: Callable[[int], Awaitable[bool]],
+    requests: int,
+    concurrency: int,
+    mock: MockAeroAPI,
+) -> Dict[str, Any]:
+    """Runs `requests` calls with at most `concurrency` in flight."""
+    mock.reset_stats()
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one(i: int):
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                ok = await call(i)
+            except Exception:
+                ok = False
+            latencies.append(time.perf_counter() - started)
+            if not ok:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - started
+    ms = np.array(latencies) * 1000
+    return {
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": errors,
+        "elapsed_s": elapsed,
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "requests_per_s": requests / elapsed,
+        "api_requests": mock.stats["requests"],
+        "pages": mock.stats["pages"],
+        "pages_per_s": mock.stats["pages"] / elapsed,
+        "throttled": mock.stats["throttled"],
+    }
+
+
+async def bench_mcp(args, mock: MockAeroAPI) -> List[Dict[str, Any]]:
+    from mcp.shared.memory import create_connected_server_and_client_session
+
+    from MCPServer.cache import response_cache
+    from MCPServer import server
+
+    results = []
+    async with create_connected_server_and_client_session(
+        server.mcp._mcp_server
+    ) as client:
+
+        async def call(i: int) -> bool:
+            tool = BOARD_TOOLS[i % len(BOARD_TOOLS)]
+            result = await client.call_tool(tool, tool_arguments(i, args.keys))
+            text = result.content[0].text if result.content else ""
+            return not result.isError and not is_error(text)
+
+        for concurrency in args.concurrency:
+            if not args.warm:
+                response_cache.clear()
+            results.append(await run_level(call, args.requests, concurrency, mock))
+    return results
+
+
+class StubAgent:
+    """Stands in for the LLM agent: plan, one tool call, summarize."""
+
+    def __init__(self, pool, llm_latency: float, keys: int):
+        self.pool = pool
+        self.llm_latency = llm_latency
+        self.keys = keys
+        self.calls = 0
+
+    async def ainvoke(self, inputs: Dict[str, Any], config=None):
+        i = self.calls
+        self.calls += 1
+        await asyncio.sleep(self.llm_latency)
+        result = await self.pool.call_tool(
+            BOARD_TOOLS[i % len(BOARD_TOOLS)], tool_arguments(i, self.keys)
+        )
+        text = result.content[0].text if result.content else ""
+        await asyncio.sleep(self.llm_latency)
+        return {"messages": [SimpleNamespace(content=text[:200])]}
+
+
+async def bench_agent(args, mock: MockAeroAPI) -> List[Dict[str, Any]]:
+    import httpx
+
+    import Agent.agent as agent_module
+    from Agent.mcp_pool import MCPSessionPool
+
+    pool = MCPSessionPool(size=args.pool_size)
+    await pool.start()
+    stub = StubAgent(pool, args.llm_latency_ms / 1000, args.keys)
+    # The app lifespan (real LLM) is skipped: ASGITransport does not run it
+    agent_module.mcp_pool = pool
+    agent_module.agent = stub
+
+    results = []
+    transport = httpx.ASGITransport(app=agent_module.app)
+    try:
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://benchmark", timeout=300
+        ) as client:
+
+            async def call(i: int) -> bool:
+                airport = list(AIRPORTS)[i % args.keys % len(AIRPORTS)]
+                body = {"input": f"{airport}の出発便 #{i % args.keys}"}
+                if not args.agent_cache:
+                    body["no_cache"] = True
+                response = await client.post("/api/agent", json=body)
+                return response.status_code == 200 and not is_error(
+                    response.json().get("output", "")
+                )
+
+            for concurrency in args.concurrency:
+                results.append(await run_level(call, args.requests, concurrency, mock))
+    finally:
+        await pool.close()
+    return results
+
+
+def print_report(scenario: str, results: List[Dict[str, Any]]):
+    header = f"{'conc':>5} {'reqs':>6} {'err':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>8} {'pages/s':>8} {'api req':>8} {'429':>5}"
+    print(f"\n[{scenario}]")
+    print(header)
+    for r in results:
+        print(
+            f"{r['concurrency']:>5} {r['requests']:>6} {r['errors']:>5} "
+            f"{r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} {r['p99_ms']:>9.1f} "
+            f"{r['requests_per_s']:>8.1f} {r['pages_per_s']:>8.1f} "
+            f"{r['api_requests']:>8} {r['throttled']:>5}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark against the mock AeroAPI")
+    parser.add_argument("--scenario", choices=("mcp", "agent"), default="mcp")
+    parser.add_argument(
+        "--concurrency",
+        type=lambda s: [int(c) for c in s.split(",")],
+        default=[1, 4, 16],
+    )
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--keys", type=int, default=50, help="distinct query windows")
+    parser.add_argument(
+        "--warm", action="store_true", help="keep the response cache between levels"
+    )
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--burst-every", type=float, default=0.0)
+    parser.add_argument("--burst-length", type=float, default=0.0)
+    parser.add_argument("--page-size", type=int, default=15)
+    parser.add_argument("--flights-per-hour", type=int, default=40)
+    parser.add_argument("--fixtures", nargs="*", default=[])
+    parser.add_argument("--rate-limit", type=float, default=1000.0)
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--llm-latency-ms", type=float, default=500.0)
+    parser.add_argument("--agent-cache", action="store_true")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    mock = MockAeroAPI(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        burst_every=args.burst_every,
+        burst_length=args.burst_length,
+        page_size=args.page_size,
+        flights_per_hour=args.flights_per_hour,
+        fixtures=args.fixtures,
+    )
+    port = free_port()
+    server = start_mock(mock, port)
+    configure_client(f"http://127.0.0.1:{port}", args)
+
+    bench = bench_mcp if args.scenario == "mcp" else bench_agent
+    try:
+        results = asyncio.run(bench(args, mock))
+    finally:
+        server.should_exit = True
+
+    print_report(args.scenario, results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(
+                {"scenario": args.scenario, "args": vars(args), "results": results},
+                f,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
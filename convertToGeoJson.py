@@ -1,37 +1,20 @@
 import json
+from MCPServer.track import Track
 
 
-def convert_To_GeoJson(data):
+def convert_To_GeoJson(data, verbose=True, tolerance=None, precision=None):
     # Script to convert the obtained route information to GeoJSON format
-    # Load json file
-    positions = []
-    # with open("flight_route.json", "r") as f:
-    #     data = json.load(f)
-    #     # Create a positions list by getting latitude and longitude from the obtained data
-    #     for position in data["positions"]:
-    #         positions.append(
-    #             {
-    #                 "latitude": position["latitude"],
-    #                 "longitude": position["longitude"],
-    #             }
-    #         )
-
-    for position in data["positions"]:
-        positions.append(
-            {
-                "latitude": position["latitude"],
-                "longitude": position["longitude"],
-            }
-        )
+    # verbose=False skips the console dump and flight_route.geojson (used for bulk conversion)
+    # tolerance (metres) simplifies the line; precision rounds coordinates to that many decimals
+    track = Track.from_aeroapi(data)
+    if tolerance:
+        track = track.simplify(tolerance)
+
     # Create the basic structure of GeoJSON
-    geojson = {
-        "type": "Feature",
-        "geometry": {
-            "type": "LineString",
-            "coordinates": [[pos["longitude"], pos["latitude"]] for pos in positions],
-        },
-        "properties": {},
-    }
+    geojson = track.to_geojson(precision=precision)
+
+    if not verbose:
+        return geojson
 
     # Display the result
     print(json.dumps(geojson, ensure_ascii=False, indent=2))
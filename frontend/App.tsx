@@ -1,23 +1,77 @@
 import React, { useState, FormEvent } from 'react';
 
+type StreamEvent = { event: string; data: any };
+
+// SSEのフレーム ("event: ...\ndata: ...\n\n") を解析する
+const parseFrames = (buffer: string): { events: StreamEvent[]; rest: string } => {
+  const frames = buffer.split('\n\n');
+  const rest = frames.pop() ?? '';
+  const events = frames.map(frame => {
+    let event = 'message';
+    let data = '';
+    for (const line of frame.split('\n')) {
+      if (line.startsWith('event:')) event = line.slice(6).trim();
+      else if (line.startsWith('data:')) data += line.slice(5).trim();
+    }
+    return { event, data: data ? JSON.parse(data) : null };
+  });
+  return { events, rest };
+};
+
 const App: React.FC = () => {
   const [input, setInput] = useState<string>('');
   const [response, setResponse] = useState<string>('');
+  const [steps, setSteps] = useState<string[]>([]);
   const [loading, setLoading] = useState<boolean>(false);
 
+  const handleEvent = ({ event, data }: StreamEvent) => {
+    switch (event) {
+      case 'token':
+        setResponse(prev => prev + data.text);
+        break;
+      case 'tool_start':
+        // ツール呼び出し前のトークンは途中経過なので消す
+        setResponse('');
+        setSteps(prev => [...prev, `${data.name} を実行中...`]);
+        break;
+      case 'tool_end':
+        setSteps(prev => [...prev, `${data.name} 完了`]);
+        break;
+      case 'done':
+        setResponse(data.output);
+        break;
+      case 'error':
+        setResponse(`エラーが発生しました: ${data.error}`);
+        break;
+    }
+  };
+
   const handleSubmit = async (e: FormEvent) => {
     e.preventDefault();
     setLoading(true);
     setResponse('');
+    setSteps([]);
     try {
-      // 仮のAPIエンドポイント
-      const res = await fetch('/api/agent', {
+      const res = await fetch('/api/agent/stream', {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({ input }),
       });
-      const data = await res.json();
-      setResponse(data.output || JSON.stringify(data));
+      if (!res.ok || !res.body) {
+        const data = await res.json();
+        setResponse(data.error || JSON.stringify(data));
+      } else {
+        const reader = res.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        while (true) {
+          const { done, value } = await reader.read();
+          if (done) break;
+          const parsed = parseFrames(buffer + decoder.decode(value, { stream: true }));
+          buffer = parsed.rest;
+          parsed.events.forEach(handleEvent);
+        }
+      }
     } catch (err) {
       setResponse('エラーが発生しました');
     }
@@ -47,8 +101,23 @@ const App: React.FC = () => {
           送信
         </button>
       </form>
-      <div style={{ minHeight: 80, background: '#fafafa', padding: 12, borderRadius: 4 }}>
-        {loading ? '送信中...' : response}
+      {steps.length > 0 && (
+        <ul style={{ color: '#888', fontSize: 13, margin: '0 0 8px', paddingLeft: 20 }}>
+          {steps.map((step, i) => (
+            <li key={i}>{step}</li>
+          ))}
+        </ul>
+      )}
+      <div
+        style={{
+          minHeight: 80,
+          background: '#fafafa',
+          padding: 12,
+          borderRadius: 4,
+          whiteSpace: 'pre-wrap',
+        }}
+      >
+        {response || (loading ? '送信中...' : '')}
       </div>
     </div>
   );
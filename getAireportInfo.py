@@ -1,23 +1,17 @@
-import requests
-import os
-from dotenv import load_dotenv
- 
-load_dotenv() 
-
-API_KEY = os.getenv("FLIGHTAWARE_API_KEY")
-apiUrl = "https://aeroapi.flightaware.com/aeroapi/"
+from MCPServer.aeroapi_client import AeroAPIError, fetch_json
  
 payload = {'max_pages': 1}
-auth_header = {'x-apikey':API_KEY}
 
 def get_airport_info(airport):
-    response = requests.get(apiUrl + f"airports/{airport}", headers=auth_header)
     # no max_pages params required
- 
-    if response.status_code == 200:
-        print(response.json())
-    else:
+    try:
+        airport_info = fetch_json(f"airports/{airport}")
+    except AeroAPIError:
         print("Error executing request")
+        return None
+
+    print(airport_info)
+    return airport_info
  
 #
 #{'airport_code': 'RJNA', 
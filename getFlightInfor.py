@@ -1,30 +1,24 @@
-import requests
-import os
-from dotenv import load_dotenv
 import json
+from MCPServer.aeroapi_client import AeroAPIError, fetch_json
 
-load_dotenv()
 
-API_KEY = os.getenv("FLIGHTAWARE_API_KEY")
-apiUrl = "https://aeroapi.flightaware.com/aeroapi/"
-auth_header = {"x-apikey": API_KEY}
-
-
-def get_flight_route(fa_flight_id):
+def get_flight_route(fa_flight_id, verbose=True):
     # Step 2: Get route information with the obtained fa_flight_id
-    track_response = requests.get(
-        apiUrl + f"flights/{fa_flight_id}/track", headers=auth_header
-    )
-
-    if track_response.status_code == 200:
-        print(track_response.json())
-        # Want to output json to a file
-        with open("flight_route.json", "w") as f:
-            f.write(json.dumps(track_response.json(), ensure_ascii=False, indent=2))
-
-    else:
-        print(f"Route retrieval error: {track_response.status_code}")
-    return track_response.json()
+    # verbose=False skips the console dump and flight_route.json (used for bulk fetches)
+    try:
+        track = fetch_json(f"flights/{fa_flight_id}/track")
+    except AeroAPIError as e:
+        print(f"Route retrieval error: {fa_flight_id} {e.status_code}")
+        return {}
+
+    if not verbose:
+        return track
+
+    print(track)
+    # Want to output json to a file
+    with open("flight_route.json", "w") as f:
+        f.write(json.dumps(track, ensure_ascii=False, indent=2))
+    return track
 
 
 if __name__ == "__main__":
@@ -1,10 +1,13 @@
 # from flightaware.getFlightInfor import get_flight_route
 # from flightaware.convertToGeoJson import convert_To_GeoJson
 # from flightaware.getFlightNumber import get_flight_numbers_by_airport
-import json
+from concurrent.futures import ThreadPoolExecutor
 from getFlightInfor import get_flight_route
-from convertToGeoJson import convert_To_GeoJson
 from getFlightNumber import get_flight_numbers_by_airport
+from MCPServer.aeroapi_client import POOL_SIZE
+from MCPServer.geojson_writer import FeatureCollectionWriter
+from MCPServer.track import Track
+from MCPServer.track_file import write_track_file
 
 colors = [
     "#FF0000",
@@ -16,42 +19,127 @@ colors = [
     "#00FFFF",
 ]
 
+# Tracks fetched in parallel; bounded by the shared connection pool
+MAX_WORKERS = POOL_SIZE
+# Tracks are written at full resolution unless a caller opts in to
+# simplification (metres) and coordinate rounding (decimals), e.g. 100 and 5
+SIMPLIFY_TOLERANCE = None
+COORDINATE_PRECISION = None
 
-def get_multi_flight_geojson():
-    airport = "RJAA"
-    flight_data = get_flight_numbers_by_airport(airport)
-
-    # Step 2: Get route information for each flight and convert to GeoJSON format
-    geojson_list = []
-    for idx, flight in enumerate(flight_data.get("departures", [])):
-        fa_flight_id = flight.get("fa_flight_id")
-        if fa_flight_id:
-            print(f"Processing flight ID: {fa_flight_id}")
-            routes = get_flight_route(fa_flight_id)
-            geojson = convert_To_GeoJson(routes)
-
-            # Add flight information to properties
-            color = colors[idx % len(colors)]
-            geojson["properties"] = {
-                "name": flight.get("ident"),
-                "fa_flight_id": fa_flight_id,
-                "color": color,
-            }
-            # Include geojson in the list
-            geojson_list.append(geojson)
-
-    # Step 3: Save GeoJSON to a file
-    # Convert to featureCollection format
-    feature_collection = {
-        "type": "FeatureCollection",
-        "features": geojson_list,
-    }
-    # Save GeoJSON to a file
-    with open("multi_flight_route.geojson", "w") as f:
-        json.dump(feature_collection, f, ensure_ascii=False, indent=2)
-
-    print("GeoJSON file saved as multi_flight_route.geojson")
+
+def iter_tracks(fa_flight_ids, max_workers=MAX_WORKERS):
+    # Fetch every track concurrently over the shared session and yield
+    # (index, route) in input order, so repeated runs write identical files;
+    # each route is yielded as soon as it and every route before it are ready
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        routes = executor.map(
+            get_flight_route, fa_flight_ids, [False] * len(fa_flight_ids)
+        )
+        yield from enumerate(routes)
+
+
+def iter_flight_tracks(flights, max_workers=MAX_WORKERS, tolerance=SIMPLIFY_TOLERANCE):
+    # Step 2: Get route information for each flight as (Track, properties)
+    fa_flight_ids = [flight["fa_flight_id"] for flight in flights]
+    for idx, route in iter_tracks(fa_flight_ids, max_workers):
+        if not route.get("positions"):
+            continue
+        flight = flights[idx]
+        track = Track.from_aeroapi(route, flight.get("fa_flight_id"))
+        if tolerance:
+            track = track.simplify(tolerance)
+
+        # Add flight information to properties
+        color = colors[idx % len(colors)]
+        properties = {
+            "name": flight.get("ident"),
+            "fa_flight_id": flight.get("fa_flight_id"),
+            "color": color,
+        }
+        yield track, properties
+
+
+def iter_flight_features(
+    flights,
+    max_workers=MAX_WORKERS,
+    tolerance=SIMPLIFY_TOLERANCE,
+    precision=COORDINATE_PRECISION,
+):
+    # Convert each track to a GeoJSON Feature as soon as it is ready
+    for track, properties in iter_flight_tracks(flights, max_workers, tolerance):
+        yield track.to_geojson(properties, precision)
+
+
+def get_multi_flight_geojson(
+    airport="RJAA",
+    output_path="multi_flight_route.geojson",
+    max_workers=MAX_WORKERS,
+    tolerance=SIMPLIFY_TOLERANCE,
+    precision=COORDINATE_PRECISION,
+    output_format="geojson",
+):
+    # output_format: "geojson" (FeatureCollection), "geojsonseq" (one Feature per line)
+    # or "flatgeobuf" (FlatGeobuf with a spatial index, see MCPServer/track_file.py)
+    # Returns the number of features written, or the FeatureCollection if output_path is None
+    flight_data = get_flight_numbers_by_airport(airport, verbose=False)
+    flights = [f for f in flight_data.get("departures", []) if f.get("fa_flight_id")]
+    print(f"Fetching {len(flights)} tracks for {airport}")
+
+    if output_format == "flatgeobuf":
+        # FlatGeobuf file with a spatial index, readable by GDAL/QGIS and web map libraries
+        count = write_track_file(
+            output_path, iter_flight_tracks(flights, max_workers, tolerance)
+        )
+        print(f"Track file saved as {output_path} ({count} flights)")
+        return count
+
+    features = iter_flight_features(flights, max_workers, tolerance, precision)
+    if not output_path:
+        return {"type": "FeatureCollection", "features": list(features)}
+
+    # Step 3: Write each feature to the file as soon as its track is ready
+    with FeatureCollectionWriter(output_path, output_format) as writer:
+        for feature in features:
+            writer.write(feature)
+
+    print(f"GeoJSON file saved as {output_path} ({writer.count} flights)")
+    return writer.count
 
 
 if __name__ == "__main__":
-    get_multi_flight_geojson()
+    import argparse
+
+    # コマンドライン引数で空港と形式を指定（例: python getMultiFlightGeoJson.py RJTT geojsonseq）
+    # 間引きと座標の丸めは指定したときだけ行う（例: --simplify 100 --precision 5）
+    parser = argparse.ArgumentParser(description="Export an airport's flight tracks")
+    parser.add_argument("airport", nargs="?", default="RJAA")
+    parser.add_argument(
+        "output_format",
+        nargs="?",
+        default="geojson",
+        choices=["geojson", "geojsonseq", "flatgeobuf"],
+    )
+    parser.add_argument(
+        "--simplify",
+        type=float,
+        default=SIMPLIFY_TOLERANCE,
+        metavar="METRES",
+        help="simplify tracks to within this many metres (default: off)",
+    )
+    parser.add_argument(
+        "--precision",
+        type=int,
+        default=COORDINATE_PRECISION,
+        metavar="DECIMALS",
+        help="round coordinates to this many decimals (default: full precision)",
+    )
+    args = parser.parse_args()
+    extensions = {"geojson": "geojson", "geojsonseq": "geojsons", "flatgeobuf": "fgb"}
+    output_path = f"multi_flight_route.{extensions[args.output_format]}"
+    get_multi_flight_geojson(
+        args.airport,
+        output_path,
+        tolerance=args.simplify,
+        precision=args.precision,
+        output_format=args.output_format,
+    )
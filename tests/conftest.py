@@ -0,0 +1,13 @@
+import os
+import sys
+
+# Keep tests off the on-disk stores and the network before any module reads its settings
+os.environ["AEROAPI_DISK_CACHE_PATH"] = ""
+os.environ["AEROAPI_FLIGHT_STORE_PATH"] = ""
+os.environ["AEROAPI_WARM_AIRPORTS"] = ""
+os.environ.setdefault("FLIGHTAWARE_API_KEY", "test")
+
+# Add project root to sys.path so the MCPServer and Agent packages resolve
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
@@ -0,0 +1,31 @@
+import numpy as np
+
+from MCPServer.aggregate import epoch_seconds, wall_clock_hours
+
+
+def test_epoch_seconds_applies_offsets():
+    values = [
+        "2026-01-02T00:00:00Z",
+        "2026-01-02T09:00:00+09:00",
+        "2026-01-01T19:00:00-05:00",
+    ]
+    assert epoch_seconds(values).tolist() == [1767312000.0] * 3
+
+
+def test_malformed_values_only_drop_their_own_rows():
+    values = [
+        "2026-01-02T00:00:00Z",
+        "not-a-timestamp-at-all-xx",
+        None,
+        "2026-13-02T00:00:00Z",
+        "2026-01-02T09:00:00+0900",
+        "2026-01-02T09:00:00+09:00",
+    ]
+    result = epoch_seconds(values)
+    assert np.isnan(result).tolist() == [False, True, True, True, True, False]
+    assert result[0] == result[5] == 1767312000.0
+
+
+def test_wall_clock_hours_skip_malformed_values():
+    values = ["2026-01-02T07:30:00+09:00", "not-a-timestamp-at-all-xx", None]
+    assert wall_clock_hours(values).tolist() == [7, -1, -1]
@@ -0,0 +1,68 @@
+from datetime import date, datetime, timezone
+
+import pytest
+
+from Agent.answer_cache import (
+    ANSWER_CACHE_PAST_TTL,
+    AnswerCache,
+    resolve_dates,
+)
+from MCPServer.cache import BOARD_TTL, SCHEDULE_TTL
+from MCPServer.localize import JST
+
+NOW = datetime(2026, 1, 2, 10, 0, tzinfo=JST)
+
+
+@pytest.mark.parametrize(
+    "question",
+    [
+        "今日の羽田の出発便",
+        "本日の羽田の出発便",
+        "2026年1月2日の羽田の出発便",
+        "2026/1/2の羽田の出発便",
+        "2026-01-02 羽田の出発便",
+        "1月2日の羽田の出発便",
+    ],
+)
+def test_dates_resolve_to_the_same_key(question):
+    cache = AnswerCache()
+    assert cache.resolve(question, NOW) == cache.resolve("今日の羽田の出発便", NOW)
+
+
+def test_relative_dates_follow_the_jst_calendar_day():
+    cache = AnswerCache()
+    # 16:00 UTC on Jan 1 is already Jan 2 in Japan
+    late_utc = datetime(2026, 1, 1, 16, 0, tzinfo=timezone.utc)
+    assert cache.resolve("今日の羽田の出発便", late_utc) == cache.resolve(
+        "今日の羽田の出発便", NOW
+    )
+
+
+def test_ttl_depends_on_the_date_asked_about():
+    cache = AnswerCache()
+    tomorrow_key, tomorrow_ttl = cache.resolve("明日の羽田の出発便", NOW)
+    yesterday_key, yesterday_ttl = cache.resolve("昨日の羽田の出発便", NOW)
+    today_key, today_ttl = cache.resolve("今日の羽田の出発便", NOW)
+    assert tomorrow_key.startswith("2026-01-03|")
+    assert yesterday_key.startswith("2026-01-01|")
+    assert (today_ttl, tomorrow_ttl, yesterday_ttl) == (
+        BOARD_TTL,
+        SCHEDULE_TTL,
+        ANSWER_CACHE_PAST_TTL,
+    )
+
+
+def test_invalid_dates_are_left_in_the_question():
+    text, dates = resolve_dates("2026年2月30日の羽田", date(2026, 1, 2))
+    assert text == "2026年2月30日の羽田"
+    assert dates == [date(2026, 1, 2)]
+
+
+def test_paraphrases_share_a_key_but_airports_do_not():
+    cache = AnswerCache(near_duplicates=True)
+    key, _ = cache.resolve("羽田の出発便を教えてください", NOW)
+    assert cache.resolve("羽田の出発便を教えて", NOW)[0] == key
+    assert cache.resolve("成田の出発便を教えて", NOW)[0] != key
+    assert cache.resolve("羽田の到着便を教えて", NOW)[0] != key
+    exact = AnswerCache(near_duplicates=False)
+    assert exact.resolve("羽田の出発便を教えて", NOW)[0] != key
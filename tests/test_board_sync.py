@@ -0,0 +1,54 @@
+from MCPServer.board_sync import BOARD_HISTORY, Board
+
+START, END = 1_800_000_000, 1_800_010_000
+
+
+def record(fa_flight_id, minute, **fields):
+    return {
+        "fa_flight_id": fa_flight_id,
+        "scheduled_out": f"2027-01-15T08:{minute:02d}:00Z",
+        **fields,
+    }
+
+
+def test_unknown_version_resets():
+    board = Board("RJTT", "departures")
+    board.apply(START, END, [record("A", 0)], START)
+    for since in (None, board.version - 1, Board("RJTT", "departures").version):
+        diff = board.diff(since)
+        assert diff["reset"] is True
+        assert [r["fa_flight_id"] for r in diff["added"]] == ["A"]
+
+
+def test_diff_reports_added_changed_and_departed():
+    board = Board("RJTT", "departures")
+    v1 = board.apply(START, END, [record("A", 0), record("B", 5)], START)
+    assert board.diff(v1) == {
+        "version": v1,
+        "reset": False,
+        "added": [],
+        "changed": [],
+        "departed": [],
+        "unchanged": 2,
+    }
+
+    v2 = board.apply(
+        START, END, [record("A", 0, gate_origin="12"), record("C", 10)], START
+    )
+    assert v2 == v1 + 1
+    diff = board.diff(v1)
+    assert diff["reset"] is False
+    assert [r["fa_flight_id"] for r in diff["added"]] == ["C"]
+    assert [r["gate_origin"] for r in diff["changed"]] == ["12"]
+    assert diff["departed"] == ["B"]
+    assert diff["unchanged"] == 0
+    assert board.diff(v2)["unchanged"] == 2
+
+
+def test_versions_expire_after_history_limit():
+    board = Board("RJTT", "departures")
+    first = board.apply(START, END, [record("A", 0)], START)
+    for _ in range(BOARD_HISTORY):
+        board.apply(START, END, [record("A", 0)], START)
+    assert board.diff(first)["reset"] is True
+    assert board.diff(board.version)["reset"] is False
@@ -0,0 +1,61 @@
+import pytest
+
+from MCPServer import cache
+from MCPServer.cache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_entries_expire_after_ttl(clock):
+    c = TTLCache()
+    c.set("a", b"1", ttl=10)
+    clock[0] += 9.9
+    assert c.get("a") == b"1"
+    clock[0] += 0.1
+    assert c.get("a") is None
+    assert c.stats()["entries"] == 0
+    assert (c.hits, c.misses) == (1, 1)
+
+
+def test_non_positive_ttl_is_not_stored(clock):
+    c = TTLCache()
+    c.set("a", b"1", ttl=0)
+    assert c.get("a") is None
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    c = TTLCache(max_entries=2)
+    c.set("a", b"1", ttl=60)
+    c.set("b", b"2", ttl=60)
+    assert c.get("a") == b"1"
+    c.set("c", b"3", ttl=60)
+    assert c.get("b") is None
+    assert c.get("a") == b"1"
+    assert c.get("c") == b"3"
+    assert c.evictions == 1
+
+
+def test_byte_budget_evicts_oldest(clock):
+    c = TTLCache(max_entries=10, max_bytes=5)
+    c.set("a", b"123", ttl=60)
+    c.set("b", b"45", ttl=60)
+    c.set("c", b"6", ttl=60)
+    assert c.get("a") is None
+    assert c.stats()["bytes"] == 3
+    c.set("big", b"123456", ttl=60)
+    assert c.get("big") is None
+    assert c.get("b") == b"45"
+
+
+def test_overwrite_replaces_size_and_expiry(clock):
+    c = TTLCache()
+    c.set("a", b"1234", ttl=5)
+    c.set("a", b"1", ttl=60)
+    clock[0] += 10
+    assert c.get("a") == b"1"
+    assert c.stats()["bytes"] == 1
@@ -0,0 +1,59 @@
+from datetime import datetime, timezone
+
+from MCPServer import flight_store
+from MCPServer.flight_store import FlightStore, missing_ranges
+
+
+def iso(ts):
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def test_missing_ranges_without_coverage():
+    assert missing_ranges(0, 100, []) == [(0, 100)]
+
+
+def test_missing_ranges_fully_covered():
+    assert missing_ranges(10, 90, [(0, 100)]) == []
+
+
+def test_missing_ranges_gaps_between_unsorted_overlapping_intervals():
+    covered = [(60, 70), (10, 30), (20, 40)]
+    assert missing_ranges(0, 100, covered) == [(0, 10), (40, 60), (70, 100)]
+
+
+def test_missing_ranges_ignores_coverage_outside_window():
+    assert missing_ranges(50, 60, [(0, 50), (60, 80)]) == [(50, 60)]
+
+
+def test_prune_keeps_coverage_complete(tmp_path, monkeypatch):
+    now = 1_800_000_000
+    monkeypatch.setattr(flight_store.time, "time", lambda: now)
+    store = FlightStore(str(tmp_path / "flights.sqlite3"))
+    cutoff = now - 86400
+
+    def flight(fa_flight_id, out, arrive):
+        return {
+            "fa_flight_id": fa_flight_id,
+            "origin": {"code": "RJTT"},
+            "destination": {"code": "KJFK"},
+            "scheduled_out": iso(out),
+            "scheduled_in": iso(arrive),
+        }
+
+    store.ingest(
+        [
+            flight("old", cutoff - 7200, cutoff - 3600),
+            flight("overnight", cutoff - 3600, cutoff + 36000),
+            flight("new", cutoff + 60, cutoff + 3600),
+        ]
+    )
+    store.mark_covered("KJFK", "arrivals", cutoff - 10000, cutoff + 50000)
+    store.mark_covered("KJFK", "arrivals", cutoff - 20000, cutoff - 10000)
+
+    assert store.prune(retention_days=1) == 1
+    # Coverage straddling the cutoff now starts at it
+    assert store.missing("KJFK", "arrivals", cutoff - 5000, cutoff + 5000) == [
+        (cutoff - 5000, cutoff)
+    ]
+    arrivals = store.query_board("KJFK", "arrivals", cutoff, cutoff + 50000)
+    assert [r["fa_flight_id"] for r in arrivals] == ["new", "overnight"]
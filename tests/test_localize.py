@@ -0,0 +1,39 @@
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from MCPServer.localize import JST, convert_batch, convert_timestamp
+
+VALUES = [
+    "2026-01-02T00:30:00Z",
+    "2026-01-02T00:30:00Z",
+    "2026-01-01T15:00:00Z",
+    "2026-03-08T06:59:59Z",
+    "2026-03-08T07:00:00Z",
+    "2026-11-01T05:30:00Z",
+    "2026-11-01T06:30:00Z",
+    "2026-01-02T00:30:00.250Z",
+    "2026-01-02T09:30:00+09:00",
+    "not a timestamp",
+]
+
+
+@pytest.mark.parametrize(
+    "tz", [JST, ZoneInfo("America/New_York"), ZoneInfo("UTC")], ids=str
+)
+def test_batch_matches_scalar(tz):
+    assert convert_batch(VALUES, tz) == [convert_timestamp(v, tz) for v in VALUES]
+
+
+def test_batch_falls_back_when_a_plain_value_is_invalid():
+    values = ["2026-01-02T00:30:00Z", "2026-13-02T00:30:00Z"]
+    assert convert_batch(values, JST) == [convert_timestamp(v, JST) for v in values]
+    assert convert_batch(values, JST)[0] == "2026-01-02T09:30:00+09:00"
+
+
+def test_batch_crosses_dst_transition():
+    tz = ZoneInfo("America/New_York")
+    assert convert_batch(["2026-03-08T06:59:59Z", "2026-03-08T07:00:00Z"], tz) == [
+        "2026-03-08T01:59:59-05:00",
+        "2026-03-08T03:00:00-04:00",
+    ]
@@ -0,0 +1,57 @@
+import pytest
+
+from Agent import mcp_pool
+from Agent.mcp_pool import route_index, route_key, worker_env
+
+
+def test_route_key_prefers_airport_code():
+    arguments = {"fa_flight_id": "ANA1-1", "origin": "rjtt", "airport_code": " rjaa "}
+    assert route_key(arguments) == "RJAA"
+
+
+@pytest.mark.parametrize(
+    "arguments, expected",
+    [
+        ({"airport_code": "", "origin": "KJFK"}, "KJFK"),
+        ({"airport_code": "  ", "destination": "egll"}, "EGLL"),
+        ({"airport_code": ["RJTT"], "fa_flight_id": "ana182-1"}, "ANA182-1"),
+        ({"year": 2026}, None),
+        ({}, None),
+        (None, None),
+    ],
+)
+def test_route_key_skips_blank_and_non_string_values(arguments, expected):
+    assert route_key(arguments) == expected
+
+
+def test_route_index_is_stable_and_in_range():
+    for size in (1, 2, 4, 7):
+        for key in ("RJTT", "RJAA", "KJFK", "EGLL"):
+            index = route_index(key, size)
+            assert 0 <= index < size
+            assert index == route_index(key, size)
+    # Same code, same worker, regardless of how the caller spelled it
+    assert route_index(route_key({"airport_code": "rjtt"}), 4) == route_index("RJTT", 4)
+
+
+def test_worker_env_splits_rate_burst_and_warm_airports(monkeypatch):
+    monkeypatch.setenv("AEROAPI_RATE_LIMIT", "5")
+    monkeypatch.setenv("AEROAPI_RATE_BURST", "5")
+    monkeypatch.setenv("AEROAPI_METRICS_PORT", "9100")
+    airports = ["RJTT", "RJAA", "KJFK", "EGLL", "RJBB"]
+    monkeypatch.setattr(mcp_pool, "WARM_AIRPORTS", airports)
+
+    envs = [worker_env(i, 4) for i in range(4)]
+    assert {env["AEROAPI_RATE_LIMIT"] for env in envs} == {"1.25"}
+    assert {env["AEROAPI_RATE_BURST"] for env in envs} == {"1"}
+    assert [env["AEROAPI_METRICS_PORT"] for env in envs] == [
+        "9100",
+        "9101",
+        "9102",
+        "9103",
+    ]
+    warmed = [code for env in envs for code in env["AEROAPI_WARM_AIRPORTS"].split(",")]
+    assert sorted(c for c in warmed if c) == sorted(airports)
+    for i, env in enumerate(envs):
+        for code in filter(None, env["AEROAPI_WARM_AIRPORTS"].split(",")):
+            assert route_index(code, 4) == i
@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+from MCPServer.disk_cache import DiskCache
+from MCPServer.rate_limit import (
+    BACKGROUND,
+    BACKGROUND_QUOTA_SHARE,
+    INTERACTIVE,
+    QuotaExceededError,
+    RateLimiter,
+)
+
+
+def test_interactive_waiters_are_served_before_background():
+    limiter = RateLimiter(rate=50, burst=1, monthly_quota=0, store=DiskCache(""))
+    order = []
+
+    async def take(name, priority):
+        await limiter.acquire(priority)
+        order.append(name)
+
+    async def main():
+        # Drain the bucket so every waiter below has to queue
+        await limiter.acquire(INTERACTIVE)
+        background = [
+            asyncio.create_task(take(f"background-{i}", BACKGROUND)) for i in range(2)
+        ]
+        await asyncio.sleep(0)
+        interactive = [
+            asyncio.create_task(take(f"interactive-{i}", INTERACTIVE)) for i in range(2)
+        ]
+        await asyncio.gather(*background, *interactive)
+
+    asyncio.run(main())
+    assert order == ["interactive-0", "interactive-1", "background-0", "background-1"]
+
+
+def test_quota_is_charged_and_shared_through_store(tmp_path):
+    store = DiskCache(str(tmp_path / "aeroapi.sqlite3"))
+    limiter = RateLimiter(rate=1000, burst=10, monthly_quota=3, store=store)
+    for _ in range(3):
+        limiter.acquire_blocking(INTERACTIVE)
+    with pytest.raises(QuotaExceededError):
+        limiter.acquire_blocking(INTERACTIVE)
+    assert limiter.stats()["quota_used"] == 3
+
+    # Another process sees the same count
+    other = RateLimiter(rate=1000, burst=10, monthly_quota=3, store=store)
+    assert other.stats()["quota_used"] == 3
+    with pytest.raises(QuotaExceededError):
+        other.acquire_blocking(INTERACTIVE)
+
+
+def test_rejected_request_does_not_consume_a_token(tmp_path):
+    store = DiskCache(str(tmp_path / "aeroapi.sqlite3"))
+    limiter = RateLimiter(rate=0.001, burst=1, monthly_quota=1, store=store)
+    limiter.acquire_blocking(INTERACTIVE)
+    exhausted = RateLimiter(rate=0.001, burst=1, monthly_quota=1, store=store)
+    with pytest.raises(QuotaExceededError):
+        exhausted.acquire_blocking(INTERACTIVE)
+    # The token taken for the rejected call was returned
+    assert exhausted._try_take() == 0.0
+
+
+def test_background_requests_stop_at_their_share():
+    limiter = RateLimiter(rate=1000, burst=100, monthly_quota=10, store=DiskCache(""))
+    share = int(10 * BACKGROUND_QUOTA_SHARE)
+    for _ in range(share):
+        limiter.acquire_blocking(BACKGROUND)
+    with pytest.raises(QuotaExceededError):
+        limiter.acquire_blocking(BACKGROUND)
+    # Interactive calls may still use the rest of the budget
+    for _ in range(10 - share):
+        limiter.acquire_blocking(INTERACTIVE)
+    with pytest.raises(QuotaExceededError):
+        limiter.acquire_blocking(INTERACTIVE)
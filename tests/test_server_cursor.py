@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from MCPServer import server
+from MCPServer.aeroapi_client import AEROAPI_BASE_URL, AEROAPI_ROOT
+
+ENDPOINT = "airports/RJTT/flights/departures"
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        f"/aeroapi/{ENDPOINT}?cursor=abc",
+        f"{AEROAPI_ROOT}{ENDPOINT}?cursor=abc",
+        f"{ENDPOINT}?cursor=abc",
+    ],
+)
+def test_cursor_for_the_same_endpoint_is_accepted(cursor):
+    assert server.resolve_cursor(ENDPOINT, cursor) == (
+        f"{AEROAPI_ROOT}{ENDPOINT}?cursor=abc"
+    )
+
+
+def test_trailing_slash_accepts_any_path_below():
+    cursor = "/aeroapi/schedules/2026-01-02/2026-01-03?cursor=x"
+    assert server.resolve_cursor("schedules/", cursor) == AEROAPI_BASE_URL + cursor
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "/aeroapi/airports/RJAA/flights/departures?cursor=abc",
+        "/aeroapi/airports/RJTT/flights/arrivals?cursor=abc",
+        "/aeroapi/airports/RJTT/flights/departuresX?cursor=abc",
+        f"/aeroapi/{ENDPOINT}/../../RJAA/flights/departures?cursor=abc",
+        f"https://example.com/aeroapi/{ENDPOINT}?cursor=abc",
+    ],
+)
+def test_cursor_for_another_query_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        server.resolve_cursor(ENDPOINT, cursor)
+
+
+def test_next_cursor_round_trip(monkeypatch):
+    pages = {
+        f"{AEROAPI_ROOT}{ENDPOINT}": {
+            "departures": [
+                {"fa_flight_id": "A", "scheduled_out": "2026-01-02T00:00:00Z"}
+            ],
+            "links": {"next": f"/aeroapi/{ENDPOINT}?cursor=page2"},
+        },
+        f"{AEROAPI_ROOT}{ENDPOINT}?cursor=page2": {
+            "departures": [
+                {"fa_flight_id": "B", "scheduled_out": "2026-01-02T01:00:00Z"}
+            ],
+            "links": None,
+        },
+    }
+    requested = []
+
+    async def fake_fetch(url, params=None):
+        requested.append(url)
+        return pages[url]
+
+    monkeypatch.setattr(server, "fetch_json_async", fake_fetch)
+
+    async def main():
+        first = await server.fetch_page(
+            f"{AEROAPI_ROOT}{ENDPOINT}", {"start": "x"}, "departures"
+        )
+        page_url = server.resolve_cursor(ENDPOINT, first["next_cursor"])
+        second = await server.fetch_page(page_url, None, "departures")
+        await asyncio.gather(*server.background_tasks)
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert [f["fa_flight_id"] for f in first["departures"]] == ["A"]
+    assert first["departures"][0]["scheduled_out"] == "2026-01-02T09:00:00+09:00"
+    assert [f["fa_flight_id"] for f in second["departures"]] == ["B"]
+    assert second["next_cursor"] is None
+    # The second page was requested through the resolved cursor
+    assert f"{AEROAPI_ROOT}{ENDPOINT}?cursor=page2" in requested
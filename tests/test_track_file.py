@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from MCPServer.track import Track
+from MCPServer.track_file import MAGIC, TrackFile, write_track_file
+
+
+@pytest.fixture
+def tracks():
+    rng = np.random.default_rng(7)
+    result = []
+    for i in range(200):
+        n = int(rng.integers(2, 30))
+        lat = rng.uniform(-60, 60) + np.cumsum(rng.normal(0, 0.3, n))
+        lon = rng.uniform(-170, 170) + np.cumsum(rng.normal(0, 0.3, n))
+        alt = rng.uniform(0, 40000, n)
+        time = 1_800_000_000 + i * 600 + np.arange(n) * 60
+        track = Track(lat, lon, alt, time, f"FLT{i}")
+        result.append((track, {"name": f"ANA{i}", "color": "#FF0000"}))
+    return result
+
+
+def expected_ids(tracks, bbox=None, start=None, end=None):
+    ids = set()
+    for track, _ in tracks:
+        min_lon, min_lat, max_lon, max_lat = track.bbox()
+        if bbox and not (
+            max_lon >= bbox[0]
+            and min_lon <= bbox[2]
+            and max_lat >= bbox[1]
+            and min_lat <= bbox[3]
+        ):
+            continue
+        if start is not None and track.time.max() < start:
+            continue
+        if end is not None and track.time.min() > end:
+            continue
+        ids.add(track.fa_flight_id)
+    return ids
+
+
+def test_writes_flatgeobuf(tmp_path, tracks):
+    path = tmp_path / "tracks.fgb"
+    assert write_track_file(str(path), tracks) == len(tracks)
+    assert path.read_bytes()[:8] == MAGIC
+
+
+@pytest.mark.parametrize(
+    "bbox, start, end",
+    [
+        (None, None, None),
+        ((0, 0, 40, 40), None, None),
+        ((-120, -50, -60, 10), 1_800_030_000, 1_800_080_000),
+        (None, 1_800_100_000, None),
+        ((179.5, 89, 180, 90), None, None),
+    ],
+)
+def test_queries_match_brute_force(tmp_path, tracks, bbox, start, end):
+    path = str(tmp_path / "tracks.fgb")
+    write_track_file(path, tracks)
+    track_file = TrackFile(path)
+    found = {track.fa_flight_id for track, _ in track_file.tracks(bbox, start, end)}
+    assert found == expected_ids(tracks, bbox, start, end)
+
+
+def test_round_trip_keeps_positions_and_properties(tmp_path, tracks):
+    path = str(tmp_path / "tracks.fgb")
+    write_track_file(path, tracks)
+    originals = {track.fa_flight_id: (track, props) for track, props in tracks}
+    for track, properties in TrackFile(path).tracks():
+        original, original_properties = originals[track.fa_flight_id]
+        assert np.array_equal(track.lat, original.lat)
+        assert np.array_equal(track.lon, original.lon)
+        assert np.array_equal(track.alt, original.alt)
+        assert np.array_equal(track.time, original.time)
+        assert properties == {**original_properties, "fa_flight_id": track.fa_flight_id}
+
+
+def test_empty_file_and_wrong_format(tmp_path):
+    empty = str(tmp_path / "empty.fgb")
+    assert write_track_file(empty, []) == 0
+    assert len(TrackFile(empty)) == 0
+    assert TrackFile(empty).query((0, 0, 1, 1)).size == 0
+    other = tmp_path / "other.fgb"
+    other.write_bytes(b"not a flatgeobuf file")
+    with pytest.raises(ValueError):
+        TrackFile(str(other))